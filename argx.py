@@ -1,9 +1,16 @@
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Side, Font, PatternFill
-from openpyxl.formatting.rule import FormulaRule
+from copy import copy
 from datetime import timedelta, datetime
+import numpy as np
 import pandas as pd
 
+SHEET_COLUMNS = ["Date", "Shift", "Type", "Hours", "Start", "End"]
+SHEET_ALIGNS = ["left", "center", "left", "center", "center", "center"]
+SHEET_WIDTHS = [13.0, 7.0, 9.0, 8.0, 8.0, 8.0]
+SHADE_COLOR = "FFD9D9D9"
+
+# openpyxl is imported inside the writers so importing argx (for the
+# pay-period helpers) stays cheap at app startup.
+
 
 def make_pay_period_fn(start_date):
     """
@@ -17,25 +24,51 @@ def make_pay_period_fn(start_date):
                   of 14-day pay periods since the start_date.
     """
     def get_pay_period(date_obj):
+        if isinstance(date_obj, datetime):  # Also covers pd.Timestamp
+            date_obj = date_obj.date()
         return (date_obj - start_date.date()).days // 14
+    get_pay_period.start_date = start_date
     return get_pay_period
 
 
+def add_calendar_columns(df, start_date):
+    """
+    Stores DateObj as datetime64 and derives WeekStart and PayPeriod from it once.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame with a DateObj column of dates.
+        start_date (datetime): The start date of the first pay period.
+
+    Returns:
+        pd.DataFrame: The same DataFrame, with DateObj, WeekStart and PayPeriod set.
+    """
+    dates = pd.to_datetime(df["DateObj"])
+    df["DateObj"] = dates
+    df["WeekStart"] = dates - pd.to_timedelta(dates.dt.dayofweek, unit="D")
+    df["PayPeriod"] = (dates - pd.Timestamp(start_date)) // pd.Timedelta(days=14)
+    return df
+
+
 def write_argx(df, output_path, get_pay_period):
     """
     Writes shift data to an Excel workbook with weekly totals and individual sheets per person.
 
     Parameters:
-        df (pd.DataFrame): DataFrame containing parsed shift data.
+        df (pd.DataFrame): DataFrame containing parsed shift data, with calendar columns
+                           from add_calendar_columns.
         output_path (str): File path for the resulting Excel file.
         get_pay_period (function): A function that calculates pay period number from a date.
     """
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Border, Side, Font, PatternFill
+    from openpyxl.formatting.rule import FormulaRule
+    from openpyxl.utils import get_column_letter
+
     wb = Workbook()
     bold = Font(bold=True)
     thin = Border(left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin"))
     medium_bottom = Border(bottom=Side(style="medium"))
-    all_weeks = sorted(df["DateObj"].apply(lambda d: d - timedelta(days=d.weekday())).unique())
-    df["WeekStart"] = df["DateObj"].apply(lambda d: d - timedelta(days=d.weekday()))
+    all_weeks = df["WeekStart"].drop_duplicates().sort_values().tolist()
     names = sorted(df["Name"].unique())
 
     # === Weekly Totals Sheet ===
@@ -44,7 +77,7 @@ def write_argx(df, output_path, get_pay_period):
     ws_totals.freeze_panes = "A2"
     ws_totals.column_dimensions['A'].width = 24.0
     for i in range(len(all_weeks)):
-        col_letter = chr(66 + i)
+        col_letter = get_column_letter(i + 2)
         ws_totals.column_dimensions[col_letter].width = 13.0
 
     ws_totals.cell(row=1, column=1, value="Name").font = bold
@@ -67,7 +100,7 @@ def write_argx(df, output_path, get_pay_period):
 
     for i, week in enumerate(all_weeks, start=2):
         if get_pay_period(week) % 2 == 1:
-            col_letter = chr(64 + i)
+            col_letter = get_column_letter(i)
             ws_totals.conditional_formatting.add(f"{col_letter}2:{col_letter}{len(names)+1}",
                 FormulaRule(formula=["TRUE"], fill=PatternFill(fill_type="solid", fgColor="FFD9D9D9")))
 
@@ -89,7 +122,7 @@ def write_argx(df, output_path, get_pay_period):
 
         group = group.sort_values("DateObj").reset_index(drop=True)
         for row_idx, row in group.iterrows():
-            cur_period = get_pay_period(row["DateObj"])
+            cur_period = row["PayPeriod"]
             values = [row["Date"], row["Shift"], row["Type"], row["Hours"], row["Start"], row["End"]]
             for col, (val, align) in enumerate(zip(values, aligns), start=1):
                 cell = ws.cell(row=row_idx + 2, column=col, value=val)
@@ -97,9 +130,132 @@ def write_argx(df, output_path, get_pay_period):
                 if cur_period % 2 == 1:
                     cell.fill = PatternFill(fill_type="solid", fgColor="FFD9D9D9")
             if row_idx + 1 < len(group):
-                next_period = get_pay_period(group.loc[row_idx + 1, "DateObj"])
+                next_period = group.loc[row_idx + 1, "PayPeriod"]
                 if next_period != cur_period:
                     for col in range(1, 7):
                         ws.cell(row=row_idx + 2, column=col).border = medium_bottom
 
     wb.save(output_path)
+
+
+def _argx_styles(wb):
+    """
+    Registers the shared named styles used by the streaming writer.
+
+    Parameters:
+        wb (Workbook): The workbook the styles are added to.
+
+    Returns:
+        dict: Style names for the header, totals and each (align, shaded, break)
+              combination used on employee sheets.
+    """
+    from openpyxl.styles import Alignment, Border, Side, Font, PatternFill, NamedStyle
+    from openpyxl.styles.fonts import DEFAULT_FONT
+
+    thin = Border(left=Side(style="thin"), right=Side(style="thin"), top=Side(style="thin"), bottom=Side(style="thin"))
+    shade = PatternFill(fill_type="solid", fgColor=SHADE_COLOR)
+    center = Alignment(horizontal="center")
+
+    def add(name, **attrs):
+        attrs.setdefault("font", copy(DEFAULT_FONT))
+        wb.add_named_style(NamedStyle(name=name, **attrs))
+        return name
+
+    names = {
+        "title": add("argx_title", font=Font(bold=True), alignment=center),
+        "header": add("argx_header", font=Font(bold=True), alignment=center, border=thin),
+        "total": add("argx_total", alignment=center, border=thin),
+    }
+    for align in set(SHEET_ALIGNS):
+        for shaded in (False, True):
+            for brk in (False, True):
+                attrs = {"alignment": Alignment(horizontal=align)}
+                if shaded:
+                    attrs["fill"] = shade
+                if brk:
+                    attrs["border"] = Border(bottom=Side(style="medium"))
+                names[(align, shaded, brk)] = add(
+                    f"argx_{align}{'_shaded' if shaded else ''}{'_break' if brk else ''}", **attrs
+                )
+    return names
+
+
+def write_argx_streaming(df, output_path, get_pay_period):
+    """
+    Writes the same workbook as write_argx using openpyxl's write-only mode.
+
+    Weekly totals are pre-aggregated into a name x week array and every cell
+    takes one of a few shared named styles, so rows stream to disk instead of
+    being held in memory as styled cells.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame containing parsed shift data, with calendar columns
+                           from add_calendar_columns.
+        output_path (str): File path for the resulting Excel file.
+        get_pay_period (function): A function that calculates pay period number from a date.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import PatternFill
+    from openpyxl.formatting.rule import FormulaRule
+    from openpyxl.utils import get_column_letter
+
+    def _styled(ws, value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    wb = Workbook(write_only=True)
+    styles = _argx_styles(wb)
+
+    all_weeks = df["WeekStart"].drop_duplicates().sort_values().tolist()
+    names = sorted(df["Name"].unique())
+    totals = (
+        df.groupby(["Name", "WeekStart"], observed=True)["Hours"].sum()
+        .unstack(fill_value=0)
+        .reindex(index=names, columns=all_weeks, fill_value=0)
+        .to_numpy(dtype=float)
+        .round(1)
+    )
+
+    # === Weekly Totals Sheet ===
+    ws_totals = wb.create_sheet("Weekly Totals")
+    ws_totals.freeze_panes = "A2"
+    ws_totals.column_dimensions["A"].width = 24.0
+    for i in range(len(all_weeks)):
+        ws_totals.column_dimensions[get_column_letter(i + 2)].width = 13.0
+
+    ws_totals.append(
+        [_styled(ws_totals, "Name", styles["title"])]
+        + [_styled(ws_totals, week.strftime("%Y-%m-%d"), styles["header"]) for week in all_weeks]
+    )
+    for name, hours in zip(names, totals.tolist()):
+        ws_totals.append([_styled(ws_totals, value, styles["total"]) for value in [name] + hours])
+
+    for i, week in enumerate(all_weeks, start=2):
+        if get_pay_period(week) % 2 == 1:
+            col_letter = get_column_letter(i)
+            ws_totals.conditional_formatting.add(f"{col_letter}2:{col_letter}{len(names)+1}",
+                FormulaRule(formula=["TRUE"], fill=PatternFill(fill_type="solid", fgColor=SHADE_COLOR)))
+
+    # === Employee Sheets ===
+    row_styles = {
+        (shaded, brk): [styles[(align, shaded, brk)] for align in SHEET_ALIGNS]
+        for shaded in (False, True) for brk in (False, True)
+    }
+    ordered = df.sort_values(["Name", "DateObj"], kind="stable")
+
+    for name, group in ordered.groupby("Name", sort=True, observed=True):
+        ws = wb.create_sheet(title=" ".join(name.replace(",", "").split()[::-1]))
+        ws.freeze_panes = "A2"
+        for col, width in enumerate(SHEET_WIDTHS, start=1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        ws.append([_styled(ws, head, styles["header"]) for head in SHEET_COLUMNS])
+
+        periods = group["PayPeriod"].to_numpy()
+        shaded = (periods % 2 == 1).tolist()
+        breaks = np.append(periods[1:] != periods[:-1], False).tolist()
+        for values, odd, brk in zip(group[SHEET_COLUMNS].to_numpy(dtype=object).tolist(), shaded, breaks):
+            ws.append([_styled(ws, v, style) for v, style in zip(values, row_styles[(odd, brk)])])
+
+    wb.save(output_path)
@@ -0,0 +1,71 @@
+# ==============================
+# ARGX_BENCH.PY — ARGX WRITER BENCHMARK
+# ==============================
+# Run from the repo root: python -m bench.argx_bench [weeks] [employees]
+# Unix only (peak RSS comes from the resource module).
+
+import os
+import sys
+import time
+import resource
+import multiprocessing
+from datetime import datetime
+from argx import write_argx, write_argx_streaming, make_pay_period_fn
+from tests.fixtures.argx_workbooks import synthetic_shifts, compare_argx
+
+
+def _bench_child(writer_name, weeks, employees, output_path, queue):
+    df = synthetic_shifts(weeks, employees)
+    get_pay_period = make_pay_period_fn(datetime(2025, 1, 13))
+    writer = {"write_argx": write_argx, "write_argx_streaming": write_argx_streaming}[writer_name]
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    writer(df, output_path, get_pay_period)
+    elapsed = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, rss_after, rss_after - rss_before))
+
+
+def benchmark_writers(weeks=52, employees=40, output_dir="/tmp"):
+    """
+    Times both ARGX writers on the same synthetic schedule, each in a fresh process.
+
+    Parameters:
+        weeks (int): Weeks of schedule to generate.
+        employees (int): Number of employees.
+        output_dir (str): Where the two workbooks are written.
+
+    Returns:
+        dict: Per writer, seconds, peak RSS and peak RSS growth during the write (KB),
+              plus the differences between the two workbooks.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    paths = {}
+    for writer_name in ("write_argx", "write_argx_streaming"):
+        paths[writer_name] = os.path.join(output_dir, f"ARGX_bench_{writer_name}.xlsx")
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_bench_child, args=(writer_name, weeks, employees, paths[writer_name], queue))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            raise RuntimeError(f"{writer_name} benchmark failed (exit code {proc.exitcode})")
+        elapsed, peak_kb, growth_kb = queue.get()
+        results[writer_name] = {"seconds": round(elapsed, 3), "peak_rss_kb": peak_kb, "write_rss_kb": growth_kb}
+
+    results["diffs"] = compare_argx(paths["write_argx"], paths["write_argx_streaming"])
+    return results
+
+
+if __name__ == "__main__":
+    weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 52
+    employees = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    results = benchmark_writers(weeks, employees)
+    for writer_name in ("write_argx", "write_argx_streaming"):
+        r = results[writer_name]
+        print(f"{writer_name:22s} {r['seconds']:8.3f}s  peak RSS {r['peak_rss_kb'] / 1024:8.1f} MB  "
+              f"(+{r['write_rss_kb'] / 1024:.1f} MB during write)")
+    print("Output: identical" if not results["diffs"] else f"Output: {len(results['diffs'])} difference(s)")
+    for diff in results["diffs"][:20]:
+        print("  " + diff)
@@ -0,0 +1,127 @@
+# ==============================
+# PARSER_BENCH.PY — SHIFT-LINE TOKENIZER BENCHMARK
+# ==============================
+# Run from the repo root: python -m bench.parser_bench <flowsheet.pdf> [...]
+
+import re
+import sys
+import time
+import logging
+from datetime import datetime, timedelta
+from config import PDF_ENGINE
+from pdf_text import iter_page_texts
+from parser import (
+    TIME_PATTERN, build_record, extract_name, extract_processing_date,
+    extract_shift_info, is_valid_shift_line,
+)
+from utils.static_data import valid_names
+
+TIME_RE = re.compile(TIME_PATTERN)
+
+# ==============================
+# BUILD RECORD (MULTI-REGEX, PRE-TOKENIZER)
+# ==============================
+def build_record_regex(line, processing_date, names=None):
+    # The per-field implementation build_record replaced; baseline for the benchmark and parity test
+    if not is_valid_shift_line(line):
+        return None
+
+    time_matches = TIME_RE.findall(line)
+    if len(time_matches) < 2:
+        return None
+    start_time, end_time = time_matches[:2]
+
+    names = valid_names() if names is None else names
+    full_name = extract_name(line)
+    if not full_name or full_name not in names:
+        return None
+
+    infos = extract_shift_info(line, processing_date)
+    if not infos:
+        return None
+    full_shift_id = " ".join(i["code"] for i in infos)
+    shift_type = infos[0]["type"]
+    day_type = infos[0]["DayType"]
+
+    dt_start = datetime.strptime(f"{processing_date} {start_time}", "%Y-%m-%d %H:%M")
+    dt_end = datetime.strptime(f"{processing_date} {end_time}", "%Y-%m-%d %H:%M")
+    if dt_end <= dt_start:
+        dt_end += timedelta(days=1)
+
+    hours = round((dt_end - dt_start).seconds / 3600, 1)
+
+    return {
+        "Name":     full_name,
+        "Date":     processing_date.strftime("%a, %b %d"),
+        "DateObj":  processing_date,
+        "Shift":    full_shift_id,
+        "Type":     shift_type,
+        "DayType":  day_type,
+        "Hours":    hours,
+        "Start":    start_time,
+        "End":      end_time
+    }
+
+# ==============================
+# TOKENIZER BENCHMARK
+# ==============================
+def flowsheet_lines(pdf_paths, engine=None):
+    # (line, processing_date) for every line on every dated page
+    corpus = []
+    for path in pdf_paths:
+        for text in iter_page_texts(path, engine=engine or PDF_ENGINE):
+            lines = text.splitlines()
+            processing_date = extract_processing_date(lines)
+            if processing_date:
+                corpus.extend((line, processing_date) for line in lines)
+    return corpus
+
+def _time_builder(build, corpus, names, repeat):
+    best = float("inf")
+    records = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        records = []
+        for line, processing_date in corpus:
+            try:
+                record = build(line, processing_date, names)
+            except ValueError:
+                record = None
+            if record:
+                records.append(record)
+        best = min(best, time.perf_counter() - started)
+    return best, records
+
+def benchmark_tokenizer(corpus, repeat=5):
+    """
+    Time build_record against the multi-regex reference on the same lines.
+
+    Parameters:
+        corpus (list): (line, processing_date) pairs, e.g. from flowsheet_lines
+        repeat (int): Runs per builder; the fastest is reported
+
+    Returns:
+        dict: lines/sec for both builders and whether their records match
+    """
+    names = valid_names()
+    regex_s, regex_records = _time_builder(build_record_regex, corpus, names, repeat)
+    token_s, token_records = _time_builder(build_record, corpus, names, repeat)
+    return {
+        "lines": len(corpus),
+        "records": len(token_records),
+        "regex_lines_per_sec": len(corpus) / regex_s if regex_s else 0.0,
+        "tokenizer_lines_per_sec": len(corpus) / token_s if token_s else 0.0,
+        "match": regex_records == token_records,
+    }
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python -m bench.parser_bench <flowsheet.pdf> [...]")
+
+    logging.getLogger().setLevel(logging.ERROR)  # Unrecognized-code warnings would dominate the timing
+    result = benchmark_tokenizer(flowsheet_lines(sys.argv[1:]))
+    print(f"{result['lines']} lines, {result['records']} records")
+    print(f"multi-regex: {result['regex_lines_per_sec']:,.0f} lines/sec")
+    print(f"tokenizer:   {result['tokenizer_lines_per_sec']:,.0f} lines/sec")
+    print("✅ Records match" if result["match"] else "❌ Records differ")
+    sys.exit(0 if result["match"] else 1)
@@ -0,0 +1,181 @@
+# ==============================
+# QUERY_PLANS.PY — SHIFT QUERY PLANS AND TIMINGS
+# ==============================
+# Run from the repo root: python -m bench.query_plans [--employees N] [--days N] [--postgres URL]
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import date, timedelta
+from sqlalchemy import create_engine, insert, select, text, func
+from models import db, Employee, ShiftRecord, CoverageShift
+
+PG_SCHEMA = "query_plans_bench"  # Scratch schema, so a real DATABASE_URL's tables are never touched
+FIRST_DAY = date(2025, 1, 13)
+SHIFT_CODES = ["D101", "D102", "D103", "E201", "E202", "N301", "SA1", "OD12"]
+
+# ==============================
+# ENGINES
+# ==============================
+def sqlite_engine(path):
+    return create_engine(f"sqlite:///{path}")
+
+def postgres_engine(url):
+    url = url.replace("postgres://", "postgresql://", 1)
+    with create_engine(url).begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {PG_SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {PG_SCHEMA}"))
+    return create_engine(url, connect_args={"options": f"-csearch_path={PG_SCHEMA}"})
+
+def drop_postgres_schema(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {PG_SCHEMA} CASCADE"))
+
+# ==============================
+# SEED
+# ==============================
+def seed(engine, employees=300, days=365, seed_value=0):
+    rng = random.Random(seed_value)
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+
+    shifts, coverage = [], []
+    for offset in range(days):
+        day = FIRST_DAY + timedelta(days=offset)
+        file_date = FIRST_DAY + timedelta(days=offset - offset % 21)  # One flowsheet per 3 weeks
+        day_type = "Weekend" if day.weekday() >= 5 else "Weekday"
+        for emp_id in rng.sample(range(1, employees + 1), employees // 3):
+            code = rng.choice(SHIFT_CODES)
+            row = {
+                "date": day, "shift": code, "start": "07:00", "end": "15:00", "type": "Day",
+                "day_type": day_type, "hours": 8.0, "file_date": file_date, "source_pdf": "ARG.pdf",
+            }
+            shifts.append({**row, "employee_id": emp_id, "is_coverage": False})
+            if rng.random() < 0.05:
+                coverage.append({**row, "org_employee_id": rng.randint(1, employees), "cov_employee_id": emp_id})
+
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), [
+            {"first_name": f"First{i}", "last_name": f"Last{i}", "status": "Full-time"}
+            for i in range(1, employees + 1)
+        ])
+        conn.execute(insert(ShiftRecord), shifts)
+        conn.execute(insert(CoverageShift), coverage)
+        conn.execute(text("ANALYZE"))
+    return len(shifts), len(coverage)
+
+def set_indexes(engine, enabled):
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            if enabled:
+                index.create(engine, checkfirst=True)
+            else:
+                index.drop(engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+# ==============================
+# REPRESENTATIVE QUERIES
+# ==============================
+def representative_queries(employees=300):
+    day = FIRST_DAY + timedelta(days=100)
+    emp_id = employees // 2
+    return {
+        "latest file_date (ingest guard)":
+            select(ShiftRecord.file_date).order_by(ShiftRecord.file_date.desc()).limit(1),
+        "shifts on a date":
+            select(ShiftRecord).where(ShiftRecord.date == day),
+        "shift code on a date":
+            select(ShiftRecord).where(ShiftRecord.date == day, ShiftRecord.shift == "D101"),
+        "employee schedule (pay period)":
+            select(ShiftRecord).where(
+                ShiftRecord.employee_id == emp_id,
+                ShiftRecord.date.between(day, day + timedelta(days=13)),
+            ),
+        "employee by name":
+            select(Employee.id).where(Employee.last_name == f"Last{emp_id}", Employee.first_name == f"First{emp_id}"),
+        "schedule by name":
+            select(ShiftRecord.date, ShiftRecord.shift)
+            .join(Employee, ShiftRecord.employee_id == Employee.id)
+            .where(Employee.last_name == f"Last{emp_id}", Employee.first_name == f"First{emp_id}")
+            .order_by(ShiftRecord.date),
+        "coverage given by employee":
+            select(CoverageShift).where(CoverageShift.cov_employee_id == emp_id).order_by(CoverageShift.date),
+        "hours per flowsheet":
+            select(ShiftRecord.file_date, func.sum(ShiftRecord.hours)).group_by(ShiftRecord.file_date),
+    }
+
+# ==============================
+# EXPLAIN + TIME
+# ==============================
+def explain(conn, stmt):
+    sql = str(stmt.compile(conn.engine, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    rows = conn.execute(text(prefix + sql)).all()
+    if conn.dialect.name == "sqlite":
+        return [row[-1] for row in rows]  # (id, parent, notused, detail)
+    return [row[0] for row in rows]
+
+def time_query(conn, stmt, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(stmt).all()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def run_backend(name, engine, employees, days, repeat):
+    shifts, coverage = seed(engine, employees, days)
+    print(f"\n===== {name}: {employees} employees, {shifts} shifts, {coverage} coverage rows =====")
+
+    results = {}
+    for enabled in (False, True):
+        set_indexes(engine, enabled)
+        label = "indexed" if enabled else "no indexes"
+        with engine.connect() as conn:
+            for title, stmt in representative_queries(employees).items():
+                ms = time_query(conn, stmt, repeat)
+                results.setdefault(title, {})[label] = ms
+                print(f"\n[{label}] {title}: {ms:.2f} ms")
+                for line in explain(conn, stmt):
+                    print(f"    {line}")
+
+    print(f"\n{'query':<34}{'no indexes':>12}{'indexed':>12}")
+    for title, times in results.items():
+        print(f"{title:<34}{times['no indexes']:>10.2f}ms{times['indexed']:>10.2f}ms")
+    return results
+
+# ==============================
+# CLI
+# ==============================
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Print EXPLAIN plans and timings for common shift queries.")
+    ap.add_argument("--employees", type=int, default=300)
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--postgres", default=os.environ.get("QUERY_PLANS_PG_URL"),
+                    help="postgresql:// URL of a local stand-in (also QUERY_PLANS_PG_URL)")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = sqlite_engine(os.path.join(tmp, "query_plans.db"))
+        run_backend("SQLite", engine, args.employees, args.days, args.repeat)
+        engine.dispose()
+
+    if not args.postgres:
+        print("\nℹ️ Postgres skipped: pass --postgres or set QUERY_PLANS_PG_URL")
+        return 0
+
+    engine = postgres_engine(args.postgres)
+    try:
+        run_backend("Postgres", engine, args.employees, args.days, args.repeat)
+    finally:
+        drop_postgres_schema(engine)
+        engine.dispose()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,9 @@ from utils.dev_mode import generate_dev_code
 ZWDISEG_DF = None
 ZWDISEG_PATH = None
 INVENTORY_DF = None
+INVENTORY_INDEX = None  # TrigramIndex over INVENTORY_DF, see inventory.get_inventory_index
+INVENTORY_INDEX_DIR = "inventory_index"  # Whoosh index built by inventory/inv_build.py
+INVENTORY_SEARCH_BACKEND = "pandas"  # "pandas" (INVENTORY_DF) or "whoosh" (INVENTORY_INDEX_DIR)
 INVENTORY_PATH = None
 MOVEMENT_DF = None
 MOVEMENT_PATH = None
@@ -34,6 +37,19 @@ VALID_EXTENSIONS = r"\.(pdf|xlsx|db)$"
 # ==============================
 UPLOAD_FOLDER = "/tmp"
 MAX_PDFS = 30
+PARSE_WORKERS = 1  # >1 fans PDF pages out across a process pool
+PARSE_CHUNK_PAGES = 4
+CLEAN_WORKERS = 1  # >1 cleans the sheets of multi-sheet workbooks in a process pool
+PDF_ENGINE = "pdfplumber"  # "pdfplumber" or "fitz" (PyMuPDF)
+PAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+ARGX_STREAMING = True  # write_only openpyxl writer for ARGX workbooks
+INGEST_BULK = True  # Preloaded employee map + chunked executemany for shift inserts
+INGEST_CHUNK_ROWS = 1000
+EXPORT_PAGE_ROWS = 1000  # Keyset page size for streamed CSV/JSON exports
+IMPORT_BATCH_ROWS = 1000  # Rows per committed batch for shift imports
+UPLOAD_JOBS = True  # Run index uploads on the background job queue and poll /jobs/<id>
+JOB_WORKERS = 2
+JOB_HISTORY = 50  # Finished jobs kept for status/result lookups
 ALLOWED_UPLOAD_TYPES = ["pdf", "xlsx", "db"]
 DEBUG_MODE = True
 DEV_MODE = {"112737", "ryce", "rvp", "pineapple", generate_dev_code()}
@@ -2,236 +2,350 @@
 
 import json
 import csv
-from io import StringIO
-from flask import Response, jsonify, request
+import codecs
+from io import StringIO, TextIOWrapper
+from flask import Response, jsonify, request, stream_with_context
+from sqlalchemy import insert, select
 from models import db, ShiftRecord, CoverageShift
-from datetime import datetime
+from config import EXPORT_PAGE_ROWS, IMPORT_BATCH_ROWS
+from datetime import date, datetime
 
 
-# //// Import JSON //// #
-def import_shifts_from_json():
-    try:
-        data = request.get_json()
-
-        # Track how many were added
-        added_shift_records = 0
-        added_coverage_shifts = 0
-
-        for r in data.get("shift_records", []):
-            shift = ShiftRecord(
-                name=r["name"],
-                date=datetime.fromisoformat(r["date"]).date(),
-                shift=r["shift"],
-                start=r["start"],
-                end=r["end"],
-                type=r["type"],
-                hours=float(r["hours"]),
-                is_coverage=r.get("is_coverage", False),
-                source_pdf=r.get("source_pdf"),
-                notes=r.get("notes")
-            )
-            db.session.add(shift)
-            added_shift_records += 1
-
-        for c in data.get("coverage_shifts", []):
-            coverage = CoverageShift(
-                date=datetime.fromisoformat(c["date"]).date(),
-                shift=c["shift"],
-                start=c["start"],
-                end=c["end"],
-                hours=float(c["hours"]),
-                org_name=c["org_name"],
-                cov_name=c["cov_name"],
-                reason=c.get("reason"),
-                shift_type=c.get("shift_type"),
-                source_pdf=c.get("source_pdf"),
-                notes=c.get("notes"),
-                shift_record_id=c.get("shift_record_id")
-            )
-            db.session.add(coverage)
-            added_coverage_shifts += 1
+# //// Import Helpers //// #
+IMPORT_TABLES = {"shift_records": ShiftRecord, "coverage_shifts": CoverageShift}
+IMPORT_CSV_SECTIONS = {"ShiftRecord Table": "shift_records", "CoverageShift Table": "coverage_shifts"}
+IMPORT_SKIP_COLUMNS = {"id"}  # Exports carry ids; imported rows get new ones
+IMPORT_MAX_ERRORS = 20
+BOOL_VALUES = {"true": True, "1": True, "yes": True, "false": False, "0": False, "no": False}
 
-        db.session.commit()
 
-        print(f"[JSON Import] Imported {added_shift_records} ShiftRecord(s) and {added_coverage_shifts} CoverageShift(s).")
-        
-        return jsonify({
-            "message": "Import successful",
-            "shift_records_added": added_shift_records,
-            "coverage_shifts_added": added_coverage_shifts
-        })
+def parse_value(column, value):
+    if value is None:
+        return None
+    kind = column.type.python_type
+    if kind is bool:
+        parsed = value if isinstance(value, bool) else BOOL_VALUES.get(str(value).strip().lower())
+        if parsed is None:
+            raise ValueError(f"not a boolean: {value!r}")
+        return parsed
+    if kind is datetime:
+        return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    if kind is date:
+        return datetime.fromisoformat(str(value)).date()
+    if kind is int:
+        if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"not an integer: {value!r}")
+        return int(value)
+    if kind is float:
+        if isinstance(value, bool):
+            raise ValueError(f"not a number: {value!r}")
+        return float(value)
+    value = str(value)
+    length = getattr(column.type, "length", None)
+    if length and len(value) > length:
+        raise ValueError(f"longer than {length} characters")
+    return value
 
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": str(e)}), 500
 
-# //// Import CSV //// #
-def import_shifts_from_csv():
-    try:
-        file = request.files.get("file")
-        if not file:
-            return jsonify({"error": "No CSV file uploaded."}), 400
+def validate_row(model, row):
+    # Returns a dict of real column values, or raises ValueError naming the bad fields
+    if not isinstance(row, dict):
+        raise ValueError("row is not an object")
+    columns = model.__table__.columns
+    unknown = sorted(k for k in row if k not in columns and k not in IMPORT_SKIP_COLUMNS)
+    if unknown:
+        raise ValueError(f"unknown column(s): {', '.join(unknown)}")
 
-        stream = StringIO(file.stream.read().decode("utf-8"))
-        reader = csv.reader(stream)
+    values = {}
+    for column in columns:
+        if column.name in IMPORT_SKIP_COLUMNS or column.name not in row:
+            continue
+        try:
+            values[column.name] = parse_value(column, row[column.name])
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{column.name}: {e}") from None
 
-        mode = None
-        added_shift_records = 0
-        added_coverage_shifts = 0
+    missing = [
+        c.name for c in columns
+        if c.name not in IMPORT_SKIP_COLUMNS and not c.nullable and c.default is None and values.get(c.name) is None
+    ]
+    if missing:
+        raise ValueError(f"missing required column(s): {', '.join(missing)}")
+    return values
 
-        for row in reader:
-            # Skip empty lines
-            if not row or all(col.strip() == "" for col in row):
-                continue
 
-            # Detect section headers
-            if "ShiftRecord Table" in row[0]:
-                mode = "shift"
-                next(reader)  # Skip header row
+def iter_csv_rows(stream):
+    # Sections as written by export_shifts_csv: title row, header row, data rows
+    reader = csv.reader(TextIOWrapper(stream, encoding="utf-8", newline=""))
+    key, header = None, None
+    for row in reader:
+        if not row or all(col.strip() == "" for col in row):
+            continue
+        if row[0] in IMPORT_CSV_SECTIONS:
+            key, header = IMPORT_CSV_SECTIONS[row[0]], next(reader, [])
+            continue
+        if key is None:
+            raise ValueError(f"CSV row before any section title: {row[:3]}")
+        # Exports write None as an empty cell
+        yield key, {name: (value if value != "" else None) for name, value in zip(header, row)}
+
+
+def iter_json_rows(stream, chunk_size=64 * 1024):
+    """
+    Incrementally parse {"shift_records": [...], "coverage_shifts": [...]}.
+
+    Only the current chunk and the row being decoded are held in memory.
+    Unknown top-level keys are decoded and skipped.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    state = {"buf": "", "pos": 0, "eof": False}
+
+    def fill():
+        if state["eof"]:
+            return False
+        chunk = stream.read(chunk_size)
+        state["eof"] = not chunk
+        state["buf"] = state["buf"][state["pos"]:] + utf8.decode(chunk, final=state["eof"])
+        state["pos"] = 0
+        return True
+
+    def peek():
+        while True:
+            buf, pos = state["buf"], state["pos"]
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            state["pos"] = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                raise ValueError("Unexpected end of JSON upload")
+
+    def expect(chars):
+        ch = peek()
+        if ch not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON upload, got {ch!r}")
+        state["pos"] += 1
+        return ch
+
+    def value():
+        peek()
+        while True:
+            try:
+                obj, end = decoder.raw_decode(state["buf"], state["pos"])
+            except json.JSONDecodeError as e:
+                if not fill():
+                    raise ValueError(f"Invalid JSON upload: {e.msg}") from None
                 continue
-            elif "CoverageShift Table" in row[0]:
-                mode = "coverage"
-                next(reader)  # Skip header row
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(state["buf"]) and fill():
                 continue
+            state["pos"] = end
+            return obj
 
-            if mode == "shift":
-                shift = ShiftRecord(
-                    name=row[1],
-                    date=datetime.fromisoformat(row[2]).date(),
-                    shift=row[3],
-                    start=row[4],
-                    end=row[5],
-                    type=row[6],
-                    hours=float(row[7]),
-                    is_coverage=row[8].lower() == "true",
-                    source_pdf=row[9],
-                    created_at=datetime.fromisoformat(row[10]) if row[10] else None,
-                    modified_at=datetime.fromisoformat(row[11]) if row[11] else None,
-                    notes=row[12] if len(row) > 12 else None
-                )
-                db.session.add(shift)
-                added_shift_records += 1
-
-            elif mode == "coverage":
-                coverage = CoverageShift(
-                    date=datetime.fromisoformat(row[1]).date(),
-                    shift=row[2],
-                    start=row[3],
-                    end=row[4],
-                    hours=float(row[5]),
-                    org_name=row[6],
-                    cov_name=row[7],
-                    reason=row[8],
-                    shift_type=row[9],
-                    source_pdf=row[10],
-                    created_at=datetime.fromisoformat(row[11]) if row[11] else None,
-                    modified_at=datetime.fromisoformat(row[12]) if row[12] else None,
-                    notes=row[13] if len(row) > 13 else None
-                )
-                db.session.add(coverage)
-                added_coverage_shifts += 1
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        key = value()
+        expect(":")
+        if key in IMPORT_TABLES:
+            expect("[")
+            if peek() == "]":
+                state["pos"] += 1
+            else:
+                while True:
+                    yield key, value()
+                    if expect(",]") == "]":
+                        break
+        else:
+            value()
+        if expect(",}") == "}":
+            return
 
-        db.session.commit()
 
-        print(f"[CSV Import] Imported {added_shift_records} ShiftRecord(s) and {added_coverage_shifts} CoverageShift(s).")
-        
-        return jsonify({
-            "message": "CSV import successful",
-            "shift_records_added": added_shift_records,
-            "coverage_shifts_added": added_coverage_shifts
-        })
+def import_rows(rows, label, resume_from=0, batch_rows=None):
+    """
+    Validate and insert rows in committed batches.
 
+    Parameters:
+        rows (iterable): (table key, row dict) pairs in upload order
+        label (str): Log prefix, e.g. "CSV Import"
+        resume_from (int): Rows already committed by an earlier, failed upload
+        batch_rows (int): Rows per batch; defaults to IMPORT_BATCH_ROWS
+
+    Returns:
+        Response: JSON summary; on failure a 500 whose resume_from is the
+        row to restart from
+    """
+    batch_rows = batch_rows or IMPORT_BATCH_ROWS
+    added = dict.fromkeys(IMPORT_TABLES, 0)
+    errors, skipped, batches = [], 0, 0
+    committed = resume_from
+    pending = []
+    row_number = 0
+
+    def flush():
+        nonlocal committed, batches
+        for key, model in IMPORT_TABLES.items():
+            # executemany needs one key set per statement
+            groups = {}
+            for table_key, values in pending:
+                if table_key == key:
+                    groups.setdefault(tuple(values), []).append(values)
+            for group in groups.values():
+                db.session.execute(insert(model), group)
+                added[key] += len(group)
+        db.session.commit()
+        committed = row_number
+        batches += 1
+        pending.clear()
+        print(f"[{label}] Batch {batches}: committed through row {committed} "
+              f"({added['shift_records']} ShiftRecord(s), {added['coverage_shifts']} CoverageShift(s))")
+
+    try:
+        for key, row in rows:
+            row_number += 1
+            if row_number <= resume_from:
+                continue
+            try:
+                pending.append((key, validate_row(IMPORT_TABLES[key], row)))
+            except ValueError as e:
+                skipped += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append({"row": row_number, "table": key, "error": str(e)})
+            if row_number - committed >= batch_rows:
+                flush()
+        if pending or row_number > committed:
+            flush()
     except Exception as e:
         db.session.rollback()
-        return jsonify({"error": str(e)}), 500
+        print(f"[{label}] Failed after row {committed}: {e}")
+        return jsonify({
+            "error": str(e),
+            "resume_from": committed,
+            "shift_records_added": added["shift_records"],
+            "coverage_shifts_added": added["coverage_shifts"],
+        }), 500
+
+    print(f"[{label}] Imported {added['shift_records']} ShiftRecord(s) and {added['coverage_shifts']} CoverageShift(s).")
+
+    return jsonify({
+        "message": "Import successful",
+        "shift_records_added": added["shift_records"],
+        "coverage_shifts_added": added["coverage_shifts"],
+        "rows_read": row_number,
+        "rows_skipped": skipped,
+        "errors": errors,
+        "batches": batches,
+        "resume_from": committed,
+    })
+
+
+def resume_from_arg():
+    return max(request.args.get("resume_from", 0, type=int), 0)
+
+
+# //// Import JSON //// #
+def import_shifts_from_json():
+    return import_rows(iter_json_rows(request.stream), "JSON Import", resume_from_arg())
+
+# //// Import CSV //// #
+def import_shifts_from_csv():
+    file = request.files.get("file")
+    if not file:
+        return jsonify({"error": "No CSV file uploaded."}), 400
+    return import_rows(iter_csv_rows(file.stream), "CSV Import", resume_from_arg())
+
+
+# //// Export Helpers //// #
+EXPORT_TABLES = (("shift_records", "ShiftRecord Table", ShiftRecord), ("coverage_shifts", "CoverageShift Table", CoverageShift))
+
+
+def export_columns(model):
+    return [c.name for c in model.__table__.columns]
+
+
+def iter_table_pages(model, page_rows=None):
+    # Keyset pagination on id: every page is an index range scan, and only one page is held at a time
+    page_rows = page_rows or EXPORT_PAGE_ROWS
+    table = model.__table__
+    last_id = None
+    while True:
+        stmt = select(table).order_by(table.c.id).limit(page_rows)
+        if last_id is not None:
+            stmt = stmt.where(table.c.id > last_id)
+        rows = db.session.execute(stmt).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def csv_line(values):
+    line = StringIO()
+    csv.writer(line).writerow(values)
+    return line.getvalue()
 
 
 # //// Export JSON //// #
 def export_shifts_json():
-    shift_records = [
-        {
-            "id": r.id,
-            "name": r.name,
-            "date": r.date.isoformat(),
-            "shift": r.shift,
-            "start": r.start,
-            "end": r.end,
-            "type": r.type,
-            "hours": r.hours,
-            "is_coverage": r.is_coverage,
-            "source_pdf": r.source_pdf,
-            "created_at": r.created_at.isoformat() if r.created_at else None,
-            "modified_at": r.modified_at.isoformat() if r.modified_at else None,
-            "notes": r.notes
-        }
-        for r in ShiftRecord.query.all()
-    ]
+    def generate():
+        counts = {}
+        yield "{"
+        for t, (key, _, model) in enumerate(EXPORT_TABLES):
+            yield f'{"," if t else ""}\n  {json.dumps(key)}: ['
+            columns = export_columns(model)
+            count = 0
+            for rows in iter_table_pages(model):
+                yield "".join(
+                    f'{"," if count + n else ""}\n    {json.dumps(dict(zip(columns, row)), default=json_default)}'
+                    for n, row in enumerate(rows)
+                )
+                count += len(rows)
+            counts[key] = count
+            yield "\n  ]"
+        yield "\n}\n"
 
-    coverage_shifts = [
-        {
-            "id": c.id,
-            "date": c.date.isoformat(),
-            "shift": c.shift,
-            "start": c.start,
-            "end": c.end,
-            "hours": c.hours,
-            "org_name": c.org_name,
-            "cov_name": c.cov_name,
-            "reason": c.reason,
-            "shift_type": c.shift_type,
-            "source_pdf": c.source_pdf,
-            "created_at": c.created_at.isoformat() if c.created_at else None,
-            "modified_at": c.modified_at.isoformat() if c.modified_at else None,
-            "notes": c.notes,
-            "shift_record_id": c.shift_record_id
-        }
-        for c in CoverageShift.query.all()
-    ]
+        print(f"[JSON Export] Exported {counts['shift_records']} ShiftRecord(s) and {counts['coverage_shifts']} CoverageShift(s).")
 
-    # Log export
-    print(f"[JSON Export] Exported {len(shift_records)} ShiftRecord(s) and {len(coverage_shifts)} CoverageShift(s).")
-    
-    # Convert the data to JSON and return it as a downloadable file
-    data = {
-        "shift_records": shift_records,
-        "coverage_shifts": coverage_shifts
-    }
-    
     # Force download of the JSON file
-    response = Response(
-        json.dumps(data, indent=2),  # JSON formatted with indentation
+    return Response(
+        stream_with_context(generate()),
         mimetype="application/json",
         headers={
             "Content-Disposition": "attachment; filename=argx_export.json"  # Forces download
         }
     )
-    return response
 
 # //// Export CSV //// #
 def export_shifts_csv():
-    output = StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow(["ShiftRecord Table"])
-    writer.writerow(["ID", "Name", "Date", "Shift", "Start", "End", "Type", "Hours", "IsCoverage", "SourcePDF", "Created", "Modified", "Notes"])
-    for r in ShiftRecord.query.all():
-        writer.writerow([
-            r.id, r.name, r.date, r.shift, r.start, r.end, r.type,
-            r.hours, r.is_coverage, r.source_pdf, r.created_at, r.modified_at, r.notes
-        ])
-
-    writer.writerow([])
-    writer.writerow(["CoverageShift Table"])
-    writer.writerow(["ID", "Date", "Shift", "Start", "End", "Hours", "OrgName", "CovName", "Reason", "ShiftType", "SourcePDF", "Created", "Modified", "Notes"])
-    for c in CoverageShift.query.all():
-        writer.writerow([
-            c.id, c.date, c.shift, c.start, c.end, c.hours, c.org_name, c.cov_name,
-            c.reason, c.shift_type, c.source_pdf, c.created_at, c.modified_at, c.notes
-        ])
-
-    output.seek(0)
-
-    print(f"[CSV Export] Exported {ShiftRecord.query.count()} ShiftRecord(s) and {CoverageShift.query.count()} CoverageShift(s).")
-    
-    return Response(output, mimetype="text/csv", headers={"Content-Disposition": "attachment; filename=argx_export.csv"})
+    def generate():
+        counts = []
+        for t, (_, title, model) in enumerate(EXPORT_TABLES):
+            if t:
+                yield csv_line([])
+            yield csv_line([title])
+            yield csv_line(export_columns(model))
 
+            count = 0
+            for rows in iter_table_pages(model):
+                page = StringIO()
+                csv.writer(page).writerows(rows)
+                yield page.getvalue()
+                count += len(rows)
+            counts.append(count)
+
+        print(f"[CSV Export] Exported {counts[0]} ShiftRecord(s) and {counts[1]} CoverageShift(s).")
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment; filename=argx_export.csv"}
+    )
@@ -8,10 +8,13 @@ import os
 import logging
 import pandas as pd
 import sqlite3
+import tempfile
 
-from flask import request, render_template
+from flask import request, render_template, jsonify, current_app
 from werkzeug.utils import secure_filename
 from config import CATALOG_REGEX, SENIORITY_REGEX, OPTIMIZE_REGEX, MOVEMENT_REGEX, ZWDISEG_REGEX, CLEAN_REGEX, MERGE_REGEX
+from config import UPLOAD_JOBS
+from job_queue import JOB_QUEUE, report_progress, record_output
 
 # Modular handlers
 from handlers.optimize_handler import handle as handle_optimize
@@ -39,6 +42,7 @@ from utils.data_cleaner import (
 # ==============================
 def handle_excel_file(file, fname):
     fname_lower = fname.lower()
+    report_progress(0.1, f"Cleaning {fname}")
     # DETERMINE CLEANING PIPELINE
 
     # REGEX CLEAN
@@ -46,6 +50,7 @@ def handle_excel_file(file, fname):
         logging.debug("[HANDLER] Matched CLEAN — using optimize cleaning pipeline")
         steps = [clean_headers, clean_columns, clean_deleted_rows, clean_flags, clean_format]
         df = clean_xlsx(file, *steps, name=fname, multi_sheet=False, format=True)
+        report_progress(0.6, "Building results")
         return handle_cleaner(df, fname)
 
     # REGEX OPTIMIZATION
@@ -53,6 +58,7 @@ def handle_excel_file(file, fname):
         logging.debug("[HANDLER] Matched OPTIMIZE — using optimize cleaning pipeline")
         steps = [clean_headers, clean_deleted_rows, clean_flags, clean_columns, clean_format]
         df = clean_xlsx(file, *steps, name=fname, multi_sheet=False)
+        report_progress(0.6, "Building results")
         return handle_optimize(df, filename=fname)
 
     # REGEX MOVEMENT
@@ -60,6 +66,7 @@ def handle_excel_file(file, fname):
         logging.debug("[HANDLER] Matched MOVEMENT — using movement cleaning pipeline")
         steps = [clean_headers, clean_columns, clean_deleted_rows, clean_flags, clean_format]
         df = clean_xlsx(file, *steps, name=fname)
+        report_progress(0.6, "Building results")
         return handle_movement(df)
 
     # REGEX SENIORITY
@@ -67,6 +74,7 @@ def handle_excel_file(file, fname):
         logging.debug("[HANDLER] Matched SENIORITY — using optimize cleaning pipeline")
         steps = [clean_headers]
         df = clean_xlsx(file, *steps, name=fname)
+        report_progress(0.6, "Building results")
         return handle_seniority(df)
 
     # REGEX CATALOG
@@ -75,6 +83,7 @@ def handle_excel_file(file, fname):
         #df = pd.read_excel(file)
         steps = [clean_headers]
         df = clean_xlsx(file, *steps, name=fname, multi_sheet=False)
+        report_progress(0.6, "Building results")
         return handle_inventory(df)
 
     # REGEX ZWDISEG
@@ -82,6 +91,7 @@ def handle_excel_file(file, fname):
         logging.debug("[HANDLER] Matched ZWDISEG — using zwdiseg cleaning pipeline")
         steps = [clean_headers, clean_columns, clean_deleted_rows, clean_flags, clean_format]
         df = clean_xlsx(file, *steps, name=fname)
+        report_progress(0.6, "Building results")
         return handle_zwdiseg(df)
 
     # REGEX MERGE
@@ -89,6 +99,7 @@ def handle_excel_file(file, fname):
         logging.debug("[HANDLER] Matched MERGE — routing to merge handler")
         steps = [clean_headers, clean_columns]
         df = clean_xlsx(file, *steps, name=fname, multi_sheet=False)
+        report_progress(0.6, "Building results")
         return handle_merge(df)
 
     # ELSE CLEAN (FALLBACK)
@@ -96,8 +107,124 @@ def handle_excel_file(file, fname):
         logging.debug("[HANDLER] No match — using fallback cleaning pipeline")
         steps = [clean_headers, clean_columns, clean_flags, clean_deleted_rows, clean_format]
         df = clean_xlsx(file, *steps, name=fname, multi_sheet=False, format=True)
+        report_progress(0.6, "Building results")
         return handle_cleaner(df, fname)
 
+# ==============================
+# RUN ONE UPLOAD
+# SHARED BY INLINE REQUESTS AND JOBS
+# ==============================
+def run_upload(kind, path, fname):
+    # ==============================
+    # PDF: FLOWSHEET / ARG
+    # ==============================
+    if kind == "pdf":
+        from report import process_report
+        report_progress(0.05, f"Parsing {fname}")
+        output_files, stats = process_report([path])
+        for output in output_files:
+            record_output(output)
+
+        output_filenames = [os.path.basename(f) for f in output_files]
+        pdf_name = os.path.basename(path)
+        if pdf_name not in output_filenames:
+            output_filenames.append(pdf_name)
+
+        return render_template("arg.html", outputs=output_filenames, stats=stats)
+
+    # ==============================
+    # Excel: Clean and reroute based on cleaned content
+    # ==============================
+    if kind == "xlsx":
+        with open(path, "rb") as f:
+            return handle_excel_file(f, fname)
+
+    # ==============================
+    # SQLite: Inventory Database
+    # ==============================
+    if kind == "db":
+        report_progress(0.1, f"Loading {fname}")
+        with sqlite3.connect(path) as conn:
+            df = pd.read_sql_query("SELECT * FROM inventory", conn)
+
+        df = clean_db(df, name="DB Inventory Load")
+        report_progress(0.6, "Loading inventory")
+        return handle_inventory(df)
+
+    return render_template("index.html", error="[HANDLER] Unsupported file type.")
+
+def run_upload_job(app, base_url, kind, path, fname, temporary=False):
+    # Handlers render templates and log through current_app: give the worker a request context
+    with app.test_request_context("/", base_url=base_url):
+        try:
+            return run_upload(kind, path, fname)
+        finally:
+            if temporary and os.path.exists(path):
+                os.remove(path)
+
+# ==============================
+# RESOLVE UPLOAD SOURCE
+# ==============================
+def upload_kind(fname):
+    fname_lower = fname.lower()
+    for kind in ("pdf", "xlsx", "db"):
+        if fname_lower.endswith(f".{kind}"):
+            return kind
+    return None
+
+def resolve_upload(uploaded_files, existing_files):
+    """
+    Returns (kind, path, fname, temporary) for the first selected file, or None
+    when its type is unsupported. Uploads are written to disk here, since the
+    request's file streams close before a queued job runs.
+    """
+    # ==============================
+    # HANDLE EXISTING FILE SELECTION (STATIC)
+    # ==============================
+    if existing_files:
+        fname = secure_filename(existing_files[0])
+        kind = upload_kind(fname)
+        logging.debug(f"[HANDLER] Selected existing file: {fname}")
+        if kind not in ("xlsx", "db"):
+            return None
+        return kind, os.path.join("static", fname), fname, False
+
+    # ==============================
+    # FILE UPLOAD FLOW
+    # ==============================
+    file = uploaded_files[0]
+    fname = secure_filename(file.filename)
+    kind = upload_kind(fname)
+    logging.debug(f"[HANDLER] Uploaded file: {fname}")
+
+    if kind == "pdf":
+        match = re.search(r"\d{4}-\d{2}-\d{2}", fname)
+        date_str = match.group() if match else "unknown"
+        save_path = os.path.join("/tmp", f"ARG_{date_str}.pdf")
+        file.save(save_path)
+        logging.debug(f"[HANDLER] Saved uploaded PDF as: {save_path}")
+        return kind, save_path, fname, False
+
+    if kind == "xlsx":
+        # Routing uses the original name; the bytes go to a private temp file
+        fd, save_path = tempfile.mkstemp(suffix=".xlsx", dir="/tmp")
+        with os.fdopen(fd, "wb") as out:
+            file.save(out)
+        return kind, save_path, fname, True
+
+    if kind == "db":
+        save_path = os.path.join("/tmp", fname)
+        file.save(save_path)
+        return kind, save_path, fname, False
+
+    return None
+
+def wants_job():
+    flag = request.values.get("async")
+    if flag is not None:
+        return flag.strip().lower() in {"1", "true", "yes", "on"}
+    return UPLOAD_JOBS
+
 # ==============================
 # MAIN ENTRYPOINT
 # ROUTE BASED ON FILE TYPE/NAME
@@ -113,95 +240,30 @@ def process_index_upload():
         if not uploaded_files and not existing_files:
             return render_template("index.html", error="[HANDLER] No files uploaded.")
 
-        # ==============================
-        # HANDLE EXISTING FILE SELECTION (STATIC)
-        # ==============================
-        if existing_files:
-            fname = secure_filename(existing_files[0])
-            fname_lower = fname.lower()
-            logging.debug(f"[HANDLER] Selected existing file: {fname}")
-
-            # ==============================
-            # SQLite: Inventory Database
-            # ==============================
-            if fname_lower.endswith(".db"):
-                static_path = os.path.join("static", fname)
-                logging.debug(f"[HANDLER] Using static DB path: {static_path}")
-
-                with sqlite3.connect(static_path) as conn:
-                    df = pd.read_sql_query("SELECT * FROM inventory", conn)
-
-                df = clean_db(df, name="DB Inventory Load")
-                return handle_inventory(df)
-
-            # ==============================
-            # Excel: Clean and reroute based on cleaned content
-            # ==============================
-            elif fname_lower.endswith(".xlsx"):
-                static_path = os.path.join("static", fname)
-                logging.debug("[HANDLER] Routed to cleaner logic for static .xlsx file")
-                with open(static_path, "rb") as f:
-                    return handle_excel_file(f, fname)
-
-            # ==============================
-            # UNSUPPORTED STATIC FILE TYPE
-            # ==============================
+        source = resolve_upload(uploaded_files, existing_files)
+        if source is None:
             return render_template("index.html", error="[HANDLER] Unsupported file type.")
+        kind, path, fname, temporary = source
 
         # ==============================
-        # FILE UPLOAD FLOW
+        # INLINE: PROCESS WITHIN THE REQUEST
         # ==============================
-        file = uploaded_files[0]
-        fname = secure_filename(file.filename)
-        fname_lower = fname.lower()
-
-        logging.debug(f"[HANDLER] Uploaded file: {fname}")
-
-        # ==============================
-        # PDF: FLOWSHEET / ARG
-        # ==============================
-        if fname_lower.endswith(".pdf"):
-            from report import process_report
-            match = re.search(r"\d{4}-\d{2}-\d{2}", fname)
-            date_str = match.group() if match else "unknown"
-            pdf_name = f"ARG_{date_str}.pdf"
-
-            save_path = os.path.join("/tmp", pdf_name)
-            file.save(save_path)
-            logging.debug(f"[HANDLER] Saved uploaded PDF as: {save_path}")
-
-            output_files, stats = process_report([save_path])
-            output_filenames = [os.path.basename(f) for f in output_files]
-            if pdf_name not in output_filenames:
-                output_filenames.append(pdf_name)
-
-            return render_template("arg.html", outputs=output_filenames, stats=stats)
-
-        # ==============================
-        # Excel: Clean and reroute based on cleaned content
-        # ==============================
-        if fname_lower.endswith(".xlsx"):
-            logging.debug("[HANDLER] Routed to cleaner logic for uploaded .xlsx file")
-            return handle_excel_file(file, fname)
-
-        # ==============================
-        # SQLite: Inventory Database (Uploaded)
-        # ==============================
-        if fname_lower.endswith(".db"):
-            logging.debug("[HANDLER] Matched SQLite DB — reading inventory table")
-            save_path = os.path.join("/tmp", fname)
-            file.save(save_path)
-
-            with sqlite3.connect(save_path) as conn:
-                df = pd.read_sql_query("SELECT * FROM inventory", conn)
-
-            df = clean_db(df, name="DB Inventory Load")
-            return handle_inventory(df)
+        if not wants_job():
+            try:
+                return run_upload(kind, path, fname)
+            finally:
+                if temporary and os.path.exists(path):
+                    os.remove(path)
 
         # ==============================
-        # UNKNOWN FILE TYPE
+        # QUEUED: RETURN A JOB TO POLL
         # ==============================
-        return render_template("index.html", error="[HANDLER] Unsupported file type.")
+        app = current_app._get_current_object()
+        job = JOB_QUEUE.submit(kind, fname, run_upload_job, app, request.host_url, kind, path, fname, temporary)
+        status = job.to_dict()
+        if request.accept_mimetypes.best == "application/json":
+            return jsonify(status), 202
+        return render_template("job.html", job=status), 202
 
     except Exception as e:
         logging.exception("[HANDLER] Error during file processing")
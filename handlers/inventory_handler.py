@@ -13,7 +13,9 @@ def handle(df=None):
             raise ValueError("No inventory data provided")
 
         import config
+        from inventory import build_inventory_index
         config.INVENTORY_DF = df
+        config.INVENTORY_INDEX = build_inventory_index(df)
 
         app.logger.info(f"Loaded inventory: {df.shape[0]} rows × {df.shape[1]} columns")
         return render_template("inventory.html", table=[])
@@ -3,27 +3,102 @@
 # ==============================
 
 import os
+import shutil
+import hashlib
+import logging
+import threading
+from pathlib import Path
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import timedelta
+from config import UPLOAD_FOLDER
+
+HEATMAP_CACHE_DIR = Path(UPLOAD_FOLDER) / ".cache" / "heatmaps"
+HEATMAP_CACHE_MAX_FILES = 32
+HEATMAP_RENDER_VERSION = 1  # Bump when the figure styling changes
+HEATMAP_FIGSIZE = (10, 6)
+
+# One Agg figure, reused for every render
+_FIGURE = None
+_FIGURE_LOCK = threading.Lock()
 
 # ==============================
-# GENERATE HEATMAP PNG
+# HEATMAP MATRIX
 # ==============================
-def generate_heatmap_png(df, date_label):
-    df["WeekStart"] = df["DateObj"].apply(lambda d: d - timedelta(days=d.weekday()))
-    
-    pivot = df.pivot_table(index="Name", columns="WeekStart", values="Hours", aggfunc="sum", fill_value=0)
+def heatmap_matrix(df):
+    # WeekStart is precomputed on the consolidated frame
+    pivot = df.pivot_table(index="Name", columns="WeekStart", values="Hours", aggfunc="sum", fill_value=0, observed=True)
     pivot = pivot.round(0).astype(int)
+    pivot.columns = pivot.columns.date  # Label weeks as dates, not midnight timestamps
+    pivot.index = pivot.index.astype(str)
+    return pivot
+
+def matrix_fingerprint(pivot):
+    digest = hashlib.sha256(f"v{HEATMAP_RENDER_VERSION}".encode("utf-8"))
+    digest.update("\x1f".join(pivot.index).encode("utf-8"))
+    digest.update("\x1f".join(str(week) for week in pivot.columns).encode("utf-8"))
+    digest.update(pivot.to_numpy(dtype="int64").tobytes())
+    return digest.hexdigest()
+
+def heatmap_json(df):
+    pivot = heatmap_matrix(df)
+    return {
+        "names": pivot.index.tolist(),
+        "weeks": [week.strftime("%Y-%m-%d") for week in pivot.columns],
+        "hours": pivot.to_numpy().tolist(),
+        "max": int(pivot.to_numpy().max()) if pivot.size else 0,
+        "fingerprint": matrix_fingerprint(pivot),
+    }
+
+# ==============================
+# RENDER (AGG, POOLED FIGURE)
+# ==============================
+def _get_figure():
+    global _FIGURE
+    if _FIGURE is None:
+        # Plotting stack loads on the first heatmap, not at app startup
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        _FIGURE = Figure(figsize=HEATMAP_FIGSIZE)
+        FigureCanvasAgg(_FIGURE)
+    return _FIGURE
 
-    plt.figure(figsize=(10, 6))
-    sns.heatmap(pivot, annot=True, fmt="d", cmap="Blues")
+def render_heatmap(pivot, path):
+    import seaborn as sns
+
+    with _FIGURE_LOCK:
+        fig = _get_figure()
+        fig.clear()
+        ax = fig.add_subplot()
+        sns.heatmap(pivot, annot=True, fmt="d", cmap="Blues", ax=ax)
+        ax.set_title("Weekly Hours per Person")
+        fig.tight_layout()
+        fig.savefig(path, format="png")
+        fig.clear()
+
+def _prune_cache():
+    files = sorted(HEATMAP_CACHE_DIR.glob("*.png"), key=lambda p: p.stat().st_mtime)
+    for stale in files[:-HEATMAP_CACHE_MAX_FILES]:
+        stale.unlink(missing_ok=True)
+
+# ==============================
+# GENERATE HEATMAP PNG
+# ==============================
+def generate_heatmap_png(df, date_label):
+    pivot = heatmap_matrix(df)
     path = f"/tmp/ARGM_{date_label}.png"
-    plt.title("Weekly Hours per Person")
-    plt.tight_layout()
-    plt.savefig(path)
-    plt.close()
 
+    HEATMAP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cached = HEATMAP_CACHE_DIR / f"{matrix_fingerprint(pivot)}.png"
+
+    if cached.exists():
+        os.utime(cached)
+        logging.debug(f"[HEATMAP] Cache hit: {cached.name}")
+    else:
+        tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+        render_heatmap(pivot, tmp)
+        os.replace(tmp, cached)
+        _prune_cache()
+
+    shutil.copyfile(cached, path)
     print(f"Saved Heatmap: {path}")
     return path
@@ -0,0 +1,137 @@
+# ==============================
+# INV_INDEX.PY — WHOOSH INVENTORY SEARCH SERVICE
+# ==============================
+
+import logging
+import threading
+from collections import OrderedDict
+from config import INVENTORY_INDEX_DIR
+
+SEARCH_FIELDS = ["Description", "Group", "Cost_Center"]
+FILTER_FIELDS = ("USL", "Group")
+SORT_FIELDS = {"QTY", "USL", "Num", "Cost"}
+QUERY_CACHE_SIZE = 256
+DEFAULT_PAGE_LEN = 20
+MAX_PAGE_LEN = 500
+
+# ==============================
+# INDEX SERVICE
+# ==============================
+class InventoryIndexService:
+    """
+    One open Whoosh index and searcher per worker process.
+
+    Before each query the searcher checks the index's latest generation and
+    refreshes only when a build has committed since (unchanged segments are
+    reused). Parsed queries and field filters are kept in small LRU caches.
+    """
+
+    def __init__(self, index_dir=INVENTORY_INDEX_DIR):
+        self.index_dir = index_dir
+        self.lock = threading.Lock()
+        self.ix = None
+        self.searcher = None
+        self.parser = None
+        self.queries = OrderedDict()
+        self.filters = OrderedDict()
+        self.reopens = 0
+
+    def _open(self):
+        from whoosh.index import open_dir, exists_in
+        from whoosh.qparser import MultifieldParser
+
+        if not exists_in(self.index_dir):
+            raise FileNotFoundError(f"Inventory index not built: {self.index_dir}")
+        self.ix = open_dir(self.index_dir)
+        self.searcher = self.ix.searcher()
+        self.parser = MultifieldParser(SEARCH_FIELDS, schema=self.ix.schema)
+        self.queries.clear()
+        self.filters.clear()
+        logging.info(f"[INV_INDEX] Opened {self.index_dir} (generation {self.generation})")
+
+    @property
+    def generation(self):
+        return self.searcher.reader().generation() if self.searcher else None
+
+    def _current_searcher(self):
+        if self.searcher is None:
+            self._open()
+        elif not self.searcher.up_to_date():
+            self.searcher = self.searcher.refresh()
+            self.reopens += 1
+            logging.info(f"[INV_INDEX] Refreshed to generation {self.generation}")
+        return self.searcher
+
+    def _cached(self, cache, key, build):
+        value = cache.get(key)
+        if value is None:
+            value = build()
+            cache[key] = value
+            if len(cache) > QUERY_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
+
+    def _parse(self, term):
+        from whoosh.query import Every
+        return self._cached(self.queries, term, lambda: self.parser.parse(term) if term else Every())
+
+    def _filter(self, filters):
+        from whoosh.query import And, Term, Phrase, NullQuery
+
+        def build():
+            clauses = []
+            for field, value in filters:
+                # USL/Group index as one lowercased term; older text-field indexes go through their analyzer
+                tokens = list(self.ix.schema[field].process_text(value))
+                if not tokens:
+                    # A text-field index drops stop-words and 1-character codes: nothing can match
+                    return NullQuery
+                clauses.append(Term(field, tokens[0]) if len(tokens) == 1 else Phrase(field, tokens))
+            return And(clauses)
+
+        return self._cached(self.filters, filters, build)
+
+    def search(self, term="", usl=None, group=None, page=1, pagelen=DEFAULT_PAGE_LEN, sort=None, direction="desc"):
+        from whoosh.sorting import FieldFacet
+
+        term = (term or "").strip()
+        filters = tuple(
+            (field, value.strip()) for field, value in zip(FILTER_FIELDS, (usl, group))
+            if value and value.strip().lower() not in {"any", "all"}
+        )
+        page = max(int(page), 1)
+        pagelen = min(max(int(pagelen), 1), MAX_PAGE_LEN)
+
+        with self.lock:
+            searcher = self._current_searcher()
+            kwargs = {"filter": self._filter(filters)} if filters else {}
+            if sort in SORT_FIELDS:
+                kwargs["sortedby"] = FieldFacet(sort, reverse=(direction != "asc"))
+            results = searcher.search_page(self._parse(term), page, pagelen=pagelen, **kwargs)
+            hits = [dict(hit) for hit in results]
+            return {
+                "results": hits,
+                "total": results.total,
+                "page": results.pagenum,
+                "pages": results.pagecount,
+                "pagelen": pagelen,
+                "generation": self.generation,
+            }
+
+    def close(self):
+        with self.lock:
+            if self.searcher is not None:
+                self.searcher.close()
+            self.ix = self.searcher = None
+
+INDEX_SERVICE = InventoryIndexService()
+
+# ==============================
+# PANDAS-COMPATIBLE BACKEND
+# ==============================
+def search_inventory_index(df, term, usl, sort="QTY", direction="desc"):
+    # Same signature and row shape as inventory.search_inventory, for handle_search_request
+    page = INDEX_SERVICE.search(term, usl=usl, page=1, pagelen=100, sort=sort or "QTY", direction=direction)
+    return [{k: v for k, v in hit.items() if k not in {"key", "table"}} for hit in page["results"]]
@@ -3,7 +3,10 @@
 # ==============================
 
 import pandas as pd
+import config
+from utils.text_index import TrigramIndex
 DEBUG = True
+SEARCH_EXCLUDED_COLUMNS = ["QTY", "UOM", "Created", "Last_Change", "ROP", "ROQ", "Cost"]
 
 # ==============================
 # LOAD INVENTORY DATA
@@ -24,6 +27,21 @@ def get_inventory_usls(df):
     usls = sorted(df["USL"].dropna().unique().tolist())
     return usls
 
+# ==============================
+# INVENTORY SEARCH INDEX
+# ==============================
+def build_inventory_index(df):
+    search_cols = [col for col in df.columns if col not in SEARCH_EXCLUDED_COLUMNS]
+    return TrigramIndex(df, search_cols)
+
+def get_inventory_index(df):
+    # Built once per loaded DataFrame; rebuilt if INVENTORY_DF is swapped without a new index
+    index = config.INVENTORY_INDEX
+    if index is None or index.df is not df:
+        index = build_inventory_index(df)
+        config.INVENTORY_INDEX = index
+    return index
+
 # ==============================
 # SEARCH INVENTORY
 # ==============================
@@ -38,32 +56,22 @@ def search_inventory(df, term, usl, sort="QTY", direction="desc"):
     if DEBUG:
         print(f"[SEARCH]🔎 Starting search: term='{term}', usl='{usl}', sort='{sort}', direction='{direction}'")
 
-    # ✅ Filter by USL
-    usl = usl.strip().lower()
-    if usl not in {"any", "all", ""}:
-        df = df[df["USL"].astype(str).str.strip().str.lower() == usl]
-
     try:
+        index = get_inventory_index(df)
+        # Index lookup gives ascending row positions — same rows, same order as a row-wise scan
         if term:
-            excluded = ["QTY", "UOM", "Created", "Last_Change", "ROP", "ROQ", "Cost"]
-            search_cols = [col for col in df.columns if col not in excluded]
-
-            # Unified row-wise search
-            def row_matches(row):
-                for col in search_cols:
-                    value = str(row[col]).lower()
-                    if term in value:
-                        return True
-                return False
-
-            mask = df.apply(row_matches, axis=1)
-            df = df[mask]
+            df = df.iloc[index.search(term)]
 
     except Exception as e:
         if DEBUG:
             print(f"[ERROR] Search failed: {e}")
         return []
 
+    # ✅ Filter by USL
+    usl = usl.strip().lower()
+    if usl not in {"any", "all", ""}:
+        df = df[df["USL"].astype(str).str.strip().str.lower() == usl]
+
     # ✅ Validate sort field
     valid_sort_fields = {"QTY", "USL", "Num", "Cost"}
     if sort not in valid_sort_fields or sort not in df.columns:
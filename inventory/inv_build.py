@@ -1,17 +1,23 @@
 import sqlite3
 import os
+import sys
 import shutil
+import hashlib
 from whoosh.fields import Schema, TEXT, ID, NUMERIC
-from whoosh.analysis import StemmingAnalyzer
-from whoosh.index import create_in
+from whoosh.analysis import StemmingAnalyzer, IDAnalyzer
+from whoosh.index import create_in, open_dir, exists_in
 
 DB_PATH = "Stores_Inventory_V7.7.db"
 INDEX_DIR = "inventory_index"
+HASH_DB = "row_hashes.sqlite"  # Sidecar inside INDEX_DIR: document key -> content hash
+BATCH_SIZE = 2000
+WRITER_LIMIT_MB = 256
 
 schema = Schema(
+    key=ID(stored=True, unique=True),  # USL|Num, with #n for repeated pairs
     table=ID(stored=True),
     Cost_Center=TEXT(stored=True, analyzer=StemmingAnalyzer()),
-    USL=TEXT(stored=True),
+    USL=ID(stored=True, analyzer=IDAnalyzer(lowercase=True)),  # Whole-value filter keys: "OR" or "A" survive
     Bin=TEXT(stored=True),
     Num=NUMERIC(stored=True),
     Description=TEXT(stored=True, analyzer=StemmingAnalyzer()),
@@ -19,7 +25,7 @@ schema = Schema(
     ROP=NUMERIC(stored=True),
     ROQ=NUMERIC(stored=True),
     UOM=TEXT(stored=True),
-    Group=TEXT(stored=True),
+    Group=ID(stored=True, analyzer=IDAnalyzer(lowercase=True)),
     Old=TEXT(stored=True),
     Assignment=NUMERIC(stored=True),
     Cost=NUMERIC(stored=True),
@@ -27,44 +33,160 @@ schema = Schema(
     Last_Change=TEXT(stored=True)
 )
 
-def build_index():
-    if os.path.exists(INDEX_DIR):
-        shutil.rmtree(INDEX_DIR)
-    os.mkdir(INDEX_DIR)
-
-    ix = create_in(INDEX_DIR, schema)
-    writer = ix.writer()
-
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT * FROM inventory")
-    columns = [description[0] for description in cursor.description]
-
-    for row in cursor.fetchall():
-        data = dict(zip(columns, row))
-        writer.add_document(
-            table="inventory",
-            Cost_Center=str(data.get("Cost_Center", "")),
-            USL=str(data.get("USL", "")),
-            Bin=str(data.get("Bin", "")),
-            Num=int(data.get("Num", 0)),
-            Description=str(data.get("Description", "")),
-            QTY=int(data.get("QTY", 0)),
-            ROP=int(data.get("ROP", 0)),
-            ROQ=int(data.get("ROQ", 0)),
-            UOM=str(data.get("UOM", "")),
-            Group=str(data.get("Group", "")),
-            Old=str(data.get("Old", "")) if data.get("Old") is not None else "",
-            Assignment=int(data.get("Assignment", 0)),
-            Cost=float(data.get("Cost", 0.0)),
-            Created=str(data.get("Created", "")),
-            Last_Change=str(data.get("Last_Change", ""))
-        )
+# ==============================
+# ROW → DOCUMENT
+# ==============================
+def text_value(value):
+    return "" if value is None else str(value)
 
+def key_value(value):
+    return text_value(value).strip()
+
+def int_value(value):
+    return 0 if value is None else int(value)
+
+def row_document(data):
+    # NULL cells index as empty text / zero rather than failing the build
+    return dict(
+        table="inventory",
+        Cost_Center=text_value(data.get("Cost_Center")),
+        USL=key_value(data.get("USL")),
+        Bin=text_value(data.get("Bin")),
+        Num=int_value(data.get("Num")),
+        Description=text_value(data.get("Description")),
+        QTY=int_value(data.get("QTY")),
+        ROP=int_value(data.get("ROP")),
+        ROQ=int_value(data.get("ROQ")),
+        UOM=text_value(data.get("UOM")),
+        Group=key_value(data.get("Group")),
+        Old=text_value(data.get("Old")),
+        Assignment=int_value(data.get("Assignment")),
+        Cost=0.0 if data.get("Cost") is None else float(data["Cost"]),
+        Created=text_value(data.get("Created")),
+        Last_Change=text_value(data.get("Last_Change"))
+    )
+
+def row_hash(row):
+    return hashlib.sha1(repr(row).encode("utf-8")).hexdigest()
+
+def iter_rows(db_path, batch_size=BATCH_SIZE):
+    # Streams (key, hash, document) in rowid order without loading the table
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM inventory ORDER BY rowid")
+        columns = [description[0] for description in cursor.description]
+        occurrences = {}
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                data = dict(zip(columns, row))
+                key = f"{text_value(data.get('USL'))}|{text_value(data.get('Num'))}"
+                occurrences[key] = occurrences.get(key, 0) + 1
+                if occurrences[key] > 1:
+                    key = f"{key}#{occurrences[key]}"
+                yield key, row_hash(row), row_document(data)
+    finally:
+        conn.close()
+
+# ==============================
+# HASH SIDECAR
+# ==============================
+def open_hash_db(index_dir):
+    conn = sqlite3.connect(os.path.join(index_dir, HASH_DB))
+    conn.execute("CREATE TABLE IF NOT EXISTS row_hashes (key TEXT PRIMARY KEY, hash TEXT NOT NULL)")
+    return conn
+
+def can_update(index_dir):
+    if not exists_in(index_dir) or not os.path.exists(os.path.join(index_dir, HASH_DB)):
+        return False
+    # Indexes from before the key field, or with older field types, need a rebuild
+    existing = open_dir(index_dir).schema
+    return all(name in existing and type(existing[name]) is type(schema[name]) for name in schema.names())
+
+# ==============================
+# FULL BUILD
+# ==============================
+def full_build(db_path, index_dir, procs=None, batch_size=BATCH_SIZE):
+    if os.path.exists(index_dir):
+        shutil.rmtree(index_dir)
+    os.mkdir(index_dir)
+
+    ix = create_in(index_dir, schema)
+    procs = procs or os.cpu_count() or 1
+    # Each process writes its own segment; multisegment skips the final merge
+    writer = ix.writer(procs=procs, multisegment=procs > 1, limitmb=WRITER_LIMIT_MB)
+
+    hashes = []
+    for key, digest, document in iter_rows(db_path, batch_size):
+        writer.add_document(key=key, **document)
+        hashes.append((key, digest))
     writer.commit()
+
+    with open_hash_db(index_dir) as conn:
+        conn.executemany("INSERT INTO row_hashes (key, hash) VALUES (?, ?)", hashes)
+    conn.close()
+    return {"mode": "full", "added": len(hashes), "updated": 0, "deleted": 0, "unchanged": 0}
+
+# ==============================
+# INCREMENTAL UPDATE
+# ==============================
+def incremental_update(db_path, index_dir, batch_size=BATCH_SIZE):
+    conn = open_hash_db(index_dir)
+    known = dict(conn.execute("SELECT key, hash FROM row_hashes"))
+
+    ix = open_dir(index_dir)
+    writer = ix.writer(limitmb=WRITER_LIMIT_MB)
+    stats = {"mode": "incremental", "added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    changed, seen = [], set()
+
+    try:
+        for key, digest, document in iter_rows(db_path, batch_size):
+            seen.add(key)
+            previous = known.get(key)
+            if previous == digest:
+                stats["unchanged"] += 1
+                continue
+            writer.update_document(key=key, **document)
+            changed.append((key, digest))
+            stats["added" if previous is None else "updated"] += 1
+
+        removed = [key for key in known if key not in seen]
+        for key in removed:
+            writer.delete_by_term("key", key)
+        stats["deleted"] = len(removed)
+    except Exception:
+        writer.cancel()
+        conn.close()
+        raise
+
+    if changed or removed:
+        writer.commit()
+        # Sidecar follows the index: a crash in between only re-applies the same updates next run
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO row_hashes (key, hash) VALUES (?, ?)", changed)
+            conn.executemany("DELETE FROM row_hashes WHERE key = ?", [(key,) for key in removed])
+    else:
+        writer.cancel()
     conn.close()
+    return stats
+
+# ==============================
+# BUILD INDEX
+# ==============================
+def build_index(db_path=DB_PATH, index_dir=INDEX_DIR, incremental=True, procs=None, batch_size=BATCH_SIZE):
+    if incremental and can_update(index_dir):
+        return incremental_update(db_path, index_dir, batch_size)
+    return full_build(db_path, index_dir, procs, batch_size)
 
 if __name__ == "__main__":
-    build_index()
-    print("Whoosh index created successfully.")
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    stats = build_index(
+        db_path=args[0] if args else DB_PATH,
+        index_dir=args[1] if len(args) > 1 else INDEX_DIR,
+        incremental="--full" not in sys.argv,
+    )
+    print(f"Whoosh index {stats['mode']} build: {stats['added']} added, {stats['updated']} updated, "
+          f"{stats['deleted']} deleted, {stats['unchanged']} unchanged.")
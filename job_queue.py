@@ -0,0 +1,161 @@
+# ==============================
+# JOB_QUEUE.PY — BACKGROUND UPLOAD JOBS
+# ==============================
+
+import os
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import JOB_WORKERS, JOB_HISTORY
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+DOWNLOAD_DIR = "/tmp"  # Folder served by file_bp's /download/<filename>
+_local = threading.local()  # The job the current worker thread is running
+
+# ==============================
+# JOB
+# ==============================
+class Job:
+    """
+    One queued upload: status, progress (0–1) with a short message, the
+    rendered result page and any files the work wrote for download.
+    """
+
+    def __init__(self, kind, label):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.label = label
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "Queued"
+        self.result = None
+        self.error = None
+        self.outputs = []
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.lock = threading.Lock()
+
+    def update(self, progress=None, message=None):
+        with self.lock:
+            if progress is not None:
+                self.progress = max(self.progress, min(float(progress), 1.0))
+            if message is not None:
+                self.message = message
+
+    def add_output(self, path):
+        with self.lock:
+            if path not in self.outputs:
+                self.outputs.append(path)
+
+    def to_dict(self):
+        with self.lock:
+            ended = self.finished or time.time()
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "label": self.label,
+                "status": self.status,
+                "progress": round(self.progress, 3),
+                "message": self.message,
+                "error": self.error,
+                "created": self.created,
+                "elapsed": round(ended - (self.started or ended), 3),
+                "status_url": f"/jobs/{self.id}",
+                "result_url": f"/jobs/{self.id}/result",
+                "downloads": [
+                    f"/download/{os.path.basename(path)}" for path in self.outputs
+                    if os.path.dirname(os.path.abspath(path)) == DOWNLOAD_DIR
+                ],
+            }
+
+# ==============================
+# PROGRESS HOOKS
+# ==============================
+def current_job():
+    return getattr(_local, "job", None)
+
+def report_progress(progress=None, message=None):
+    # No-op outside a job, so the same code runs inline in a request
+    job = current_job()
+    if job is not None:
+        job.update(progress, message)
+
+def record_output(path):
+    job = current_job()
+    if job is not None:
+        job.add_output(path)
+
+# ==============================
+# JOB QUEUE
+# ==============================
+class JobQueue:
+    """
+    In-process worker pool for uploads that outlive a request.
+
+    Threads rather than processes: handlers publish their results through
+    config globals (OPTIMIZATION_DF, HEURISTIC_FILE_PATH, ...) that later
+    requests read, and CPU-heavy PDF parsing already fans out to its own
+    process pool (PARSE_WORKERS). Job state is per server process, so status
+    polls must reach the process that accepted the upload. Only the last
+    JOB_HISTORY finished jobs are kept.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, history=JOB_HISTORY):
+        self.workers = workers
+        self.history = history
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.executor = None
+
+    def _pool(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="upload-job")
+        return self.executor
+
+    def submit(self, kind, label, func, *args, **kwargs):
+        job = Job(kind, label)
+        with self.lock:
+            self.jobs[job.id] = job
+            self._prune()
+            pool = self._pool()
+        pool.submit(self._run, job, func, args, kwargs)
+        logging.info(f"[JOBS] Queued {job.kind} job {job.id} ({label})")
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        _local.job = job
+        with job.lock:
+            job.status, job.started, job.message = RUNNING, time.time(), "Processing"
+        try:
+            result = func(*args, **kwargs)
+            with job.lock:
+                job.result, job.status, job.progress, job.message = result, DONE, 1.0, "Done"
+        except Exception as e:
+            logging.exception(f"[JOBS] {job.kind} job {job.id} failed")
+            with job.lock:
+                job.error, job.status, job.message = str(e), FAILED, "Failed"
+        finally:
+            with job.lock:
+                job.finished = time.time()
+            _local.job = None
+        logging.info(f"[JOBS] {job.kind} job {job.id} {job.status} in {job.finished - job.started:.2f}s")
+
+    def _prune(self):
+        finished = [j for j in self.jobs.values() if j.status in (DONE, FAILED)]
+        for job in sorted(finished, key=lambda j: j.created)[:max(len(finished) - self.history, 0)]:
+            del self.jobs[job.id]
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def shutdown(self, wait=True):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=wait)
+            self.executor = None
+
+JOB_QUEUE = JobQueue()
@@ -0,0 +1,59 @@
+# ==============================
+# MIGRATE_DB.PY — SHIFT INDEXES + UNIQUE EMPLOYEE NAMES
+# ==============================
+
+from sqlalchemy import select, update, delete, func
+from app import app, db
+from models import Employee, ShiftRecord, CoverageShift
+
+# ==============================
+# MERGE DUPLICATE EMPLOYEES
+# ==============================
+def merge_duplicate_employees():
+    # The unique name index can't be built over duplicates — fold them into the oldest row
+    dupes = db.session.execute(
+        select(Employee.last_name, Employee.first_name, func.min(Employee.id))
+        .group_by(Employee.last_name, Employee.first_name)
+        .having(func.count() > 1)
+    ).all()
+
+    merged = 0
+    for last, first, keep_id in dupes:
+        drop_ids = db.session.scalars(
+            select(Employee.id).where(
+                Employee.last_name == last, Employee.first_name == first, Employee.id != keep_id
+            )
+        ).all()
+        db.session.execute(update(ShiftRecord).where(ShiftRecord.employee_id.in_(drop_ids)).values(employee_id=keep_id))
+        db.session.execute(update(CoverageShift).where(CoverageShift.org_employee_id.in_(drop_ids)).values(org_employee_id=keep_id))
+        db.session.execute(update(CoverageShift).where(CoverageShift.cov_employee_id.in_(drop_ids)).values(cov_employee_id=keep_id))
+        db.session.execute(delete(Employee).where(Employee.id.in_(drop_ids)))
+        merged += len(drop_ids)
+
+    db.session.commit()
+    return merged
+
+# ==============================
+# CREATE MISSING INDEXES
+# ==============================
+def create_missing_indexes():
+    created = []
+    for model in (Employee, ShiftRecord, CoverageShift):
+        for index in sorted(model.__table__.indexes, key=lambda i: i.name):
+            existing = {i["name"] for i in db.inspect(db.engine).get_indexes(model.__tablename__)}
+            if index.name not in existing:
+                index.create(bind=db.engine)
+                created.append(index.name)
+    return created
+
+if __name__ == "__main__":
+    with app.app_context():
+        print("Creating missing tables...")
+        db.create_all()
+
+        print("Merging duplicate employees...")
+        print(f"✓ Merged {merge_duplicate_employees()} duplicate employee row(s).")
+
+        print("Creating indexes...")
+        created = create_missing_indexes()
+        print(f"✓ Created {len(created)} index(es): {', '.join(created) or 'none needed'}")
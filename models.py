@@ -15,6 +15,10 @@ db = SQLAlchemy()
 # EMPLOYEE MODEL
 # ==============================
 class Employee(db.Model):
+    __table_args__ = (
+        db.Index("uq_employee_name", "last_name", "first_name", unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(db.String(128), nullable=False)
     last_name = db.Column(db.String(128), nullable=False)
@@ -33,6 +37,12 @@ class Employee(db.Model):
 # SHIFT RECORD MODEL
 # ==============================
 class ShiftRecord(db.Model):
+    __table_args__ = (
+        db.Index("ix_shift_record_date_shift", "date", "shift"),
+        db.Index("ix_shift_record_employee_date", "employee_id", "date"),
+        db.Index("ix_shift_record_file_date", "file_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)  # Link to Employee
     employee = db.relationship('Employee', backref='shift_records')  # Access employee's shifts
@@ -57,6 +67,13 @@ class ShiftRecord(db.Model):
 # COVERAGE SHIFT MODEL
 # ==============================
 class CoverageShift(db.Model):
+    __table_args__ = (
+        db.Index("ix_coverage_shift_date_shift", "date", "shift"),
+        db.Index("ix_coverage_shift_org_date", "org_employee_id", "date"),
+        db.Index("ix_coverage_shift_cov_date", "cov_employee_id", "date"),
+        db.Index("ix_coverage_shift_file_date", "file_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
     shift = db.Column(db.String(16), nullable=False)
@@ -2,9 +2,20 @@
 # OPTIMIZATION.PY
 # ==============================
 
+import math
 import numpy as np
 import pandas as pd
+from functools import lru_cache
 from flask import current_app as app
+from utils.data_search import search_mask
+
+ROP_BUFFER_DAYS = 3
+ROP_ENDING = 2  # Suggested ROPs end in this digit
+ROQ_MIN_PCT = 0.05
+ROQ_MAX_PCT = 0.25
+MAX_SCENARIOS = 500
+MAX_BUFFER_DAYS = 365  # Keeps buffer × usage well inside int64 for the ROQ divisor search
+MAX_ROQ_PCT = 1.0
 
 # ==============================
 # SEARCH OPTIMIZATION
@@ -23,9 +34,12 @@ def search_optimization(df, term, cart_filter="All", sort="Num", direction="desc
     logger.debug(f"[OPT_SEARCH]🧠 Columns: {df.columns.tolist()}")
 
     # ✅ Normalize cart filter input
+    full_df = df  # Search masks run on the loaded frame so its lowered columns stay cached
+    keep = np.ones(len(full_df), dtype=bool)
     if cart_filter.lower() not in {"all", "any", ""}:
         cart_str = str(cart_filter).strip().lower()
-        df = df[df["Cart"].astype(str).str.lower().str.strip() == cart_str]
+        keep &= (full_df["Cart"].astype(str).str.lower().str.strip() == cart_str).to_numpy()
+        df = full_df[keep]
         logger.debug(f"[OPT_SEARCH]🧺 Filtered by Cart '{cart_str}': {len(df)} rows remaining")
     else:
         logger.debug(f"[OPT_SEARCH]🛡️ Filter skipped (value: '{cart_filter}')")
@@ -44,13 +58,11 @@ def search_optimization(df, term, cart_filter="All", sort="Num", direction="desc
                 logger.error(f"[OPT_SEARCH]🛑 df.columns.tolist() failed: {col_err}", exc_info=True)
                 raise
 
-            string_cols = [col for col in df.columns if col not in excluded and df[col].dtype == object]
+            string_cols = [col for col in full_df.columns if col not in excluded and full_df[col].dtype == object]
             logger.debug(f"[OPT_SEARCH]🔤 Searching in columns: {string_cols}")
 
-            df = df[df[string_cols].apply(
-                lambda row: any(term in str(val).lower() for val in row if pd.notna(val)),
-                axis=1
-            )]
+            keep &= search_mask(full_df, term, string_cols, skip_na=True)
+            df = full_df[keep]
             logger.debug(f"[OPT_SEARCH]🔍 Rows after search: {len(df)}")
 
         except Exception as e:
@@ -100,57 +112,157 @@ def search_optimization(df, term, cart_filter="All", sort="Num", direction="desc
         raise
 
 # ==============================
-# GENERATE SUGGESTED ROP ROQ
+# SUGGESTED ROP ROQ (COLUMNAR)
 # ==============================
-def suggest_rop_roq(df):
-    def strategic_suggested_rop_roq(row):
-        try:
-            # Use normalized field names from headers
-            cart_q = pd.to_numeric(row.get('CU1'), errors='coerce')
-            cost_q = pd.to_numeric(row.get('CC1'), errors='coerce')
-            cart_a = pd.to_numeric(row.get('CU2'), errors='coerce')
-            cost_a = pd.to_numeric(row.get('CC2'), errors='coerce')
-            prev_rop = pd.to_numeric(row.get('RROP'), errors='coerce')
-            prev_roq = pd.to_numeric(row.get('RROQ'), errors='coerce')
-
-            # Estimate daily usage
-            usage_quarterly = np.nanmax([cart_q, cost_q]) / 90 if pd.notna(cart_q) or pd.notna(cost_q) else 0
-            usage_annual = np.nanmax([cart_a, cost_a]) / 365 if pd.notna(cart_a) or pd.notna(cost_a) else 0
-            daily_usage = max(usage_quarterly, usage_annual)
-
-            if daily_usage == 0:
-                return pd.Series([None, None])
-
-            # Calculate base ROP and adjust with historical
-            raw_rop = daily_usage * 3  # 3-day buffer
-            adjusted_rop = max(raw_rop, prev_rop if pd.notna(prev_rop) else 0)
-
-            # Round ROP to nearest 10 ending in 2
-            rounded_rop = int(np.ceil(adjusted_rop / 10.0) * 10)
-            while str(rounded_rop)[-1] != '2':
-                rounded_rop += 1
-
-            # Determine ROQ candidates
-            base = rounded_rop - 2
-            all_factors = [d for d in range(2, base) if base % d == 0]
-            roq_range_min = max(2, int(0.05 * rounded_rop))
-            roq_range_max = int(0.25 * rounded_rop)
-            valid_roqs = [d for d in all_factors if roq_range_min <= d <= roq_range_max]
-
-            if rounded_rop <= 10 and 1 not in valid_roqs:
-                valid_roqs.insert(0, 1)
-
-            if pd.notna(prev_roq) and valid_roqs:
-                suggested_roq = min(valid_roqs, key=lambda x: abs(x - prev_roq))
-            elif valid_roqs:
-                suggested_roq = max(valid_roqs)
-            else:
-                suggested_roq = None
-
-            return pd.Series([rounded_rop, suggested_roq])
-        except Exception as e:
-            print(f"Optimization error in row: {row.get('material', 'N/A')} — {e}")
-            return pd.Series([None, None])
+def numeric_column(df, col):
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+def daily_usage(cart_q, cost_q, cart_a, cost_a):
+    # Larger of the quarterly and annual daily rates; a period with no data counts as 0
+    with np.errstate(invalid="ignore"):
+        quarterly = np.where(np.isnan(cart_q) & np.isnan(cost_q), 0.0, np.fmax(cart_q, cost_q) / 90)
+        annual = np.where(np.isnan(cart_a) & np.isnan(cost_a), 0.0, np.fmax(cart_a, cost_a) / 365)
+    return np.maximum(quarterly, annual)
+
+def round_rop(adjusted_rop, ending=ROP_ENDING):
+    # Up to a multiple of 10, then on to the next value ending in `ending` (-10 -> -2, like the digit loop)
+    tens = np.ceil(adjusted_rop / 10.0) * 10
+    return tens + np.where(tens >= 0, ending, (10 - ending) % 10)
+
+@lru_cache(maxsize=4096)
+def proper_divisors(base):
+    # Divisors of base in [2, base), ascending — one table entry per distinct base
+    if base <= 2:
+        return np.empty(0, dtype=np.int64)
+    d = np.arange(2, math.isqrt(base) + 1, dtype=np.int64)
+    small = d[base % d == 0]
+    return np.unique(np.concatenate([small, base // small]))
+
+def roq_candidates(rounded_rop, min_pct=ROQ_MIN_PCT, max_pct=ROQ_MAX_PCT, ending=ROP_ENDING):
+    divisors = proper_divisors(rounded_rop - ending)
+    low, high = max(2, int(min_pct * rounded_rop)), int(max_pct * rounded_rop)
+    valid = divisors[(divisors >= low) & (divisors <= high)]
+    if rounded_rop <= 10:
+        valid = np.concatenate([[1], valid])
+    return valid
+
+def choose_roq(rounded_rop, prev_roq, min_pct=ROQ_MIN_PCT, max_pct=ROQ_MAX_PCT, ending=ROP_ENDING):
+    roq = np.full(len(rounded_rop), np.nan)
+    for value in np.unique(rounded_rop):
+        rows = np.flatnonzero(rounded_rop == value)
+        candidates = roq_candidates(int(value), min_pct, max_pct, ending)
+        if not len(candidates):
+            continue
+        prev = prev_roq[rows]
+        has_prev = ~np.isnan(prev)
+        roq[rows[~has_prev]] = candidates.max()
+        if has_prev.any():
+            # Closest to the previous ROQ; argmin keeps the first (smallest) on ties
+            distance = np.abs(candidates[None, :] - prev[has_prev, None])
+            roq[rows[has_prev]] = candidates[distance.argmin(axis=1)]
+    return roq
+
+def usage_inputs(df):
+    usage = daily_usage(
+        numeric_column(df, "CU1"), numeric_column(df, "CC1"),
+        numeric_column(df, "CU2"), numeric_column(df, "CC2"),
+    )
+    return usage, numeric_column(df, "RROP"), numeric_column(df, "RROQ")
+
+def suggested_rops(usage, prev_rop, buffer_days, ending=ROP_ENDING):
+    # buffer_days may be an array: one row of suggestions per buffer
+    buffer_days = np.asarray(buffer_days, dtype=float)
+    with np.errstate(invalid="ignore", over="ignore"):
+        adjusted = np.maximum(np.multiply.outer(buffer_days, usage), np.nan_to_num(prev_rop, nan=0.0))
+        rounded = round_rop(adjusted, ending)
+    active = (usage != 0) & np.isfinite(rounded)
+    return np.where(active, rounded, np.nan), active
+
+def suggested_roqs(rop, active, prev_roq, min_pct=ROQ_MIN_PCT, max_pct=ROQ_MAX_PCT, ending=ROP_ENDING):
+    roq = np.full(len(rop), np.nan)
+    roq[active] = choose_roq(rop[active].astype(np.int64), prev_roq[active], min_pct, max_pct, ending)
+    return roq
 
-    df[['site_suggested_rop', 'site_suggested_roq']] = df.apply(strategic_suggested_rop_roq, axis=1)
+def suggest_rop_roq_arrays(df, buffer_days=ROP_BUFFER_DAYS, min_pct=ROQ_MIN_PCT, max_pct=ROQ_MAX_PCT, ending=ROP_ENDING):
+    usage, prev_rop, prev_roq = usage_inputs(df)
+    rop, active = suggested_rops(usage, prev_rop, buffer_days, ending)
+    return rop, suggested_roqs(rop, active, prev_roq, min_pct, max_pct, ending)
+
+def suggest_rop_roq(df):
+    rop, roq = suggest_rop_roq_arrays(df)
+    for col, values in (("site_suggested_rop", rop), ("site_suggested_roq", roq)):
+        # Whole numbers stay integers unless a row has no suggestion
+        df[col] = values if np.isnan(values).any() else values.astype(np.int64)
     return df
+
+# ==============================
+# WHAT-IF SIMULATION
+# ==============================
+def simulate_rop_roq(df, buffer_days=(ROP_BUFFER_DAYS,), roq_min_pcts=(ROQ_MIN_PCT,),
+                     roq_max_pcts=(ROQ_MAX_PCT,), rop_endings=(ROP_ENDING,)):
+    """
+    Evaluate every combination of ROP/ROQ parameters against the loaded rows.
+
+    Usage is computed once; ROPs for all buffers come from one broadcast,
+    and ROQ choices reuse the cached divisor table across scenarios.
+
+    Parameters:
+        df (DataFrame): Optimization rows with usage (CU1/CC1/CU2/CC2),
+            previous (RROP/RROQ) and current (ROP/ROQ) values, and Cost
+        buffer_days (list): Days of usage covered by the ROP (0–MAX_BUFFER_DAYS)
+        roq_min_pcts (list): Smallest ROQ as a fraction of ROP (0–MAX_ROQ_PCT)
+        roq_max_pcts (list): Largest ROQ as a fraction of ROP (0–MAX_ROQ_PCT)
+        rop_endings (list): Last digit suggested ROPs are rounded to
+
+    Returns:
+        list: One dict per scenario with its parameters and metrics.
+        Stock value is (ROP + ROQ) × Cost, the on-hand peak right after a
+        delivery, over the items that get a suggestion.
+    """
+    scenarios = [
+        (b, lo, hi, e)
+        for b in buffer_days for lo in roq_min_pcts for hi in roq_max_pcts for e in rop_endings
+    ]
+    if len(scenarios) > MAX_SCENARIOS:
+        raise ValueError(f"{len(scenarios)} scenarios requested; the limit is {MAX_SCENARIOS}")
+    for b, lo, hi, e in scenarios:
+        finite = all(math.isfinite(v) for v in (b, lo, hi))
+        if not finite or not 0 <= b <= MAX_BUFFER_DAYS or not 0 <= lo <= hi <= MAX_ROQ_PCT or e not in range(10):
+            raise ValueError(f"Invalid scenario: buffer_days={b}, roq_min_pct={lo}, roq_max_pct={hi}, rop_ending={e}")
+
+    usage, prev_rop, prev_roq = usage_inputs(df)
+    current_rop = numeric_column(df, "ROP")
+    current_roq = numeric_column(df, "ROQ")
+    cost = np.nan_to_num(numeric_column(df, "Cost"), nan=0.0)
+
+    buffers = np.array(sorted(set(buffer_days)), dtype=float)
+    rops = {}
+    for e in sorted(set(rop_endings)):
+        rop_grid, active_grid = suggested_rops(usage, prev_rop, buffers, e)
+        for b, rop, active in zip(buffers, rop_grid, active_grid):
+            rops[(b, e)] = rop, active
+
+    results = []
+    for b, lo, hi, e in scenarios:
+        rop, active = rops[(float(b), e)]
+        roq = suggested_roqs(rop, active, prev_roq, lo, hi, e)
+        suggested_value = ((rop + np.nan_to_num(roq, nan=0.0)) * cost)[active].sum()
+        current_value = ((np.nan_to_num(current_rop, nan=0.0) + np.nan_to_num(current_roq, nan=0.0)) * cost)[active].sum()
+        results.append({
+            "buffer_days": b,
+            "roq_min_pct": lo,
+            "roq_max_pct": hi,
+            "rop_ending": e,
+            "items": int(active.sum()),
+            "items_without_roq": int((active & np.isnan(roq)).sum()),
+            "rop_changes": int((active & (rop != current_rop)).sum()),
+            "roq_changes": int((active & ~np.isnan(roq) & (roq != current_roq)).sum()),
+            "rop_increases": int((active & (rop > current_rop)).sum()),
+            "rop_decreases": int((active & (rop < current_rop)).sum()),
+            "stock_value": round(float(suggested_value), 2),
+            "current_stock_value": round(float(current_value), 2),
+            "stock_value_change": round(float(suggested_value - current_value), 2),
+        })
+    return results
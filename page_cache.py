@@ -0,0 +1,165 @@
+# ==============================
+# PAGE_CACHE.PY — CONTENT-ADDRESSED PARSE CACHE
+# ==============================
+
+import os
+import pickle
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from config import UPLOAD_FOLDER, PAGE_CACHE_MAX_BYTES
+
+LEGACY_CACHE_DIR = Path(UPLOAD_FOLDER) / ".cache"  # Old whole-file report cache (*.pkl), superseded
+CACHE_DIR = LEGACY_CACHE_DIR / "pages"
+CACHE_VERSION = 1  # Bump when the cached page format changes
+
+# ==============================
+# HASH HELPERS
+# ==============================
+def hash_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def page_key(text, salt=""):
+    return f"v{CACHE_VERSION}-page-{hash_text(salt + text)}"
+
+def file_key(path, engine, salt=""):
+    return f"v{CACHE_VERSION}-file-{engine}-{hash_text(salt + hash_file(path))}"
+
+# ==============================
+# PAGE CACHE
+# ==============================
+class PageCache:
+    """
+    Size-bounded LRU cache of pickled values on disk, keyed by content hash.
+
+    Entries are evicted oldest-first once the total size on disk exceeds
+    max_bytes. Hit, miss and eviction counts are kept per process.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=PAGE_CACHE_MAX_BYTES, legacy_dir=LEGACY_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.legacy_dir = Path(legacy_dir) if legacy_dir else None
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> size, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._scan()
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.pkl"
+
+    def _scan(self):
+        self._sweep_legacy()
+        # Pick up entries left by earlier processes, oldest access first
+        files = sorted(self.cache_dir.glob("*.pkl"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self.entries[path.stem] = size
+            self.total_bytes += size
+
+    def _sweep_legacy(self):
+        # The old report cache is never read again and nothing else evicts it
+        if self.legacy_dir is None or self.legacy_dir == self.cache_dir:
+            return
+        removed = 0
+        for path in self.legacy_dir.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+            removed += 1
+        if removed:
+            logging.info(f"[CACHE] Removed {removed} legacy report cache file(s) from {self.legacy_dir}")
+
+    def _forget(self, key):
+        size = self.entries.pop(key, None)
+        if size is not None:
+            self.total_bytes -= size
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def get(self, key):
+        path = self._path(key)
+        with self.lock:
+            try:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+            except FileNotFoundError:
+                self._forget(key)
+                self.misses += 1
+                return None
+            except (pickle.UnpicklingError, EOFError) as e:
+                logging.warning(f"[CACHE] Dropping unreadable entry {key}: {e}")
+                self._forget(key)
+                path.unlink(missing_ok=True)
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            if key not in self.entries:
+                size = path.stat().st_size
+                self.entries[key] = size
+                self.total_bytes += size
+            self.entries.move_to_end(key)
+            os.utime(path)
+            return value
+
+    def put(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        with self.lock:
+            self._forget(key)
+            self.entries[key] = len(data)
+            self.total_bytes += len(data)
+            self._evict()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+# ==============================
+# SHARED INSTANCE
+# ==============================
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+def get_page_cache():
+    # Created on first use, so importing the parser (app or pool worker) touches no files
+    global _page_cache
+    if _page_cache is None:
+        with _page_cache_lock:
+            if _page_cache is None:
+                _page_cache = PageCache()
+    return _page_cache
@@ -4,31 +4,20 @@
 
 import re
 import os
-import json
-import pdfplumber
 import pandas as pd
 import logging
-from datetime import datetime, timedelta
-from swaps import parse_exceptions_section
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from swaps import parse_exceptions_section, ShiftIndex
+from config import PARSE_WORKERS, PARSE_CHUNK_PAGES, PDF_ENGINE
+from pdf_text import iter_page_texts, page_count
+from page_cache import get_page_cache, page_key, file_key
+from utils.static_data import valid_names, roster_version
 
 # Setup logging
 # logging.basicConfig(level=logging.DEBUG, format='[%(levelname)s] %(message)s')
 logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format='[%(levelname)s] %(message)s')
 
-# Static DIR
-STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
-
-# ==============================
-# LOAD NAMES FROM JSON
-# ==============================
-def load_valid_names():
-    with open(os.path.join(STATIC_DIR, "emp_ft.json")) as f1, open(os.path.join(STATIC_DIR, "emp_pt.json")) as f2:
-        ft = json.load(f1)
-        pt = json.load(f2)
-        return set(" ".join(name.split()) for name in (ft + pt))
-
-VALID_NAMES = load_valid_names()
-
 # ==============================
 # EXTRACT PROCESSING DATE
 # ==============================
@@ -44,101 +33,143 @@ def extract_processing_date(lines):
                     logging.warning(f"Date parsing failed: {e}")
     return None
 
+# ==============================
+# PRECOMPILED PATTERNS
+# ==============================
+TIME_PATTERN = r'\d{2}:\d{2}'
+NAME_PATTERN = r"[A-Z][\w'-]*(?:\s+[A-Z][\w'-]*)*,\s+[A-Z][\w'-]+(?:\s+[A-Z][\w'-]+)*"
+CODE_PATTERN = r'\b(?:SA\d|od\d+|OE|\w{1,3}\d{2,4}|\d{3,4})\b'
+
+SHIFT_LINE_RE = re.compile(r'\d{2}:\d{2}.*\d{2}:\d{2}')
+NAME_RE = re.compile(NAME_PATTERN)
+CODE_RE = re.compile(CODE_PATTERN, re.IGNORECASE)
+
+# One pass per line: name first so it wins where the leftmost name starts, like NAME_RE.search
+TOKEN_RE = re.compile(rf"(?P<name>{NAME_PATTERN})|(?P<time>{TIME_PATTERN})|(?P<code>(?i:{CODE_PATTERN}))")
+
+SKIP_MARKERS = ("Off:", "On Call", "Relief")
+
+W_DAY = frozenset({"w406", "w408", "w409", "w503", "w504", "w507", "w401", "w502"})
+W_EVENING = frozenset({"w505", "w508"})
+W_NIGHT = frozenset({"w501", "w506"})
+SA_RE = re.compile(r'^sa\d$')
+OD_RE = re.compile(r'^od\d+')
+
 # ==============================
 # CHECK VALID SHIFT LINE
 # ==============================
 def is_valid_shift_line(line):
-    return not any(x in line for x in ["Off:", "On Call", "Relief"]) and re.search(r'\d{2}:\d{2}.*\d{2}:\d{2}', line)
+    return not any(x in line for x in SKIP_MARKERS) and SHIFT_LINE_RE.search(line)
 
 # ==============================
 # EXTRACT NAME
 # ==============================
 def extract_name(line):
-    name_match = re.search(r'([A-Z][\w\'-]*(?:\s+[A-Z][\w\'-]*)*,\s+[A-Z][\w\'-]+(?:\s+[A-Z][\w\'-]+)*)', line)
+    name_match = NAME_RE.search(line)
     if name_match:
         return " ".join(name_match.group().split())
     return None
 
+# ==============================
+# CLASSIFY SHIFT CODE
+# ==============================
+def classify_shift_code(m, line):
+    m_lower = m.lower()
+    shift_type = "Day"  # default
+    explicitly_matched = False
+
+    if SA_RE.match(m_lower):
+        explicitly_matched = True
+    elif OD_RE.match(m_lower) or m.upper() == "OE":
+        explicitly_matched = True
+    elif m_lower in W_DAY:
+        explicitly_matched = True
+    elif m_lower in W_EVENING:
+        shift_type = "Evening"
+        explicitly_matched = True
+    elif m_lower in W_NIGHT:
+        shift_type = "Night"
+        explicitly_matched = True
+    elif m_lower[0] == "e":
+        shift_type = "Evening"
+    elif m_lower[0] == "n":
+        shift_type = "Night"
+
+    if not explicitly_matched and shift_type == "Day":
+        logging.warning(f"Unrecognized shift code '{m}' in line: {line}")
+
+    return shift_type
+
 # ==============================
 # EXTRACT SHIFT INFO
 # ==============================
 def extract_shift_info(line, processing_date):
-    matches = re.findall(r'\b(SA\d|od\d+|OE|\w{1,3}\d{2,4}|\d{3,4})\b', line, re.IGNORECASE)
-    results = []
-    is_weekend = processing_date.weekday() >= 5
-    day_type = "Weekend" if is_weekend else "Weekday"
-
-    w_day = {"w406", "w408", "w409", "w503", "w504", "w507", "w401", "w502"}
-    w_evening = {"w505", "w508"}
-    w_night = {"w501", "w506"}
-
-    for m in matches:
-        m_lower = m.lower()
-        shift_type = "Day"  # default
-        explicitly_matched = False
-
-        if re.match(r'^sa\d$', m_lower):
-            shift_type = "Day"
-            explicitly_matched = True
-        elif re.match(r'^od\d+', m_lower) or m.upper() == "OE":
-            shift_type = "Day"
-            explicitly_matched = True
-        elif m_lower in w_day:
-            shift_type = "Day"
-            explicitly_matched = True
-        elif m_lower in w_evening:
-            shift_type = "Evening"
-            explicitly_matched = True
-        elif m_lower in w_night:
-            shift_type = "Night"
-            explicitly_matched = True
-        elif re.match(r'^[dD]', m):
-            shift_type = "Day"
-        elif re.match(r'^[eE]', m):
-            shift_type = "Evening"
-        elif re.match(r'^[nN]', m):
-            shift_type = "Night"
-
-        if not explicitly_matched and shift_type == "Day":
-            logging.warning(f"Unrecognized shift code '{m}' in line: {line}")
-
-        results.append({
-            "code": m.strip().upper(),
-            "type": shift_type,
-            "DayType": day_type
-        })
-
-    return results
+    day_type = "Weekend" if processing_date.weekday() >= 5 else "Weekday"
+    return [
+        {"code": m.strip().upper(), "type": classify_shift_code(m, line), "DayType": day_type}
+        for m in CODE_RE.findall(line)
+    ]
+
+# ==============================
+# TOKENIZE SHIFT LINE
+# ==============================
+def tokenize_line(line):
+    times, codes = [], []
+    name = None
+    for match in TOKEN_RE.finditer(line):
+        kind = match.lastgroup
+        if kind == "time":
+            times.append(match.group())
+        elif kind == "code":
+            codes.append(match.group())
+        else:
+            text = match.group()
+            if name is None:
+                name = " ".join(text.split())
+            # Codes inside a name-shaped run still count, as with CODE_RE.findall
+            # (digit-free OE included, so every run is rescanned)
+            codes.extend(CODE_RE.findall(line, match.start(), match.end()))
+    return times, name, codes
+
+def clock_minutes(hhmm):
+    hours, minutes = int(hhmm[:2]), int(hhmm[3:])
+    if hours > 23 or minutes > 59:
+        raise ValueError(f"time data {hhmm!r} is out of range")
+    return hours * 60 + minutes
+
+def shift_hours(start_time, end_time):
+    # Overnight shifts wrap past midnight; equal times count as zero, as before
+    return round(((clock_minutes(end_time) - clock_minutes(start_time)) % 1440) / 60, 1)
 
 # ==============================
 # BUILD RECORD
 # ==============================
-def build_record(line, processing_date):
-    time_matches = re.findall(r'\d{2}:\d{2}', line)
-    if len(time_matches) < 2:
+def build_record(line, processing_date, names=None):
+    # Two HH:MM times need at least two colons — skips most page text before any regex runs
+    if line.count(":") < 2 or any(x in line for x in SKIP_MARKERS):
         return None
-    start_time, end_time = time_matches[:2]
 
-    full_name = extract_name(line)
-    if not full_name or full_name not in VALID_NAMES:
+    times, full_name, codes = tokenize_line(line)
+    if len(times) < 2:
         return None
+    start_time, end_time = times[:2]
 
-    infos = extract_shift_info(line, processing_date)
-    if not infos:
+    names = valid_names() if names is None else names
+    if not full_name or full_name not in names:
+        return None
+    if not codes:
         return None
-    full_shift_id = " ".join(i["code"] for i in infos)
-    shift_type = infos[0]["type"]
-    day_type = infos[0]["DayType"]
 
-    dt_start = datetime.strptime(f"{processing_date} {start_time}", "%Y-%m-%d %H:%M")
-    dt_end = datetime.strptime(f"{processing_date} {end_time}", "%Y-%m-%d %H:%M")
-    if dt_end <= dt_start:
-        dt_end += timedelta(days=1)
+    day_type = "Weekend" if processing_date.weekday() >= 5 else "Weekday"
+    full_shift_id = " ".join(m.strip().upper() for m in codes)
+    shift_type = classify_shift_code(codes[0], line)
+    for m in codes[1:]:
+        classify_shift_code(m, line)  # Same warnings as extract_shift_info
 
-    hours = round((dt_end - dt_start).seconds / 3600, 1)
+    hours = shift_hours(start_time, end_time)
 
     logging.debug(f"Parsed: {full_name} — {full_shift_id} — {shift_type}")
-    
+
     return {
         "Name":     full_name,
         "Date":     processing_date.strftime("%a, %b %d"),
@@ -152,47 +183,187 @@ def build_record(line, processing_date):
     }
 
 # ==============================
-# PARSE PDF
+# PARSE PAGE TEXT
 # ==============================
-def parse_pdf(pdf_path, stop_on_date=None):
+def parse_page_text(text):
+    lines = text.splitlines()
+
+    processing_date = extract_processing_date(lines)
+    if not processing_date:
+        return None, []
+
+    names = valid_names()
+    records = []
+    for line in lines:
+        try:
+            # build_record skips non-shift lines itself in one tokenizer pass
+            record = build_record(line, processing_date, names)
+            if record:
+                records.append(record)
+        except Exception as e:
+            logging.debug(f"Skipped line due to error: {e}")
+
+    return processing_date, records
+
+# ==============================
+# PARSE PAGE
+# ==============================
+def parse_page(text):
+    processing_date, records = parse_page_text(text)
+    # Only keep exceptions text — it's all swap detection needs
+    exceptions = text if processing_date and "Exceptions Day Unit:" in text else None
+    # Records depend on the roster too, so key on its version as well as the text
+    return page_key(text, roster_version()), (processing_date, records, exceptions)
+
+# ==============================
+# EXTRACT PAGES (WORKER)
+# ==============================
+def extract_pages(pdf_path, start=0, stop=None, engine=None):
+    return [parse_page(text) for text in iter_page_texts(pdf_path, start, stop, engine=engine)]
+
+# ==============================
+# ITERATE PAGES (SERIAL)
+# ==============================
+def iter_pages(pdf_path, engine=None):
+    for text in iter_page_texts(pdf_path, engine=engine):
+        yield parse_page(text)
+
+# ==============================
+# LOAD CACHED PAGES
+# ==============================
+def load_cached_pages(manifest_key, stop_on_date=None):
+    cache = get_page_cache()
+    manifest = cache.get(manifest_key)
+    if not manifest:
+        return None
+
+    pages = []
+    for key in manifest["pages"]:
+        page = cache.get(key)
+        if page is None:
+            return None
+        pages.append(page)
+        # A partial manifest still answers any stop date it reached
+        if stop_on_date and page[0] == stop_on_date:
+            return pages
+
+    return pages if manifest["complete"] else None
+
+# ==============================
+# CACHE PAGES AS THEY STREAM
+# ==============================
+def cache_pages(manifest_key, keyed_pages):
+    cache = get_page_cache()
+    keys = []
+    complete = False
+    try:
+        for key, page in keyed_pages:
+            cache.put(key, page)
+            keys.append(key)
+            yield page
+        complete = True
+    finally:
+        if keys:
+            cache.put(manifest_key, {"pages": keys, "complete": complete})
+
+# ==============================
+# MERGE PAGES IN ORDER
+# ==============================
+def merge_pages(pages, pdf_path, stop_on_date=None):
     records = []
     swaps = []
+    shift_index = ShiftIndex()  # Grows with records; no per-page DataFrame rebuild
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            lines = text.splitlines()
+    for processing_date, page_records, exceptions in pages:
+        if not processing_date:
+            continue
 
-            processing_date = extract_processing_date(lines)
-            if not processing_date:
-                continue
+        records.extend(page_records)
+        shift_index.add_all(page_records)
+        if not page_records:
+            logging.debug(f"No valid shifts parsed for {processing_date}")
 
-            for line in lines:
-                if not is_valid_shift_line(line):
-                    continue
-                try:
-                    record = build_record(line, processing_date)
-                    if record:
-                        records.append(record)
-                except Exception as e:
-                    logging.debug(f"Skipped line due to error: {e}")
-
-            if not any(r["DateObj"] == processing_date for r in records):
-                logging.debug(f"No valid shifts parsed for {processing_date}")
-
-            if processing_date and "Exceptions Day Unit:" in text:
-                swaps_found = parse_exceptions_section(
-                    text,
-                    pd.DataFrame(records),
-                    os.path.basename(pdf_path),
-                    processing_date
-                )
-                logging.info(f"SWAPS FOUND: {swaps_found}")
-                swaps += swaps_found
-
-            if stop_on_date and processing_date == stop_on_date:
-                logging.debug(f"stop_on_date {stop_on_date} reached. Stopping processing.")
-                return pd.DataFrame(records), swaps
+        if exceptions:
+            swaps_found = parse_exceptions_section(
+                exceptions,
+                shift_index,
+                os.path.basename(pdf_path),
+                processing_date
+            )
+            logging.info(f"SWAPS FOUND: {swaps_found}")
+            swaps += swaps_found
+
+        if stop_on_date and processing_date == stop_on_date:
+            logging.debug(f"stop_on_date {stop_on_date} reached. Stopping processing.")
+            return pd.DataFrame(records), swaps
 
     logging.debug(f"Total swaps found: {len(swaps)}")
     return pd.DataFrame(records), swaps
+
+# ==============================
+# MERGE AND CACHE FRESH PAGES
+# ==============================
+def merge_fresh_pages(keyed_pages, pdf_path, manifest_key, stop_on_date=None):
+    pages = cache_pages(manifest_key, keyed_pages)
+    try:
+        return merge_pages(pages, pdf_path, stop_on_date)
+    finally:
+        # Records the manifest even when stop_on_date cut the stream short
+        pages.close()
+
+# ==============================
+# PARSE PDF
+# ==============================
+def parse_pdf(pdf_path, stop_on_date=None, workers=None, engine=None):
+    workers = PARSE_WORKERS if workers is None else workers
+    if workers > 1:
+        return parse_pdfs([pdf_path], stop_on_date=stop_on_date, workers=workers, engine=engine)[0]
+
+    engine = engine or PDF_ENGINE
+    manifest_key = file_key(pdf_path, engine, roster_version())
+    pages = load_cached_pages(manifest_key, stop_on_date)
+    if pages is not None:
+        return merge_pages(pages, pdf_path, stop_on_date)
+
+    # Lazy generator keeps the stop_on_date early exit
+    return merge_fresh_pages(iter_pages(pdf_path, engine), pdf_path, manifest_key, stop_on_date)
+
+# ==============================
+# PARSE PDFS (PROCESS POOL)
+# ==============================
+def parse_pdfs(pdf_paths, stop_on_date=None, workers=None, engine=None):
+    workers = PARSE_WORKERS if workers is None else workers
+    if workers <= 1:
+        return [parse_pdf(path, stop_on_date=stop_on_date, workers=1, engine=engine) for path in pdf_paths]
+
+    engine = engine or PDF_ENGINE
+    results = {}
+    misses = []
+    for path in pdf_paths:
+        manifest_key = file_key(path, engine, roster_version())
+        pages = load_cached_pages(manifest_key, stop_on_date)
+        if pages is None:
+            misses.append((path, manifest_key))
+        else:
+            results[path] = merge_pages(pages, path, stop_on_date)
+
+    if misses:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Fan every page chunk of every file out before collecting anything
+            file_futures = []
+            for path, _ in misses:
+                file_futures.append([
+                    pool.submit(extract_pages, path, start, start + PARSE_CHUNK_PAGES, engine)
+                    for start in range(0, page_count(path, engine), PARSE_CHUNK_PAGES)
+                ])
+
+            # Merge back in file + page order
+            for (path, manifest_key), futures in zip(misses, file_futures):
+                keyed_pages = (item for future in futures for item in future.result())
+                results[path] = merge_fresh_pages(keyed_pages, path, manifest_key, stop_on_date)
+
+                # Chunks past stop_on_date are never consumed
+                for future in futures:
+                    future.cancel()
+
+    return [results[path] for path in pdf_paths]
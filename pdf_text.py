@@ -0,0 +1,89 @@
+# ==============================
+# PDF_TEXT.PY — TEXT EXTRACTION ENGINES
+# ==============================
+
+from config import PDF_ENGINE
+
+# pdfplumber's default line clustering tolerance (points)
+Y_TOLERANCE = 3
+
+# ==============================
+# PDFPLUMBER ENGINE
+# ==============================
+def pdfplumber_pages(pdf_path, start=0, stop=None):
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages[start:stop]:
+            yield page.extract_text() or ""
+
+def pdfplumber_page_count(pdf_path):
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+# ==============================
+# FITZ (PYMUPDF) ENGINE
+# ==============================
+def words_to_text(words, y_tolerance=Y_TOLERANCE):
+    # Rebuild lines the way pdfplumber does: cluster word tops, then sort by x
+    if not words:
+        return ""
+
+    tops = sorted(set(w[1] for w in words))
+    cluster_of = {}
+    cluster = 0
+    last = tops[0]
+    for top in tops:
+        if top > last + y_tolerance:
+            cluster += 1
+        cluster_of[top] = cluster
+        last = top
+
+    lines = {}
+    for w in words:
+        lines.setdefault(cluster_of[w[1]], []).append(w)
+
+    return "\n".join(
+        " ".join(w[4] for w in sorted(lines[i], key=lambda w: w[0]))
+        for i in sorted(lines)
+    )
+
+def fitz_pages(pdf_path, start=0, stop=None):
+    import fitz
+    with fitz.open(pdf_path) as doc:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for number in range(start, stop):
+            yield words_to_text(doc[number].get_text("words"))
+
+def fitz_page_count(pdf_path):
+    import fitz
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+# ==============================
+# ENGINE REGISTRY
+# ==============================
+ENGINES = {
+    "pdfplumber": (pdfplumber_pages, pdfplumber_page_count),
+    "fitz": (fitz_pages, fitz_page_count),
+}
+
+def get_engine(engine=None):
+    engine = engine or PDF_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown PDF engine: {engine!r} (expected one of {sorted(ENGINES)})")
+    return ENGINES[engine]
+
+# ==============================
+# ITERATE PAGE TEXT
+# ==============================
+def iter_page_texts(pdf_path, start=0, stop=None, engine=None):
+    pages, _ = get_engine(engine)
+    return pages(pdf_path, start, stop)
+
+# ==============================
+# PAGE COUNT
+# ==============================
+def page_count(pdf_path, engine=None):
+    _, count = get_engine(engine)
+    return count(pdf_path)
@@ -3,51 +3,74 @@
 # ==============================
 
 import re
-import os 
-import pdfplumber 
+import os
+import time
+import logging
 import pandas as pd
-from dataclasses import dataclass 
-from datetime import datetime, timedelta 
-from models import db, Employee, ShiftRecord, CoverageShift 
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select
+from models import db, Employee, ShiftRecord, CoverageShift
+from config import INGEST_BULK, INGEST_CHUNK_ROWS
+from pdf_text import iter_page_texts
 
 # ==============================
 # SHIFT DATA SETUP
 # ==============================
-@dataclass class ShiftData: full_name: str date: datetime start: str end: str shift: str shift_type: str day_type: str hours: float source_pdf: str file_date: datetime is_coverage: bool = False coverage_pair: tuple[str, str] | None = None  # (original_name, covering_name) reason: str | None = None
+@dataclass
+class ShiftData:
+    full_name: str
+    date: datetime
+    start: str
+    end: str
+    shift: str
+    shift_type: str
+    day_type: str
+    hours: float
+    source_pdf: str
+    file_date: datetime
+    is_coverage: bool = False
+    coverage_pair: tuple[str, str] | None = None  # (original_name, covering_name)
+    reason: str | None = None
 
 # ==============================
 # EXTRACT SHIFT INFO
 # ==============================
-def extract_shift_info(line, current_date): matches = re.findall(r'\b(SA\d|od\d+|OE|\w{1,3}\d{2,4}|\d{3,4})\b', line, re.IGNORECASE) results = [] day_type = "Weekend" if current_date.weekday() >= 5 else "Weekday"
+def extract_shift_info(line, current_date):
+    matches = re.findall(r'\b(SA\d|od\d+|OE|\w{1,3}\d{2,4}|\d{3,4})\b', line, re.IGNORECASE)
+    results = []
+    day_type = "Weekend" if current_date.weekday() >= 5 else "Weekday"
 
-for m in matches:
-    if re.match(r'^SA\d$', m, re.IGNORECASE):
-        results.append((m, "Day", day_type))
-    elif re.match(r'^od\d+', m, re.IGNORECASE) or m.upper() == "OE":
-        results.append((m, "Other", day_type))
-    else:
-        cleaned = re.sub(r'^[dDeEnwW]', '', m)
-        if cleaned.isdigit() and len(cleaned) == 4:
-            continue
-        if re.match(r'^[dD]', m):
-            results.append((cleaned, "Day", day_type))
-        elif re.match(r'^[eE]', m):
-            results.append((cleaned, "Evening", day_type))
-        elif re.match(r'^[nN]', m):
-            results.append((cleaned, "Night", day_type))
+    for m in matches:
+        if re.match(r'^SA\d$', m, re.IGNORECASE):
+            results.append((m, "Day", day_type))
+        elif re.match(r'^od\d+', m, re.IGNORECASE) or m.upper() == "OE":
+            results.append((m, "Other", day_type))
         else:
-            results.append((cleaned, "Other", day_type))
+            cleaned = re.sub(r'^[dDeEnwW]', '', m)
+            if cleaned.isdigit() and len(cleaned) == 4:
+                continue
+            if re.match(r'^[dD]', m):
+                results.append((cleaned, "Day", day_type))
+            elif re.match(r'^[eE]', m):
+                results.append((cleaned, "Evening", day_type))
+            elif re.match(r'^[nN]', m):
+                results.append((cleaned, "Night", day_type))
+            else:
+                results.append((cleaned, "Other", day_type))
 
-return results
+    return results
 
 # ==============================
 # PARSE PDF TO SHIFT DATA
 # ==============================
-def parse_pdf_to_shiftdata(pdf_path): records = [] coverage_entries = [] file_date = None base_name = os.path.basename(pdf_path)
+def parse_pdf_to_shiftdata(pdf_path, engine=None):
+    records = []
+    coverage_entries = []
+    file_date = None
+    base_name = os.path.basename(pdf_path)
 
-with pdfplumber.open(pdf_path) as pdf:
-    for page in pdf.pages:
-        text = page.extract_text() or ""
+    for text in iter_page_texts(pdf_path, engine=engine):
         lines = text.splitlines()
 
         for line in lines:
@@ -112,80 +135,191 @@ with pdfplumber.open(pdf_path) as pdf:
                         reason = lines[i + 1].strip() if i + 1 < len(lines) else None
                         coverage_entries.append((original, coverer, reason))
 
-for original, coverer, reason in coverage_entries:
-    for r in records:
-        if r.full_name == coverer:
-            r.is_coverage = True
-            r.coverage_pair = (original, coverer)
-            r.reason = reason
+    for original, coverer, reason in coverage_entries:
+        for r in records:
+            if r.full_name == coverer:
+                r.is_coverage = True
+                r.coverage_pair = (original, coverer)
+                r.reason = reason
 
-return records
+    return records
 
 # ==============================
 # SHIFT DATA TO DB
 # ==============================
-def insert_shiftdata_to_db(shift_data): if not shift_data: return "No data extracted."
+def split_name(full_name):
+    try:
+        first, last = full_name.strip().split(" ", 1)
+    except ValueError:
+        return None
+    return first, last
 
-file_date = shift_data[0].file_date
-latest = db.session.query(ShiftRecord.file_date).order_by(ShiftRecord.file_date.desc()).first()
+def insert_shiftdata_to_db(shift_data, bulk=None):
+    if not shift_data:
+        return "No data extracted."
 
-if latest and file_date <= latest[0]:
-    return f"Skipping insert: {file_date} is older than latest file date {latest[0]}"
+    file_date = shift_data[0].file_date
+    latest = db.session.query(ShiftRecord.file_date).order_by(ShiftRecord.file_date.desc()).first()
 
-inserted = 0
-for record in shift_data:
-    try:
-        first, last = record.full_name.strip().split(" ", 1)
-    except ValueError:
-        continue
-    employee = Employee.query.filter_by(first_name=first, last_name=last).first()
-    if not employee:
-        employee = Employee(first_name=first, last_name=last, status="Pending")
-        db.session.add(employee)
-        db.session.flush()
-
-    shift = ShiftRecord(
-        employee_id=employee.id,
-        date=record.date,
-        shift=record.shift,
-        start=record.start,
-        end=record.end,
-        type=record.shift_type,
-        hours=record.hours,
-        day_type=record.day_type,
-        file_date=record.file_date,
-        source_pdf=record.source_pdf,
-        is_coverage=record.is_coverage
+    if latest and file_date <= latest[0]:
+        return f"Skipping insert: {file_date} is older than latest file date {latest[0]}"
+
+    bulk = INGEST_BULK if bulk is None else bulk
+    started = time.perf_counter()
+    inserted, covered = (insert_shiftdata_bulk if bulk else insert_shiftdata_rowwise)(shift_data)
+    db.session.commit()
+
+    elapsed = time.perf_counter() - started
+    rate = (inserted + covered) / elapsed if elapsed else 0.0
+    logging.info(
+        f"[INGEST] {inserted} shifts + {covered} coverage rows in {elapsed:.2f}s "
+        f"({rate:,.0f} rows/sec, {'bulk' if bulk else 'row-wise'})"
+    )
+    return (
+        f"Inserted {inserted} new shifts from {shift_data[-1].source_pdf} "
+        f"(file date: {file_date}, {rate:,.0f} rows/sec)"
     )
-    db.session.add(shift)
-    inserted += 1
 
-    if record.coverage_pair:
-        try:
-            orig_first, orig_last = record.coverage_pair[0].strip().split(" ", 1)
-        except ValueError:
+# ==============================
+# BULK INSERT
+# ==============================
+def insert_ignore_duplicates(model):
+    # Names are unique (uq_employee_name), so a concurrent ingest's inserts are skipped, not errors
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(model)
+    return dialect_insert(model).on_conflict_do_nothing()
+
+def employee_id_map():
+    ids = {}
+    rows = db.session.execute(select(Employee.id, Employee.first_name, Employee.last_name).order_by(Employee.id))
+    for emp_id, first, last in rows:
+        ids.setdefault((first, last), emp_id)  # Lowest id wins, like .first() on duplicates
+    return ids
+
+def load_employee_ids(names):
+    # (first, last) -> id, upserting missing employees as Pending in one executemany
+    ids = employee_id_map()
+    missing = sorted(set(names) - ids.keys())
+    if missing:
+        db.session.execute(
+            insert_ignore_duplicates(Employee),
+            [{"first_name": first, "last_name": last, "status": "Pending"} for first, last in missing]
+        )
+        ids = employee_id_map()
+        logging.info(f"[INGEST] Created {len(missing)} pending employee(s)")
+    return ids
+
+def insert_chunked(model, rows, chunk_rows=None):
+    chunk_rows = chunk_rows or INGEST_CHUNK_ROWS
+    for start in range(0, len(rows), chunk_rows):
+        db.session.execute(insert(model), rows[start:start + chunk_rows])
+    return len(rows)
+
+def insert_shiftdata_bulk(shift_data, chunk_rows=None):
+    names = [
+        (split_name(r.full_name), split_name(r.coverage_pair[0]) if r.coverage_pair else None)
+        for r in shift_data
+    ]
+    # Coverage originals only count where the covering name parsed, as in the row-wise path
+    ids = load_employee_ids(n for name, org_name in names if name for n in (name, org_name) if n)
+
+    shift_rows, coverage_rows = [], []
+    for record, (name, org_name) in zip(shift_data, names):
+        if not name:
             continue
-        org_emp = Employee.query.filter_by(first_name=orig_first, last_name=orig_last).first()
-        if not org_emp:
-            org_emp = Employee(first_name=orig_first, last_name=orig_last, status="Pending")
-            db.session.add(org_emp)
+        employee_id = ids[name]
+        shift_rows.append({
+            "employee_id": employee_id,
+            "date": record.date,
+            "shift": record.shift,
+            "start": record.start,
+            "end": record.end,
+            "type": record.shift_type,
+            "hours": record.hours,
+            "day_type": record.day_type,
+            "file_date": record.file_date,
+            "source_pdf": record.source_pdf,
+            "is_coverage": record.is_coverage,
+        })
+        if org_name:
+            coverage_rows.append({
+                "date": record.date,
+                "shift": record.shift,
+                "start": record.start,
+                "end": record.end,
+                "type": record.shift_type,
+                "hours": record.hours,
+                "file_date": record.file_date,
+                "org_employee_id": ids[org_name],
+                "cov_employee_id": employee_id,
+                "reason": record.reason,
+                "source_pdf": record.source_pdf,
+            })
+
+    return insert_chunked(ShiftRecord, shift_rows, chunk_rows), insert_chunked(CoverageShift, coverage_rows, chunk_rows)
+
+# ==============================
+# ROW-WISE INSERT
+# ==============================
+def insert_shiftdata_rowwise(shift_data):
+    inserted = covered = 0
+    for record in shift_data:
+        name = split_name(record.full_name)
+        if not name:
+            continue
+        first, last = name
+        employee = Employee.query.filter_by(first_name=first, last_name=last).first()
+        if not employee:
+            employee = Employee(first_name=first, last_name=last, status="Pending")
+            db.session.add(employee)
             db.session.flush()
 
-        coverage = CoverageShift(
+        shift = ShiftRecord(
+            employee_id=employee.id,
             date=record.date,
             shift=record.shift,
             start=record.start,
             end=record.end,
             type=record.shift_type,
             hours=record.hours,
+            day_type=record.day_type,
             file_date=record.file_date,
-            org_employee_id=org_emp.id,
-            cov_employee_id=employee.id,
-            reason=record.reason,
-            source_pdf=record.source_pdf
+            source_pdf=record.source_pdf,
+            is_coverage=record.is_coverage
         )
-        db.session.add(coverage)
+        db.session.add(shift)
+        inserted += 1
+
+        if record.coverage_pair:
+            org_name = split_name(record.coverage_pair[0])
+            if not org_name:
+                continue
+            orig_first, orig_last = org_name
+            org_emp = Employee.query.filter_by(first_name=orig_first, last_name=orig_last).first()
+            if not org_emp:
+                org_emp = Employee(first_name=orig_first, last_name=orig_last, status="Pending")
+                db.session.add(org_emp)
+                db.session.flush()
 
-db.session.commit()
-return f"Inserted {inserted} new shifts from {record.source_pdf} (file date: {file_date})"
+            coverage = CoverageShift(
+                date=record.date,
+                shift=record.shift,
+                start=record.start,
+                end=record.end,
+                type=record.shift_type,
+                hours=record.hours,
+                file_date=record.file_date,
+                org_employee_id=org_emp.id,
+                cov_employee_id=employee.id,
+                reason=record.reason,
+                source_pdf=record.source_pdf
+            )
+            db.session.add(coverage)
+            covered += 1
 
+    return inserted, covered
@@ -4,81 +4,38 @@
 
 import os
 import re
-import json
-import pickle
 import pandas as pd
-from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
-from config import DEBUG_MODE, UPLOAD_FOLDER
+from config import DEBUG_MODE, ARGX_STREAMING
 
-from argx import write_argx, make_pay_period_fn
+from argx import write_argx, write_argx_streaming, make_pay_period_fn, add_calendar_columns
 from heatmap import generate_heatmap_png
-from parser import parse_pdf
+from parser import parse_pdfs
+from page_cache import get_page_cache
+from job_queue import report_progress
+from utils.static_data import assignment_codes, normalized_names, normalize_name
 
 # ==============================
 # PAY PERIOD LOGIC
 # ==============================
 get_pay_period = make_pay_period_fn(datetime(2025, 1, 13))
 
-# ==============================
-# CACHE LOGIC
-# ==============================
-CACHE_DIR = Path(UPLOAD_FOLDER) / ".cache"
-CACHE_DIR.mkdir(exist_ok=True)
-
-# ==============================
-# CACHE KEY
-# ==============================
-def cache_key(pdf_path, stop_on_date):
-    stat = os.stat(pdf_path)
-    mod_time = int(stat.st_mtime)
-    stop_str = stop_on_date.isoformat() if stop_on_date else "none"
-    return f"{os.path.basename(pdf_path)}__{mod_time}__{stop_str}.pkl"
-
-# ==============================
-# LOAD CACHE
-# ==============================
-def load_cache(pdf_path, stop_on_date):
-    key = cache_key(pdf_path, stop_on_date)
-    file = CACHE_DIR / key
-    if file.exists():
-        with open(file, "rb") as f:
-            return pickle.load(f)
-    return None
-
-# ==============================
-# SAVE CACHE
-# ==============================
-def save_cache(pdf_path, stop_on_date, data):
-    key = cache_key(pdf_path, stop_on_date)
-    file = CACHE_DIR / key
-    with open(file, "wb") as f:
-        pickle.dump(data, f)
-
 # ==============================
 # LOAD ASSIGNMENT CODES
 # ==============================
 def load_assignment_codes(target_date, df=None, raw_codes=None):
-    base_path = os.path.join(os.path.dirname(__file__), "static")
-    json_path = os.path.join(base_path, "arg_assignments.json")
-
-    # Load structured assignment JSON
-    with open(json_path, "r") as f:
-        asmnts = json.load(f)
-
-    # Normalize helper
-    def normalize(codes):
-        return set(c.strip().upper() for c in codes)
+    # Cached registry view — only re-read when arg_assignments.json changes
+    asmnts = assignment_codes()
 
     # Pull all lists
-    holiday = normalize(asmnts.get("holiday", []))
-    stat = normalize(asmnts.get("stat", []))
-    base = normalize(asmnts.get("weekday_base", []))
-    weekday_add = normalize(asmnts.get("weekday_add", []))
-    friday_add = normalize(asmnts.get("friday_add", []))
-    saturday = normalize(asmnts.get("saturday", []))
-    sunday = normalize(asmnts.get("sunday", []))
+    holiday = asmnts["holiday"]
+    stat = asmnts["stat"]
+    base = asmnts["weekday_base"]
+    weekday_add = asmnts["weekday_add"]
+    friday_add = asmnts["friday_add"]
+    saturday = asmnts["saturday"]
+    sunday = asmnts["sunday"]
 
     weekday = target_date.weekday()  # 0 = Monday ... 6 = Sunday
     is_weekday = weekday < 5
@@ -86,7 +43,7 @@ def load_assignment_codes(target_date, df=None, raw_codes=None):
     if df is not None:
         daily_shifts = set(
             code.strip().upper()
-            for code in df[df["DateObj"] == target_date]["Shift"].unique()
+            for code in df[df["DateObj"] == pd.Timestamp(target_date)]["Shift"].unique()
             if isinstance(code, str)
         )
 
@@ -116,12 +73,6 @@ def load_assignment_codes(target_date, df=None, raw_codes=None):
     else:
         return list(base | weekday_add)
 
-# ==============================
-# NORMALIZE NAME
-# ==============================
-def normalize_name(name):
-    return re.sub(r'\s+', ' ', name.strip()).casefold()
-
 # ==============================
 # EXTRAT SHIFT SORTING KEY
 # ==============================
@@ -137,18 +88,7 @@ def extract_shift_sort_key(shift_code):
 # GET FILTER NAME
 # ==============================
 def get_name_filter(filter_type):
-    base = os.path.join(os.path.dirname(__file__), "static")
-
-    def load_names(file):
-        with open(os.path.join(base, file), "r") as f:
-            return set(normalize_name(name) for name in json.load(f))
-
-    if filter_type == "ft":
-        return load_names("emp_ft.json")
-    elif filter_type == "pt":
-        return load_names("emp_pt.json")
-    else:
-        return load_names("emp_ft.json") | load_names("emp_pt.json")
+    return normalized_names(filter_type if filter_type in ("ft", "pt") else "all")
 
 # ==============================
 # GET SHIFT TYPE
@@ -185,14 +125,14 @@ def group_by_shift(df, target_date, raw_codes=None, filter_type="all"):
 
     all_codes = load_assignment_codes(target_date, df, raw_codes)
 
-    daily = df[df["DateObj"] == target_date]
+    daily = df[df["DateObj"] == pd.Timestamp(target_date)]
 
     # 1. Track all filled shifts (independent of filter)
     all_filled_codes = set(daily["Shift"].str.upper().dropna().unique())
 
     # 2. Apply filter to get only relevant employees (case-insensitive)
     name_filter = get_name_filter(filter_type)
-    filtered = daily[daily["Name"].apply(normalize_name).isin(name_filter)]
+    filtered = daily[daily["Name"].map(normalize_name).isin(name_filter)]
 
     for _, row in filtered.iterrows():
         name = row["Name"].strip()
@@ -229,27 +169,18 @@ def get_working_on_date(df, date_str, raw_codes=None):
 # API: Get Shift Breakdown by Date
 # ==============================
 def get_shifts_for_date(date_str):
+    from schedule_store import SCHEDULE_STORE
+
     try:
         stop_date = datetime.strptime(date_str, "%Y-%m-%d").date()
     except ValueError:
         return {"error": "Invalid date format. Use YYYY-MM-DD"}, 400
 
-    pdf_paths = [
-        os.path.join(UPLOAD_FOLDER, f)
-        for f in os.listdir(UPLOAD_FOLDER)
-        if f.endswith(".pdf")
-    ]
-
-    if not pdf_paths:
+    # ⬇️ Resident schedule — only re-parses PDFs that changed
+    snapshot = SCHEDULE_STORE.get()
+    if snapshot is None:
         return {"error": "No PDF data available"}, 404
-
-    # ⬇️ Only fetch what we need — no stats, heatmap, or xlsx
-    _, _, df, raw_codes = process_report(
-        pdf_paths,
-        return_df=True,
-        stop_on_date=stop_date,
-        steps=set() 
-    )
+    df, raw_codes = snapshot.on_date(stop_date), snapshot.raw_codes
 
     if df.empty:
         return {"error": "No shift data available for this date"}, 404
@@ -260,31 +191,9 @@ def get_shifts_for_date(date_str):
     return result, 200
 
 # ==============================
-# MAIN REPORT PROCESSOR
+# CONSOLIDATE PARSED FRAMES
 # ==============================
-def process_report(pdf_paths, return_df=False, stop_on_date=None, steps=None, filter_type="all"):
-    if steps is None:
-        steps = {"outputs", "heatmap", "stats", "swaps"}
-
-    valid_steps = {"outputs", "heatmap", "stats", "swaps"}
-    invalid = set(steps) - valid_steps
-    if invalid:
-        raise ValueError(f"Invalid steps: {invalid}")
-
-    if DEBUG_MODE:
-        print(f"[DEBUG] Parsing {len(pdf_paths)} PDF(s)...")
-
-    # === Parse PDFs with optional stop date
-    frames_with_swaps = []
-    for path in pdf_paths:
-        cached = load_cache(path, stop_on_date)
-        if cached:
-            frame, swaps = cached
-        else:
-            frame, swaps = parse_pdf(path, stop_on_date=stop_on_date)
-            save_cache(path, stop_on_date, (frame, swaps))
-        frames_with_swaps.append((frame, swaps))
-    
+def consolidate_frames(frames_with_swaps, pdf_paths):
     frames = [f[0] for f in frames_with_swaps]
     swaps_all = sum((f[1] for f in frames_with_swaps), [])
 
@@ -303,9 +212,86 @@ def process_report(pdf_paths, return_df=False, stop_on_date=None, steps=None, fi
 
     # === Consolidate DataFrame
     df = pd.concat(frames, ignore_index=True)
+    if df.empty:
+        return df, swaps_all
     df = df.sort_values(by=["DateObj", "Shift", "FileDate"], ascending=[True, True, False])
     df = df.drop_duplicates(subset=["DateObj", "Shift"], keep="first")
 
+    # === Enrich — datetime64 DateObj plus WeekStart/PayPeriod, computed once
+    df = add_calendar_columns(df, get_pay_period.start_date)
+
+    return df, swaps_all
+
+# ==============================
+# RANKINGS + STATS
+# ==============================
+def compute_stats(df, filter_type="all"):
+    today = pd.Timestamp(datetime.now().date())
+    week_start = today - timedelta(days=today.weekday())
+    current_pp = get_pay_period(today)
+
+    name_filter = get_name_filter(filter_type)
+    filtered_df = df[df["Name"].map(normalize_name).isin(name_filter)]
+
+    # Top Day Stats
+    if not filtered_df.empty:
+        top_day_group = filtered_df.groupby("DateObj")["Hours"].sum()
+        top_day = top_day_group.idxmax().date()
+        top_day_hours = int(top_day_group.max())
+    else:
+        top_day = ""
+        top_day_hours = 0
+
+    # New stats
+    weekly_df = filtered_df[filtered_df["WeekStart"] == week_start]
+    unique_employees = weekly_df["Name"].nunique()
+    total_shifts = len(weekly_df)
+    avg_daily_hours = round(weekly_df.groupby("DateObj")["Hours"].sum().mean(), 1) if not weekly_df.empty else 0
+
+    return {
+        "total_hours_week": round(weekly_df["Hours"].sum()),
+        "top_day": top_day,
+        "top_day_hours": top_day_hours,
+        "unique_employees": unique_employees,
+        "total_shifts": total_shifts,
+        "avg_daily_hours": avg_daily_hours,
+        "rankings": {
+            "weekly": list(
+                weekly_df.groupby("Name", observed=True)["Hours"].sum().sort_values(ascending=False).astype(int).items()
+            ),
+            "period": list(
+                filtered_df[filtered_df["PayPeriod"] == current_pp]
+                .groupby("Name", observed=True)["Hours"].sum().sort_values(ascending=False).astype(int).items()
+            ),
+            "total": list(
+                filtered_df.groupby("Name", observed=True)["Hours"].sum().sort_values(ascending=False).astype(int).items()
+            )
+        }
+    }
+
+# ==============================
+# MAIN REPORT PROCESSOR
+# ==============================
+def process_report(pdf_paths, return_df=False, stop_on_date=None, steps=None, filter_type="all"):
+    if steps is None:
+        steps = {"outputs", "heatmap", "stats", "swaps"}
+
+    valid_steps = {"outputs", "heatmap", "stats", "swaps"}
+    invalid = set(steps) - valid_steps
+    if invalid:
+        raise ValueError(f"Invalid steps: {invalid}")
+
+    if DEBUG_MODE:
+        print(f"[DEBUG] Parsing {len(pdf_paths)} PDF(s)...")
+
+    # === Parse PDFs with optional stop date
+    report_progress(0.1, f"Parsing {len(pdf_paths)} PDF(s)")
+    frames_with_swaps = parse_pdfs(pdf_paths, stop_on_date=stop_on_date)
+    if DEBUG_MODE:
+        print(f"[DEBUG] Page cache: {get_page_cache().stats()}")
+
+    df, swaps_all = consolidate_frames(frames_with_swaps, pdf_paths)
+
     if df.empty:
         if DEBUG_MODE:
             print("[DEBUG] No data found in PDF parsing.")
@@ -314,71 +300,32 @@ def process_report(pdf_paths, return_df=False, stop_on_date=None, steps=None, fi
     # === Extract Shift Codes
     raw_codes = set(df["Shift"].str.upper().dropna().unique())
 
-    # === Enrich
-    df["WeekStart"] = df["DateObj"].apply(lambda d: d - timedelta(days=d.weekday()))
     first_date = df["DateObj"].min().strftime("%Y-%m-%d")
 
     output_files = []
 
     # === Save Excel
     if "outputs" in steps:
+        report_progress(0.5, "Writing ARGX workbook")
         output_filename = f"ARGX_{first_date}.xlsx"
         output_path = os.path.join("/tmp", output_filename)
-        write_argx(df, output_path, get_pay_period)
+        writer = write_argx_streaming if ARGX_STREAMING else write_argx
+        writer(df, output_path, get_pay_period)
         output_files.append(output_path)
         if DEBUG_MODE:
             print(f"[DEBUG] ARGX saved to: {output_path}")
 
     # === Generate Heatmap
     if "heatmap" in steps:
+        report_progress(0.7, "Drawing heatmap")
         heatmap_path = generate_heatmap_png(df, first_date)
         output_files.append(heatmap_path)
 
     # === Rankings + Stats
     stats = {}
     if "stats" in steps:
-        today = datetime.now().date()
-        week_start = today - timedelta(days=today.weekday())
-        current_pp = get_pay_period(today)
-    
-        name_filter = get_name_filter(filter_type)
-        filtered_df = df[df["Name"].apply(normalize_name).isin(name_filter)]
-    
-        # Top Day Stats
-        if not filtered_df.empty:
-            top_day_group = filtered_df.groupby("DateObj")["Hours"].sum()
-            top_day = top_day_group.idxmax()
-            top_day_hours = int(top_day_group.max())
-        else:
-            top_day = ""
-            top_day_hours = 0
-    
-        # New stats
-        weekly_df = filtered_df[filtered_df["WeekStart"] == week_start]
-        unique_employees = weekly_df["Name"].nunique()
-        total_shifts = len(weekly_df)
-        avg_daily_hours = round(weekly_df.groupby("DateObj")["Hours"].sum().mean(), 1) if not weekly_df.empty else 0
-    
-        stats = {
-            "total_hours_week": round(weekly_df["Hours"].sum()),
-            "top_day": top_day,
-            "top_day_hours": top_day_hours,
-            "unique_employees": unique_employees,
-            "total_shifts": total_shifts,
-            "avg_daily_hours": avg_daily_hours,
-            "rankings": {
-                "weekly": list(
-                    weekly_df.groupby("Name")["Hours"].sum().sort_values(ascending=False).astype(int).items()
-                ),
-                "period": list(
-                    filtered_df[filtered_df["DateObj"].apply(get_pay_period) == current_pp]
-                    .groupby("Name")["Hours"].sum().sort_values(ascending=False).astype(int).items()
-                ),
-                "total": list(
-                    filtered_df.groupby("Name")["Hours"].sum().sort_values(ascending=False).astype(int).items()
-                )
-            }
-        }
+        report_progress(0.85, "Computing stats")
+        stats = compute_stats(df, filter_type)
 
     # === Shift Swaps
     if "swaps" in steps:
@@ -2,7 +2,7 @@
 # ARG_ROUTES.PY
 # ==============================
 
-import os
+import pandas as pd
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, timedelta
 from models import ShiftRecord, CoverageShift
@@ -12,8 +12,10 @@ from dataman import (
     import_shifts_from_json,
     import_shifts_from_csv,
 )
-from report import get_shifts_for_date, process_report, group_by_shift, normalize_name, get_pay_period, get_shift_type
-from config import UPLOAD_FOLDER
+from report import get_shifts_for_date, group_by_shift, normalize_name, get_pay_period, get_shift_type, compute_stats, get_name_filter
+from heatmap import heatmap_json
+from schedule_store import SCHEDULE_STORE
+from utils.static_data import normalized_names
 
 # ==============================
 # SETUP ARG BP
@@ -28,27 +30,18 @@ def api_working_on_date():
     date_str = request.args.get("date")
     filter_type = request.args.get("filter", "all").lower()
 
-    pdf_paths = [
-        os.path.join(UPLOAD_FOLDER, f)
-        for f in os.listdir(UPLOAD_FOLDER)
-        if f.endswith(".pdf")
-    ]
-    if not pdf_paths:
+    snapshot = SCHEDULE_STORE.get()
+    if snapshot is None:
         return jsonify({"error": "No PDF data available"}), 404
 
-    outputs, stats, df, raw_codes = process_report(
-        pdf_paths,
-        return_df=True,
-        steps=set(),  # ⬅️ Skip heavy processing
-        filter_type=filter_type
-    )
-
     try:
         target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
     except ValueError:
         return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
 
-    return jsonify(group_by_shift(df, target_date, raw_codes, filter_type))
+    # Only the target date's rows — the date index makes this a slice
+    daily = snapshot.on_date(target_date)
+    return jsonify(group_by_shift(daily, target_date, snapshot.raw_codes, filter_type))
 
 # ==============================
 # API ARG NAME LOOKUP
@@ -56,11 +49,7 @@ def api_working_on_date():
 @arg_bp.route("/api/lookup_names")
 def api_lookup_names():
     try:
-        from report import get_name_filter, normalize_name
-
-        ft_names = get_name_filter("ft")
-        pt_names = get_name_filter("pt")
-        all_names = sorted(ft_names | pt_names)
+        all_names = sorted(normalized_names("all"))
 
         return jsonify({"names": list(all_names)})
     except Exception as e:
@@ -77,38 +66,21 @@ def api_lookup_schedule():
         return jsonify({"error": "Name parameter is required"}), 400
 
     try:
-        pdf_paths = [
-            os.path.join(UPLOAD_FOLDER, f)
-            for f in os.listdir(UPLOAD_FOLDER)
-            if f.lower().endswith(".pdf")
-        ]
-        if not pdf_paths:
+        snapshot = SCHEDULE_STORE.get()
+        if snapshot is None:
             return jsonify({"error": "No PDF data available"}), 404
-
-        _, _, df, raw_codes = process_report(
-            pdf_paths,
-            return_df=True,
-            steps=set(),  # fast load
-            filter_type="all"
-        )
-
-        if df.empty:
-            return jsonify({"error": "No schedule data parsed"}), 404
-
-        target_norm = normalize_name(name)
-        person_df = df[df["Name"].apply(lambda n: normalize_name(n) == target_norm)]
+        person_df = snapshot.for_name(name)
 
         if person_df.empty:
             return jsonify({"shifts": []})
 
-        today = datetime.now().date()
+        today = pd.Timestamp(datetime.now().date())
         if filter_type == "week":
             start = today - timedelta(days=today.weekday())
-            end = start + timedelta(days=6)
-            person_df = person_df[person_df["DateObj"].between(start, end)]
+            person_df = person_df[person_df["WeekStart"] == start]
         elif filter_type == "period":
             pp = get_pay_period(today)
-            person_df = person_df[person_df["DateObj"].apply(lambda d: get_pay_period(d) == pp)]
+            person_df = person_df[person_df["PayPeriod"] == pp]
 
         shifts = (
             person_df[["DateObj", "Shift"]]
@@ -135,22 +107,30 @@ def api_lookup_schedule():
 def api_arg_stats():
     filter_type = request.args.get("filter", "all").lower()
 
-    pdf_paths = [
-        os.path.join(UPLOAD_FOLDER, f)
-        for f in os.listdir(UPLOAD_FOLDER)
-        if f.endswith(".pdf")
-    ]
-
-    if not pdf_paths:
+    snapshot = SCHEDULE_STORE.get()
+    if snapshot is None:
         return jsonify({"error": "No PDF data available"}), 404
 
-    # Pass the filter into process_report
-    _, stats, _, _ = process_report(
-        pdf_paths, return_df=True, steps={"stats"}, stop_on_date=None, filter_type=filter_type
-    )
+    stats = compute_stats(snapshot.df, filter_type)
 
     return jsonify({"stats": stats})
 
+# ==============================
+# API HEATMAP MATRIX ROUTE
+# ==============================
+@arg_bp.route("/api/heatmap_matrix")
+def api_heatmap_matrix():
+    filter_type = request.args.get("filter", "all").lower()
+
+    snapshot = SCHEDULE_STORE.get()
+    if snapshot is None:
+        return jsonify({"error": "No PDF data available"}), 404
+
+    # Raw Name x WeekStart hours so the client can draw the heatmap itself
+    df = snapshot.df
+    df = df[df["Name"].map(normalize_name).isin(get_name_filter(filter_type))]
+    return jsonify(heatmap_json(df))
+
 # ==============================
 # DB CHECK ROUTE
 # ==============================
@@ -8,6 +8,7 @@ from flask import Blueprint, request, jsonify, current_app, send_file
 from utils.data_search import handle_search_request
 from inv_cleaner import clean_xlsx_and_save
 from inventory import get_inventory_usls, search_inventory
+from inv_index import INDEX_SERVICE, search_inventory_index
 
 # ==============================
 # SETUP INVENTORY BP
@@ -54,22 +55,52 @@ def inventory_search():
     usl = request.args.get("usl", "")
     sort = request.args.get("sort", "")
     direction = request.args.get("dir", "")
+    backend = request.args.get("backend", config.INVENTORY_SEARCH_BACKEND)
 
-    current_app.logger.debug(f"📥 Query params -> term: '{term}', usl: '{usl}', sort: '{sort}', dir: '{direction}'")
+    current_app.logger.debug(f"📥 Query params -> term: '{term}', usl: '{usl}', sort: '{sort}', dir: '{direction}', backend: '{backend}'")
 
-    if df is None:
+    if backend == "whoosh":
+        search_fn = search_inventory_index
+    elif df is None:
+        search_fn = search_inventory
         current_app.logger.warning("⚠️ INVENTORY_DF is None. Search will likely fail.")
     else:
+        search_fn = search_inventory
         current_app.logger.debug(f"📊 INVENTORY_DF shape: {df.shape}")
 
     try:
-        response = handle_search_request(df, search_inventory, default_sort="QTY", filter_param="usl")
+        response = handle_search_request(df, search_fn, default_sort="QTY", filter_param="usl")
         current_app.logger.debug("✅ Search handled successfully")
         return response
     except Exception as e:
         current_app.logger.exception(f"🔥 Exception in inventory_search: {e}")
         return jsonify({"error": "Search failed"}), 500
 
+# ==============================
+# INVENTORY INDEX SEARCH (PAGED)
+# ==============================
+@inventory_bp.route("/inventory-index-search")
+def inventory_index_search():
+    current_app.logger.debug("🔍 /inventory-index-search route hit")
+    try:
+        page = INDEX_SERVICE.search(
+            term=request.args.get("term", ""),
+            usl=request.args.get("usl"),
+            group=request.args.get("group"),
+            page=request.args.get("page", 1, type=int),
+            pagelen=request.args.get("pagelen", 20, type=int),
+            sort=request.args.get("sort"),
+            direction=request.args.get("dir", "desc"),
+        )
+        current_app.logger.debug(f"✅ {page['total']} hits, page {page['page']}/{page['pages']}")
+        return jsonify(page)
+    except FileNotFoundError as e:
+        current_app.logger.warning(f"⚠️ {e}")
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        current_app.logger.exception(f"🔥 Exception in inventory_index_search: {e}")
+        return jsonify({"error": "Search failed"}), 500
+
 # ==============================
 # INVENTORY CLEANING
 # ==============================
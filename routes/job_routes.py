@@ -0,0 +1,40 @@
+# ==============================
+# JOB_ROUTES.PY — UPLOAD JOB STATUS
+# ==============================
+
+from flask import Blueprint, jsonify, render_template, current_app
+from job_queue import JOB_QUEUE, DONE, FAILED
+
+# ==============================
+# SETUP JOB BP
+# ==============================
+job_bp = Blueprint("jobs", __name__)
+
+# ==============================
+# STATUS / PROGRESS
+# ==============================
+@job_bp.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = JOB_QUEUE.get(job_id)
+    if job is None:
+        current_app.logger.warning(f"❓ Unknown job: {job_id}")
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job.to_dict())
+
+# ==============================
+# RESULT PAGE
+# ==============================
+@job_bp.route("/jobs/<job_id>/result")
+def job_result(job_id):
+    job = JOB_QUEUE.get(job_id)
+    if job is None:
+        current_app.logger.warning(f"❓ Unknown job: {job_id}")
+        return render_template("index.html", error="[JOBS] Upload job not found or expired."), 404
+
+    status = job.to_dict()
+    if job.status == DONE:
+        current_app.logger.debug(f"✅ Serving result for job {job_id}")
+        return job.result
+    if job.status == FAILED:
+        return render_template("index.html", error=f"[JOBS] Upload failed: {job.error}"), 500
+    return jsonify(status), 202
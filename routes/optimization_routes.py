@@ -4,8 +4,8 @@
 
 import os
 import config
-from flask import Blueprint, send_file, current_app, jsonify
-from optimization import search_optimization
+from flask import Blueprint, send_file, current_app, jsonify, request
+from optimization import search_optimization, simulate_rop_roq, ROP_BUFFER_DAYS, ROP_ENDING, ROQ_MIN_PCT, ROQ_MAX_PCT
 from utils.data_search import handle_search_request
 
 # ==============================
@@ -93,3 +93,39 @@ def optimization_search():
         current_app.logger.debug(f"📊 OPTIMIZATION_DF shape: {df.shape}")
 
     return handle_search_request(df, search_optimization, default_sort="Num", filter_param="cart")
+
+# ==============================
+# OPTIMIZATION WHAT-IF SIMULATION
+# ==============================
+@optimization_bp.route("/optimization-simulate", methods=["POST"])
+def optimization_simulate():
+    current_app.logger.debug("🧮 /optimization-simulate route hit")
+    df = config.OPTIMIZATION_DF
+
+    if df is None:
+        current_app.logger.warning("⚠️ OPTIMIZATION_DF is None.")
+        return jsonify({"error": "Optimization data not loaded."}), 400
+
+    body = request.get_json(silent=True) or {}
+
+    def grid(key, default, cast):
+        values = body.get(key, [default])
+        return [cast(v) for v in (values if isinstance(values, list) else [values])]
+
+    try:
+        scenarios = simulate_rop_roq(
+            df,
+            buffer_days=grid("buffer_days", ROP_BUFFER_DAYS, float),
+            roq_min_pcts=grid("roq_min_pct", ROQ_MIN_PCT, float),
+            roq_max_pcts=grid("roq_max_pct", ROQ_MAX_PCT, float),
+            rop_endings=grid("rop_ending", ROP_ENDING, int),
+        )
+    except (TypeError, ValueError) as e:
+        current_app.logger.warning(f"⚠️ Invalid simulation grid: {e}")
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.exception(f"🔥 Simulation failed: {e}")
+        return jsonify({"error": "Simulation failed"}), 500
+
+    current_app.logger.debug(f"✅ Simulated {len(scenarios)} scenario(s) over {len(df)} rows")
+    return jsonify({"rows": len(df), "scenarios": scenarios})
@@ -0,0 +1,157 @@
+# ==============================
+# SCHEDULE_STORE.PY — RESIDENT SCHEDULE
+# ==============================
+
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+from config import UPLOAD_FOLDER
+from parser import parse_pdfs
+from report import consolidate_frames, normalize_name
+from utils.static_data import roster_version
+
+# ==============================
+# SNAPSHOT
+# ==============================
+CATEGORICAL_COLUMNS = ["Name", "Shift", "Type"]
+EMPTY_POSITIONS = np.empty(0, dtype=np.intp)
+
+@dataclass(frozen=True)
+class ScheduleSnapshot:
+    df: pd.DataFrame
+    raw_codes: set
+    swaps: list
+    sources: tuple
+    generation: int
+    date_index: dict = field(default_factory=dict)  # date -> (start, stop) row slice
+    name_index: dict = field(default_factory=dict)  # normalized name -> row positions
+    built_at: float = field(default_factory=time.time)
+
+    def on_date(self, target_date):
+        start, stop = self.date_index.get(pd.Timestamp(target_date), (0, 0))
+        return self.df.iloc[start:stop]
+
+    def for_name(self, name):
+        positions = self.name_index.get(normalize_name(name), EMPTY_POSITIONS)
+        return self.df.iloc[positions]
+
+# ==============================
+# INDEX BUILDERS
+# ==============================
+def build_date_index(df):
+    # Rows are sorted by DateObj, so each date is one contiguous slice
+    return {
+        date: (int(positions[0]), int(positions[-1]) + 1)
+        for date, positions in df.groupby("DateObj", sort=False).indices.items()
+    }
+
+def build_name_index(df):
+    keys = df["Name"].map(normalize_name)  # Categorical: one call per distinct name
+    return df.groupby(keys, sort=False, observed=True).indices
+
+# ==============================
+# SCHEDULE STORE
+# ==============================
+class ScheduleStore:
+    """
+    Process-wide consolidated schedule built from the PDFs in a folder.
+
+    Each file's parsed frame is kept alongside its (mtime, size) signature,
+    so a refresh only re-parses PDFs that were added or changed and just
+    re-consolidates the rest. Snapshots carry date and name indexes over the
+    consolidated rows and are treated as read-only by callers.
+    """
+
+    def __init__(self, folder=UPLOAD_FOLDER):
+        self.folder = folder
+        self.lock = threading.Lock()
+        self.files = {}  # path -> (signature, frame, swaps)
+        self.snapshot = None
+        self.generation = 0
+        self.roster = None
+
+    def _scan(self):
+        signatures = {}
+        try:
+            names = os.listdir(self.folder)
+        except FileNotFoundError:
+            return signatures
+
+        for name in names:
+            if not name.lower().endswith(".pdf"):
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue  # Removed between listdir and stat
+            signatures[path] = (st.st_mtime_ns, st.st_size)
+        return signatures
+
+    def _build(self):
+        paths = sorted(self.files)
+        # consolidate_frames tags frames in place — hand it copies
+        frames = [(self.files[p][1].copy(), self.files[p][2]) for p in paths]
+        df, swaps = consolidate_frames(frames, paths)
+        if df.empty:
+            return None
+
+        df = df.reset_index(drop=True)
+        raw_codes = set(df["Shift"].str.upper().dropna().unique())
+        df[CATEGORICAL_COLUMNS] = df[CATEGORICAL_COLUMNS].astype("category")
+
+        self.generation += 1
+        return ScheduleSnapshot(
+            df=df,
+            raw_codes=raw_codes,
+            swaps=swaps,
+            sources=tuple(os.path.basename(p) for p in paths),
+            generation=self.generation,
+            date_index=build_date_index(df),
+            name_index=build_name_index(df),
+        )
+
+    def refresh(self):
+        with self.lock:
+            # Parsed records depend on the roster, so a roster edit re-parses everything
+            roster = roster_version()
+            if roster != self.roster:
+                self.files.clear()
+                self.roster = roster
+
+            current = self._scan()
+            changed = [p for p, sig in sorted(current.items()) if self.files.get(p, (None,))[0] != sig]
+            removed = [p for p in self.files if p not in current]
+
+            if not changed and not removed:
+                return self.snapshot
+
+            for path in removed:
+                del self.files[path]
+
+            if changed:
+                started = time.perf_counter()
+                for path, (frame, swaps) in zip(changed, parse_pdfs(changed)):
+                    self.files[path] = (current[path], frame, swaps)
+                logging.info(
+                    f"[STORE] Parsed {len(changed)} PDF(s) in {time.perf_counter() - started:.2f}s"
+                )
+
+            self.snapshot = self._build() if self.files else None
+            if removed:
+                logging.info(f"[STORE] Dropped {len(removed)} removed PDF(s)")
+            return self.snapshot
+
+    def get(self):
+        return self.refresh()
+
+    def clear(self):
+        with self.lock:
+            self.files.clear()
+            self.snapshot = None
+
+SCHEDULE_STORE = ScheduleStore()
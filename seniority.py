@@ -3,6 +3,7 @@
 # ==============================
 
 import pandas as pd
+from utils.data_search import search_frame
 
 # ==============================
 # LOAD EXCEL FILE
@@ -32,8 +33,8 @@ def load_seniority_file(path):
 # BASIC NAME LOOKUP
 # ==============================
 def lookup_seniority(df, query):
-    query = query.lower()
-    return df[df.apply(lambda row: query in str(row).lower(), axis=1)]
+    # Matches cell values in any column
+    return search_frame(df, query.lower(), df.columns)
 
 # ==============================
 # FILTER BY FIELD MATCHES
@@ -61,7 +62,7 @@ def register_seniority_routes(app, file_path):
             "Status": request.args.get("status"),
             "Department": request.args.get("dept"),
         }
-        filtered = filter_seniority(df, filters)
-        if name:
-            filtered = lookup_seniority(filtered, name)
+        # Name lookup first, on the loaded frame, so its lowered columns are reused
+        filtered = lookup_seniority(df, name) if name else df
+        filtered = filter_seniority(filtered, filters)
         return jsonify(filtered.to_dict(orient="records"))
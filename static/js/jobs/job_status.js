@@ -0,0 +1,46 @@
+// ==============================
+// JOB_STATUS.JS — UPLOAD JOB POLLING
+// ==============================
+
+const POLL_MS = 1000;
+
+// ==============================
+// POLL UNTIL DONE, THEN SHOW RESULT
+// ==============================
+export function initJobStatus() {
+  const container = document.getElementById("job-status");
+  if (!container) return;
+
+  const statusUrl = container.dataset.statusUrl;
+  const resultUrl = container.dataset.resultUrl;
+  const message = document.getElementById("job-message");
+  const progress = document.getElementById("job-progress");
+  const error = document.getElementById("job-error");
+
+  const showError = (text) => {
+    document.getElementById("loading").style.display = "none";
+    error.textContent = text;
+    error.style.display = "block";
+  };
+
+  const poll = () => {
+    fetch(statusUrl)
+      .then(res => {
+        if (!res.ok) throw new Error(`Status ${res.status}`);
+        return res.json();
+      })
+      .then(job => {
+        message.textContent = job.message;
+        progress.value = job.progress;
+
+        if (job.status === "done" || job.status === "failed") {
+          window.location.replace(resultUrl);
+        } else {
+          setTimeout(poll, POLL_MS);
+        }
+      })
+      .catch(err => showError(`Lost track of this upload (${err.message}). Please upload again.`));
+  };
+
+  poll();
+}
@@ -97,6 +97,10 @@ document.addEventListener("DOMContentLoaded", () => {
       if (document.querySelector("#info-tips-panel")) m.loadInfoTips();
     });
   }
+  // ----- UPLOAD JOB -----
+  if (document.body.dataset.page === "job") {
+    import('./jobs/job_status.js').then(m => m.initJobStatus());
+  }
   // ----- SENIORITY -----
   if (document.querySelector("#seniority-search")) {
     import('./seniority/sen_init.js').then(m => m.initializeSeniorityApp());
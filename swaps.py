@@ -2,21 +2,34 @@
 # SWAPS.PY
 # ==============================
 
-import os
 import re
-import json
+from utils.name_matcher import roster_matcher
 
 # ==============================
-# LOAD JSON LIST
+# SHIFT INDEX
 # ==============================
-def load_all_employees():
-    base = os.path.join(os.path.dirname(__file__), "static")
-    with open(os.path.join(base, "emp_ft.json"), "r") as f1, open(os.path.join(base, "emp_pt.json"), "r") as f2:
-        ft = json.load(f1)
-        pt = json.load(f2)
-    return list(set(ft + pt))
+class ShiftIndex:
+    """
+    Incremental name -> (shift, type, day_type) lookup for swap resolution.
 
-EMP_ALL = load_all_employees()
+    Records are added as pages are parsed. Lookups prefer the coverer's shift
+    on the swap's own date and fall back to the first shift seen for them.
+    """
+
+    def __init__(self, records=()):
+        self.by_date = {}
+        self.first_seen = {}
+        self.add_all(records)
+
+    def add_all(self, records):
+        for record in records:
+            entry = (record["Shift"], record["Type"], record["DayType"])
+            self.by_date.setdefault(record["DateObj"], {}).setdefault(record["Name"], entry)
+            self.first_seen.setdefault(record["Name"], entry)
+
+    def get(self, name, date=None):
+        entry = self.by_date.get(date, {}).get(name)
+        return entry if entry is not None else self.first_seen.get(name)
 
 # ==============================
 # NORMALIZE NAME
@@ -67,16 +80,15 @@ def extract_relief_name(line):
 # ==============================
 # EXTRACT NAME FROM LINE
 # ==============================
-def extract_name_from_line(line):
-    for name in EMP_ALL:
-        if name in line:
-            return name
-    return None
+def extract_name_from_line(line, matcher=None):
+    # One Aho-Corasick pass over the line; longest roster name wins
+    matcher = matcher or roster_matcher()
+    return matcher.longest(line)
 
 # ==============================
 # PARSE EXCEPTIONS SECTION
 # ==============================
-def parse_exceptions_section(text, schedule_df, file_name, file_date):
+def parse_exceptions_section(text, shift_index, file_name, file_date):
     lines = text.splitlines()
     sections = {"Day": [], "Evening": [], "Night": []}
     current = None
@@ -95,6 +107,7 @@ def parse_exceptions_section(text, schedule_df, file_name, file_date):
 
     all_swaps = []
     used_coverers = set()
+    matcher = roster_matcher()
 
     for shift_type, block in sections.items():
         off_lines = [l for l in block if l.startswith("Off:")]
@@ -104,7 +117,7 @@ def parse_exceptions_section(text, schedule_df, file_name, file_date):
             embedded_coverer = extract_relief_name(off_line)
             off_part = off_line.split("Relief:")[0].strip() if "Relief:" in off_line else off_line
 
-            org_name = extract_name_from_line(off_part)
+            org_name = extract_name_from_line(off_part, matcher)
             if not org_name:
                 continue
 
@@ -125,19 +138,17 @@ def parse_exceptions_section(text, schedule_df, file_name, file_date):
                 coverer = "Vacant"
                 for line in on_lines:
                     if start in line and end in line:
-                        name = extract_name_from_line(line)
+                        name = extract_name_from_line(line, matcher)
                         if name and name not in used_coverers:
                             coverer = name
                             used_coverers.add(name)
                             break
 
-            scheduled_row = schedule_df[schedule_df["Name"] == coverer]
-            if scheduled_row.empty:
+            scheduled = shift_index.get(coverer, file_date)
+            if scheduled is None:
                 continue
 
-            shift = scheduled_row["Shift"].values[0]
-            actual_type = scheduled_row["Type"].values[0]
-            day_type = scheduled_row["DayType"].values[0]
+            shift, actual_type, day_type = scheduled
 
             all_swaps.append({
                 "org_employee": normalize_name(org_name),
@@ -155,7 +166,7 @@ def parse_exceptions_section(text, schedule_df, file_name, file_date):
 
     for line in on_lines:
         if "Covering Vacant" in line:
-            name = extract_name_from_line(line)
+            name = extract_name_from_line(line, matcher)
             if not name or name in used_coverers:
                 continue
             time_matches = re.findall(r"(\d{2}:\d{2})\s*-\s*(\d{2}:\d{2})", line)
@@ -164,12 +175,10 @@ def parse_exceptions_section(text, schedule_df, file_name, file_date):
             start, end = time_matches[0]
             suffix_match = re.findall(r"\b([NPCpnc]{1,2})\b", line)
             suffix = suffix_match[-1].upper() if suffix_match else ""
-            scheduled_row = schedule_df[schedule_df["Name"] == name]
-            if scheduled_row.empty:
+            scheduled = shift_index.get(name, file_date)
+            if scheduled is None:
                 continue
-            shift = scheduled_row["Shift"].values[0]
-            actual_type = scheduled_row["Type"].values[0]
-            day_type = scheduled_row["DayType"].values[0]
+            shift, actual_type, day_type = scheduled
             used_coverers.add(name)
             all_swaps.append({
                 "org_employee": "Vacant",
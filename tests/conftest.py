@@ -0,0 +1,11 @@
+# ==============================
+# CONFTEST.PY — SHARED TEST SETUP
+# ==============================
+
+import os
+import sys
+
+# Tests import the app's top-level modules (parser, argx, optimization, ...) directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,91 @@
+# ==============================
+# ARGX_WORKBOOKS.PY — SYNTHETIC SCHEDULES AND WORKBOOK DIFFS
+# ==============================
+# Shared by tests/test_argx.py and bench/argx_bench.py.
+
+from datetime import timedelta, datetime
+import numpy as np
+import pandas as pd
+from argx import add_calendar_columns
+
+
+def synthetic_shifts(weeks=52, employees=40, seed=0):
+    """
+    Builds a parsed-shift DataFrame shaped like a run of flowsheets, for tests and benchmarks.
+
+    Parameters:
+        weeks (int): Number of weeks of schedule to generate.
+        employees (int): Number of distinct employees.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Rows with the columns write_argx expects.
+    """
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 1, 13).date()
+    names = [f"Last{i:03d}, First{i:03d}" for i in range(employees)]
+    shifts = [("D1", "Day", "07:00", "15:00", 8.0), ("E3", "Evening", "15:00", "23:00", 8.0),
+              ("N2", "Night", "23:00", "07:00", 8.0), ("W5", "Day", "07:00", "19:00", 12.0)]
+
+    rows = []
+    for day in range(weeks * 7):
+        date = start + timedelta(days=day)
+        for e in rng.choice(employees, size=employees * 5 // 7, replace=False):
+            code, shift_type, begin, end, hours = shifts[rng.integers(len(shifts))]
+            rows.append({
+                "Name": names[e], "Date": date.strftime("%a, %b %d"), "DateObj": date,
+                "Shift": f"{code}{e:02d}", "Type": shift_type, "DayType": "Weekend" if date.weekday() >= 5 else "Weekday",
+                "Hours": hours, "Start": begin, "End": end,
+            })
+    return add_calendar_columns(pd.DataFrame(rows), datetime(2025, 1, 13))
+
+
+def compare_argx(reference_path, candidate_path):
+    """
+    Compares two ARGX workbooks cell by cell, including the visible styling.
+
+    Parameters:
+        reference_path (str): Workbook produced by write_argx.
+        candidate_path (str): Workbook to check against it.
+
+    Returns:
+        list: Human-readable differences; empty when the workbooks match.
+    """
+    from openpyxl import load_workbook
+    from openpyxl.utils import get_column_letter
+
+    def describe(cell):
+        return (
+            cell.value,
+            bool(cell.font.b),
+            cell.alignment.horizontal,
+            cell.fill.fill_type,
+            cell.fill.fgColor.rgb if cell.fill.fill_type else None,
+            tuple(getattr(getattr(cell.border, side), "style", None) for side in ("left", "right", "top", "bottom")),
+        )
+
+    ref, cand = load_workbook(reference_path), load_workbook(candidate_path)
+    if ref.sheetnames != cand.sheetnames:
+        return [f"sheet names differ: {ref.sheetnames} != {cand.sheetnames}"]
+
+    diffs = []
+    for title in ref.sheetnames:
+        a, b = ref[title], cand[title]
+        if a.freeze_panes != b.freeze_panes:
+            diffs.append(f"{title}: freeze panes {a.freeze_panes} != {b.freeze_panes}")
+        if (a.max_row, a.max_column) != (b.max_row, b.max_column):
+            diffs.append(f"{title}: size {(a.max_row, a.max_column)} != {(b.max_row, b.max_column)}")
+            continue
+        for col in range(1, a.max_column + 1):
+            letter = get_column_letter(col)
+            if a.column_dimensions[letter].width != b.column_dimensions[letter].width:
+                diffs.append(f"{title}!{letter}: width differs")
+        for row_a, row_b in zip(a.iter_rows(), b.iter_rows()):
+            for ca, cb in zip(row_a, row_b):
+                if describe(ca) != describe(cb):
+                    diffs.append(f"{title}!{ca.coordinate}: {describe(ca)} != {describe(cb)}")
+        ranges_a = sorted(str(cf.sqref) for cf in a.conditional_formatting)
+        ranges_b = sorted(str(cf.sqref) for cf in b.conditional_formatting)
+        if ranges_a != ranges_b:
+            diffs.append(f"{title}: conditional formatting {ranges_a} != {ranges_b}")
+    return diffs
@@ -0,0 +1,69 @@
+# ==============================
+# MAKE_FLOWSHEETS.PY — ANONYMISED SAMPLE FLOWSHEET PDFS
+# ==============================
+# Regenerate with: python tests/fixtures/make_flowsheets.py
+
+import os
+import random
+from datetime import date, timedelta
+import pymupdf
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+NAMES = [
+    "Alder, Avery", "Birch, Blake", "Cedar, Casey", "Dogwood, Drew", "Elm, Emery",
+    "Fir, Finley", "Hazel, Harper", "Juniper, Jordan", "Larch, Logan", "Maple, Morgan",
+    "Oak-Rowan, Parker", "O'Pine, Quinn", "Spruce, Riley Jo", "Willow, Sage",
+]
+CODES = ["d103", "d104", "D306", "E310", "n203", "w502", "SA1", "od12", "OE"]
+TIMES = [("07:00", "15:00"), ("08:00", "16:30"), ("15:00", "23:00"), ("23:00", "07:00")]
+REASONS = ["Sick N", "Vacation", "Shift Swap", "Stat", "Covering Vacant P"]
+
+# ==============================
+# PAGE CONTENT
+# ==============================
+def page_lines(day, rng):
+    lines = [f"Flowsheet Unit: Inventory Services {day.strftime('%a, %d/%b/%Y')}", "Scheduled Shifts"]
+    for code, name in zip(rng.sample(CODES, 7), rng.sample(NAMES, 7)):
+        start, end = rng.choice(TIMES)
+        lines.append(f"{code} {start} {end} {name}")
+    lines.append("On Call 08:00 16:00 Someone, Else")
+    lines.append("Exceptions Day Unit: Inventory Services")
+    for _ in range(3):
+        off, on = rng.sample(NAMES, 2)
+        start, end = rng.choice(TIMES)
+        lines.append(f"Off: {off} {start} - {end} {rng.choice(REASONS)} Relief: {on}")
+    lines.append("Exceptions Evening")
+    lines.append(f"On: {rng.choice(NAMES)} 15:00 - 23:00 Shift Swap")
+    return lines
+
+def write_line(page, line, y, size, rng, jitter):
+    # Word by word, right to left, with small baseline jitter: both engines must
+    # still cluster the words back into the same line in x order
+    font = pymupdf.Font("helv")
+    x, placed = 30.0, []
+    for word in line.split(" "):
+        placed.append((x, word))
+        x += font.text_length(word + " ", fontsize=size)
+    for x, word in reversed(placed):
+        # Keep the trailing space glyph, as real exports do, so word gaps are explicit
+        page.insert_text((x, y + rng.uniform(-jitter, jitter)), word + " ", fontname="helv", fontsize=size)
+
+def make_pdf(path, first_day, pages, size, spacing, jitter, seed):
+    rng = random.Random(seed)
+    doc = pymupdf.open()
+    for offset in range(pages):
+        page = doc.new_page(width=595, height=842)
+        for i, line in enumerate(page_lines(first_day + timedelta(days=offset), rng)):
+            write_line(page, line, 42 + i * spacing, size, rng, jitter)
+    doc.save(path, garbage=4, deflate=True)
+    doc.close()
+
+SAMPLES = {
+    "flowsheet_plain.pdf": dict(first_day=date(2025, 3, 3), pages=3, size=10, spacing=13, jitter=0.0, seed=1),
+    "flowsheet_jitter.pdf": dict(first_day=date(2025, 3, 24), pages=3, size=9, spacing=12, jitter=0.8, seed=2),
+}
+
+if __name__ == "__main__":
+    for name, options in SAMPLES.items():
+        make_pdf(os.path.join(HERE, name), **options)
+        print(f"Wrote {name}")
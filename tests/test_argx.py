@@ -0,0 +1,21 @@
+# ==============================
+# TEST_ARGX.PY — STREAMING WRITER PARITY
+# ==============================
+
+from datetime import datetime
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from argx import write_argx, write_argx_streaming, make_pay_period_fn
+from fixtures.argx_workbooks import synthetic_shifts, compare_argx
+
+def test_streaming_writer_matches_write_argx(tmp_path):
+    df = synthetic_shifts(weeks=6, employees=8, seed=0)
+    get_pay_period = make_pay_period_fn(datetime(2025, 1, 13))
+    reference, candidate = tmp_path / "reference.xlsx", tmp_path / "streaming.xlsx"
+
+    write_argx(df.copy(), str(reference), get_pay_period)
+    write_argx_streaming(df.copy(), str(candidate), get_pay_period)
+
+    assert compare_argx(str(reference), str(candidate)) == []
@@ -0,0 +1,64 @@
+# ==============================
+# TEST_DATA_CLEANER.PY — SERIAL VS PARALLEL MULTI-SHEET CLEANING
+# ==============================
+
+import io
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from utils.data_cleaner import (
+    clean_xlsx, clean_headers, clean_columns, clean_deleted_rows, clean_flags, clean_format,
+)
+
+MOVEMENT_STEPS = (clean_headers, clean_columns, clean_deleted_rows, clean_flags, clean_format)
+
+# ==============================
+# MULTI-SHEET WORKBOOK
+# ==============================
+def sheet_rows(index, rows, union):
+    rng = np.random.default_rng(index)
+    title = [f"{union} Movement Export {index}" if union else f"Movement Export {index}", None, None, None, None]
+    header = ["User name", "Posting Date", "MvT", "Counted qty", "Material"]
+    body = [
+        [f"Last{n:03d}, First{n:03d}", f"2025-0{1 + n % 9}-1{n % 10}", int(rng.integers(100, 999)),
+         float(rng.integers(0, 50)), f"M{index}{n:04d}"]
+        for n in range(rows)
+    ]
+    body.insert(rows // 2, [None] * 5)  # Blank row mid-sheet
+    return [title, [None] * 5, header] + body
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "multi_sheet_mm.xlsx"
+    sheets = [("Jan", 120, "CUPE"), ("Feb", 40, None), ("Mar", 200, "OPSEU"), ("Apr", 75, None)]
+    with pd.ExcelWriter(path) as writer:
+        for index, (name, rows, union) in enumerate(sheets):
+            pd.DataFrame(sheet_rows(index, rows, union)).to_excel(writer, sheet_name=name, index=False, header=False)
+    return path
+
+# ==============================
+# PARITY
+# ==============================
+def test_parallel_matches_serial(workbook):
+    serial = clean_xlsx(str(workbook), *MOVEMENT_STEPS, name="mm.xlsx", workers=1)
+    parallel = clean_xlsx(str(workbook), *MOVEMENT_STEPS, name="mm.xlsx", workers=2)
+
+    assert len(serial) == 120 + 40 + 200 + 75
+    assert serial["Num"].iloc[0] == "M00000"  # Sheets concatenated in workbook order
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert parallel.attrs["name"] == "mm.xlsx"
+
+def test_parallel_accepts_file_stream(workbook):
+    data = workbook.read_bytes()
+    serial = clean_xlsx(io.BytesIO(data), *MOVEMENT_STEPS, workers=1)
+    parallel = clean_xlsx(io.BytesIO(data), *MOVEMENT_STEPS, workers=2)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+def test_unpicklable_steps_fall_back_to_serial(workbook):
+    steps = (clean_headers, lambda df: df.assign(Checked=True))
+    serial = clean_xlsx(str(workbook), *steps, workers=1)
+    parallel = clean_xlsx(str(workbook), *steps, workers=2)
+    pd.testing.assert_frame_equal(serial, parallel)
@@ -0,0 +1,78 @@
+# ==============================
+# TEST_INV_INDEX.PY — FILTERED INVENTORY SEARCH
+# ==============================
+
+import os
+import sqlite3
+import importlib.util
+
+import pytest
+
+pytest.importorskip("whoosh")
+
+from inv_index import InventoryIndexService
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROWS = [
+    ("IT", "A", 1, "Gauze pads", 5),
+    ("OR", "B", 2, "Gauze roll", 7),
+    ("ICU 2 ", "Wound Care", 3, "Tape", 3),
+]
+
+def load_inv_build():
+    # inventory/ is a folder of scripts (the root inventory.py owns the name), so load it by path
+    spec = importlib.util.spec_from_file_location("inv_build", os.path.join(ROOT, "inventory", "inv_build.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def service(tmp_path):
+    db_path = str(tmp_path / "inventory.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('CREATE TABLE inventory (USL TEXT, "Group" TEXT, Num INTEGER, Description TEXT, QTY INTEGER)')
+        conn.executemany("INSERT INTO inventory VALUES (?, ?, ?, ?, ?)", ROWS)
+    conn.close()
+
+    index_dir = str(tmp_path / "index")
+    load_inv_build().build_index(db_path, index_dir, procs=1)
+    service = InventoryIndexService(index_dir)
+    yield service
+    service.close()
+
+def nums(page):
+    return sorted(hit["Num"] for hit in page["results"])
+
+def test_filters_match_whole_values(service):
+    assert nums(service.search("gauze")) == [1, 2]
+    assert nums(service.search(usl="Any")) == [1, 2, 3]
+    assert nums(service.search(usl="icu 2")) == [3]
+    assert nums(service.search(group="WOUND CARE")) == [3]
+    assert nums(service.search(group="wound")) == []
+
+@pytest.mark.parametrize("usl, group, expected", [
+    ("IT", None, [1]),   # Stop-word
+    ("or", None, [2]),   # Stop-word, any case
+    (None, "A", [1]),    # 1-character code
+    ("OR", "A", []),
+    ("X", None, []),
+])
+def test_short_and_stop_word_filters_still_filter(service, usl, group, expected):
+    # These used to analyze to no tokens and fall back to an unfiltered search
+    assert nums(service.search("gauze", usl=usl, group=group)) == expected
+
+def test_sort_by_usl(service):
+    page = service.search(sort="USL", direction="asc")
+    assert [hit["USL"] for hit in page["results"]] == ["ICU 2", "IT", "OR"]
+
+@pytest.mark.parametrize("current", [True, False])
+def test_only_current_schema_updates_incrementally(tmp_path, current):
+    from whoosh.fields import Schema, TEXT, ID
+    from whoosh.index import create_in
+
+    inv_build = load_inv_build()
+    index_dir = str(tmp_path)
+    older = Schema(key=ID(stored=True, unique=True), USL=TEXT(stored=True))
+    create_in(index_dir, inv_build.schema if current else older)
+    inv_build.open_hash_db(index_dir).close()
+    assert inv_build.can_update(index_dir) is current
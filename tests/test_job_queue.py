@@ -0,0 +1,114 @@
+# ==============================
+# TEST_JOB_QUEUE.PY — ASYNC UPLOADS THROUGH THE TEST CLIENT
+# ==============================
+
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import job_queue
+from job_queue import JobQueue, QUEUED, RUNNING, DONE, FAILED
+
+TIMEOUT = 30
+
+@pytest.fixture
+def queue(monkeypatch):
+    # One worker, so a job submitted behind a busy one stays queued until it is released
+    fresh = JobQueue(workers=1)
+    import handlers.index_handler as index_handler
+    import routes.job_routes as job_routes
+    for module in (job_queue, index_handler, job_routes):
+        monkeypatch.setattr(module, "JOB_QUEUE", fresh)
+    yield fresh
+    fresh.shutdown(wait=True)
+
+@pytest.fixture
+def client(queue, monkeypatch):
+    from app import app
+    import handlers.cleaner_handler as cleaner_handler
+
+    # The cleaner's 10-minute deletion timer would keep the interpreter alive after the run
+    cleaned = []
+    monkeypatch.setattr(cleaner_handler, "schedule_file_deletion", lambda path, delay_seconds=0: cleaned.append(path))
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+    for path in cleaned:
+        if os.path.exists(path):
+            os.remove(path)
+
+def wait_for(client, job_id, status):
+    deadline = time.time() + TIMEOUT
+    while time.time() < deadline:
+        state = client.get(f"/jobs/{job_id}").get_json()
+        if state["status"] == status:
+            return state
+        time.sleep(0.02)
+    pytest.fail(f"job {job_id} never reached {status!r} (last: {state['status']!r})")
+
+def xlsx_upload(name="notes.xlsx"):
+    buf = io.BytesIO()
+    pd.DataFrame({"Material": ["100", "200"], "Description": ["Gauze", "Tape"]}).to_excel(buf, index=False)
+    buf.seek(0)
+    return buf, name
+
+def test_async_upload_reports_progress_and_result(client, queue, monkeypatch):
+    import handlers.index_handler as index_handler
+
+    # Hold the pool with one job so the upload is seen queued, then hold the upload itself while running
+    blocker, started, release = threading.Event(), threading.Event(), threading.Event()
+    queue.submit("test", "blocker", blocker.wait, TIMEOUT)
+
+    run_upload = index_handler.run_upload
+    def gated_run_upload(*args):
+        started.set()
+        release.wait(TIMEOUT)
+        return run_upload(*args)
+    monkeypatch.setattr(index_handler, "run_upload", gated_run_upload)
+
+    response = client.post(
+        "/",
+        data={"async": "1", "uploads": xlsx_upload()},
+        content_type="multipart/form-data",
+        headers={"Accept": "application/json"},
+    )
+    assert response.status_code == 202
+    job = response.get_json()
+    assert job["status"] == QUEUED
+    assert job["kind"] == "xlsx" and job["label"] == "notes.xlsx"
+
+    pending = client.get(job["result_url"])
+    assert pending.status_code == 202
+    assert pending.get_json()["status"] == QUEUED
+
+    blocker.set()
+    assert started.wait(TIMEOUT)
+    assert wait_for(client, job["id"], RUNNING)["message"] == "Processing"
+
+    release.set()
+    done = wait_for(client, job["id"], DONE)
+    assert done["progress"] == 1.0 and done["error"] is None
+
+    result = client.get(job["result_url"])
+    assert result.status_code == 200
+    assert b"/download/AO_Cleaned_notes.xlsx" in result.data
+
+def test_failed_job_reports_error(client, queue):
+    def explode():
+        raise RuntimeError("bad sheet")
+
+    job = queue.submit("xlsx", "broken.xlsx", explode)
+    state = wait_for(client, job.id, FAILED)
+    assert state["error"] == "bad sheet" and state["message"] == "Failed"
+
+    result = client.get(state["result_url"])
+    assert result.status_code == 500
+    assert b"bad sheet" in result.data
+
+def test_unknown_job_is_404(client):
+    assert client.get("/jobs/missing").status_code == 404
+    assert client.get("/jobs/missing/result").status_code == 404
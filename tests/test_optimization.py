@@ -0,0 +1,150 @@
+# ==============================
+# TEST_OPTIMIZATION.PY — COLUMNAR VS ROW-WISE ROP/ROQ
+# ==============================
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from optimization import suggest_rop_roq, simulate_rop_roq
+
+SUGGESTED = ["site_suggested_rop", "site_suggested_roq"]
+
+# ==============================
+# ROW-WISE REFERENCE
+# ==============================
+def suggest_rop_roq_rowwise(df):
+    # The per-row implementation the columnar engine replaced
+    def strategic_suggested_rop_roq(row):
+        try:
+            # Use normalized field names from headers
+            cart_q = pd.to_numeric(row.get('CU1'), errors='coerce')
+            cost_q = pd.to_numeric(row.get('CC1'), errors='coerce')
+            cart_a = pd.to_numeric(row.get('CU2'), errors='coerce')
+            cost_a = pd.to_numeric(row.get('CC2'), errors='coerce')
+            prev_rop = pd.to_numeric(row.get('RROP'), errors='coerce')
+            prev_roq = pd.to_numeric(row.get('RROQ'), errors='coerce')
+
+            # Estimate daily usage
+            usage_quarterly = np.nanmax([cart_q, cost_q]) / 90 if pd.notna(cart_q) or pd.notna(cost_q) else 0
+            usage_annual = np.nanmax([cart_a, cost_a]) / 365 if pd.notna(cart_a) or pd.notna(cost_a) else 0
+            daily_usage = max(usage_quarterly, usage_annual)
+
+            if daily_usage == 0:
+                return pd.Series([None, None])
+
+            # Calculate base ROP and adjust with historical
+            raw_rop = daily_usage * 3  # 3-day buffer
+            adjusted_rop = max(raw_rop, prev_rop if pd.notna(prev_rop) else 0)
+
+            # Round ROP to nearest 10 ending in 2
+            rounded_rop = int(np.ceil(adjusted_rop / 10.0) * 10)
+            while str(rounded_rop)[-1] != '2':
+                rounded_rop += 1
+
+            # Determine ROQ candidates
+            base = rounded_rop - 2
+            all_factors = [d for d in range(2, base) if base % d == 0]
+            roq_range_min = max(2, int(0.05 * rounded_rop))
+            roq_range_max = int(0.25 * rounded_rop)
+            valid_roqs = [d for d in all_factors if roq_range_min <= d <= roq_range_max]
+
+            if rounded_rop <= 10 and 1 not in valid_roqs:
+                valid_roqs.insert(0, 1)
+
+            if pd.notna(prev_roq) and valid_roqs:
+                suggested_roq = min(valid_roqs, key=lambda x: abs(x - prev_roq))
+            elif valid_roqs:
+                suggested_roq = max(valid_roqs)
+            else:
+                suggested_roq = None
+
+            return pd.Series([rounded_rop, suggested_roq])
+        except Exception as e:
+            print(f"Optimization error in row: {row.get('material', 'N/A')} — {e}")
+            return pd.Series([None, None])
+
+    df[['site_suggested_rop', 'site_suggested_roq']] = df.apply(strategic_suggested_rop_roq, axis=1)
+    return df
+
+# ==============================
+# FIXED-SEED DATA
+# ==============================
+def synthetic_optimization(rows=5000, seed=0):
+    rng = np.random.default_rng(seed)
+
+    def sparse(values, missing=0.2):
+        return np.where(rng.random(rows) < missing, np.nan, values)
+
+    return pd.DataFrame({
+        "CU1": sparse(rng.integers(0, 2000, rows)),
+        "CC1": sparse(rng.integers(0, 2000, rows)),
+        "CU2": sparse(rng.integers(0, 8000, rows)),
+        "CC2": sparse(rng.integers(0, 8000, rows)),
+        "RROP": sparse(rng.integers(0, 400, rows), 0.3),
+        "RROQ": sparse(rng.integers(1, 100, rows), 0.3),
+    })
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_columnar_matches_rowwise(seed):
+    df = synthetic_optimization(seed=seed)
+    columnar = suggest_rop_roq(df.copy())[SUGGESTED].astype(float)
+    rowwise = suggest_rop_roq_rowwise(df.copy())[SUGGESTED].astype(float)
+
+    assert columnar.notna().any().all()
+    pd.testing.assert_frame_equal(columnar, rowwise)
+
+def test_small_and_missing_usage():
+    # Zero/missing usage gives no suggestion; tiny usage takes the ROQ-of-1 path
+    df = pd.DataFrame({
+        "CU1": [np.nan, 0, 3, 30, 9000],
+        "CC1": [np.nan, 0, np.nan, 45, 100],
+        "CU2": [np.nan, 0, 10, np.nan, 1],
+        "CC2": [np.nan, np.nan, 2, 200, 1],
+        "RROP": [np.nan, 5, np.nan, 60, 12],
+        "RROQ": [np.nan, 2, np.nan, 7, np.nan],
+    })
+    columnar = suggest_rop_roq(df.copy())[SUGGESTED].astype(float)
+    rowwise = suggest_rop_roq_rowwise(df.copy())[SUGGESTED].astype(float)
+    pd.testing.assert_frame_equal(columnar, rowwise)
+
+# ==============================
+# WHAT-IF SIMULATION
+# ==============================
+def simulation_frame(seed=0):
+    df = synthetic_optimization(rows=2000, seed=seed)
+    rng = np.random.default_rng(seed + 100)
+    df["ROP"] = np.where(rng.random(len(df)) < 0.1, np.nan, rng.integers(0, 400, len(df)))
+    df["ROQ"] = rng.integers(1, 100, len(df)).astype(float)
+    df["Cost"] = rng.uniform(0.5, 50, len(df)).round(2)
+    return df
+
+def test_default_scenario_matches_suggest_rop_roq():
+    df = simulation_frame()
+    [scenario] = simulate_rop_roq(df)
+
+    suggested = suggest_rop_roq(df.copy())[SUGGESTED].astype(float)
+    rop, roq = suggested["site_suggested_rop"], suggested["site_suggested_roq"]
+    active = rop.notna()
+
+    assert scenario["items"] == int(active.sum())
+    assert scenario["items_without_roq"] == int((active & roq.isna()).sum())
+    assert scenario["rop_changes"] == int((active & (rop != df["ROP"])).sum())
+    assert scenario["roq_changes"] == int((active & roq.notna() & (roq != df["ROQ"])).sum())
+    assert scenario["rop_increases"] + scenario["rop_decreases"] <= scenario["rop_changes"]
+
+@pytest.mark.parametrize("grid", [
+    {"buffer_days": [float("nan")]},
+    {"buffer_days": [float("inf")]},
+    {"buffer_days": [1e30]},
+    {"buffer_days": [-1]},
+    {"roq_min_pcts": [float("nan")]},
+    {"roq_max_pcts": [float("inf")]},
+    {"roq_min_pcts": [0.3], "roq_max_pcts": [0.2]},
+    {"roq_max_pcts": [5.0]},
+    {"rop_endings": [10]},
+    {"buffer_days": list(range(30)), "roq_min_pcts": [0.01 * i for i in range(20)]},
+])
+def test_invalid_grids_raise(grid):
+    with pytest.raises(ValueError):
+        simulate_rop_roq(simulation_frame(), **grid)
@@ -0,0 +1,50 @@
+# ==============================
+# TEST_PAGE_CACHE.PY — LAZY CACHE, LEGACY SWEEP, LRU BUDGET
+# ==============================
+
+import os
+import sys
+import subprocess
+from page_cache import PageCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_import_does_not_create_cache():
+    # Fresh interpreter: importing the parser (as pool workers do) must not build the cache
+    code = "import parser, page_cache; print(page_cache._page_cache is None)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "True"
+
+def test_legacy_report_cache_is_swept(tmp_path):
+    legacy = tmp_path / "old_report__123__none.pkl"
+    legacy.write_bytes(b"stale")
+
+    cache = PageCache(cache_dir=tmp_path / "pages", max_bytes=1 << 20, legacy_dir=tmp_path)
+    cache.put("v1-page-abc", {"rows": 1})
+
+    assert not legacy.exists()
+    assert cache.get("v1-page-abc") == {"rows": 1}
+    assert cache.stats()["entries"] == 1
+
+def test_small_budget_evicts_least_recently_used(tmp_path):
+    value = b"x" * 100
+    cache = PageCache(cache_dir=tmp_path, max_bytes=350, legacy_dir=None)
+    for key in ("a", "b", "c"):
+        cache.put(key, value)
+    size = cache.stats()["bytes"] // 3
+    assert 3 * size <= 350 < 4 * size
+
+    # Touching "a" makes "b" the oldest, so the fourth entry pushes "b" out
+    assert cache.get("a") == value
+    cache.put("d", value)
+    assert cache.get("b") is None
+    assert not (tmp_path / "b.pkl").exists()
+
+    cache.put("e", value)  # Evicts "c", the oldest left
+    assert [cache.get(key) is not None for key in ("a", "c", "d", "e")] == [True, False, True, True]
+
+    stats = cache.stats()
+    assert sorted(p.stem for p in tmp_path.glob("*.pkl")) == ["a", "d", "e"]
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (4, 2, 2)
+    assert stats["entries"] == 3 and stats["bytes"] == 3 * size <= stats["max_bytes"]
+    assert stats["hit_rate"] == round(4 / 6, 3)
@@ -0,0 +1,62 @@
+# ==============================
+# TEST_PARSER.PY — TOKENIZER VS MULTI-REGEX RECORDS
+# ==============================
+
+import os
+from datetime import date
+import pytest
+
+from parser import build_record, extract_processing_date
+from bench.parser_bench import build_record_regex
+from fixtures.make_flowsheets import NAMES, SAMPLES
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+ROSTER = frozenset(NAMES) | {"Someone, Else", "Van Der Berg, Ana Maria"}
+MONDAY, SATURDAY = date(2025, 3, 3), date(2025, 3, 8)
+
+EDGE_LINES = [
+    "d103 08:00 16:30 Alder, Avery",
+    "SA1 23:00 07:00 Birch, Blake",
+    "od12 15:00 23:00 O'Pine, Quinn",
+    "OE 07:00 15:00 Oak-Rowan, Parker",
+    "Alder, Avery 07:00 15:00 Oak-Rowan, Parker OE",
+    "w506 23:00 07:00 Van Der Berg, Ana Maria",
+    "E310 n203 15:00 23:00 Cedar, Casey",
+    "1234 08:00 08:00 Elm, Emery",
+    "q9 08:00 16:30 Fir, Finley",
+    "d104 08:00 Hazel, Harper",
+    "d104 08:00 16:30 Unknown, Person",
+    "On Call 08:00 16:00 Someone, Else",
+    "Off: Alder, Avery 07:00 - 15:00 Sick N Relief: Birch, Blake",
+    "Flowsheet Unit: Inventory Services Mon, 03/Mar/2025",
+]
+
+def build_both(line, processing_date):
+    results = []
+    for build in (build_record, build_record_regex):
+        try:
+            results.append(build(line, processing_date, ROSTER))
+        except ValueError as e:  # Out-of-range clock times fail both the same way
+            results.append(type(e))
+    return results
+
+@pytest.mark.parametrize("processing_date", [MONDAY, SATURDAY])
+@pytest.mark.parametrize("line", EDGE_LINES)
+def test_edge_lines_match(line, processing_date):
+    token, regex = build_both(line, processing_date)
+    assert token == regex
+
+def test_sample_flowsheets_match():
+    pytest.importorskip("pdfplumber")
+    from pdf_text import iter_page_texts
+
+    records = 0
+    for name in SAMPLES:
+        for text in iter_page_texts(os.path.join(FIXTURES, name), engine="pdfplumber"):
+            lines = text.splitlines()
+            processing_date = extract_processing_date(lines)
+            for line in lines:
+                token, regex = build_both(line, processing_date)
+                assert token == regex, line
+                records += token is not None
+    assert records
@@ -0,0 +1,42 @@
+# ==============================
+# TEST_PDF_ENGINES.PY — PDFPLUMBER / FITZ PARITY
+# ==============================
+
+import os
+import pytest
+
+pytest.importorskip("pdfplumber")
+pytest.importorskip("fitz")
+
+import parser
+from pdf_text import iter_page_texts, page_count
+from fixtures.make_flowsheets import NAMES, SAMPLES
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SAMPLE_PDFS = [os.path.join(FIXTURES, name) for name in SAMPLES]
+
+@pytest.fixture
+def sample_roster(monkeypatch):
+    # Anonymised names are not on the real rosters — accept them for record parsing
+    monkeypatch.setattr(parser, "valid_names", lambda: frozenset(NAMES))
+
+@pytest.mark.parametrize("pdf_path", SAMPLE_PDFS, ids=list(SAMPLES))
+def test_page_counts_match(pdf_path):
+    assert page_count(pdf_path, engine="fitz") == page_count(pdf_path, engine="pdfplumber")
+
+@pytest.mark.parametrize("pdf_path", SAMPLE_PDFS, ids=list(SAMPLES))
+def test_line_streams_match(pdf_path):
+    reference = [text.splitlines() for text in iter_page_texts(pdf_path, engine="pdfplumber")]
+    candidate = [text.splitlines() for text in iter_page_texts(pdf_path, engine="fitz")]
+    assert candidate == reference
+
+@pytest.mark.parametrize("pdf_path", SAMPLE_PDFS, ids=list(SAMPLES))
+def test_records_match(pdf_path, sample_roster):
+    pages = zip(iter_page_texts(pdf_path, engine="pdfplumber"), iter_page_texts(pdf_path, engine="fitz"))
+    for reference, candidate in pages:
+        ref_date, ref_records = parser.parse_page_text(reference)
+        cand_date, cand_records = parser.parse_page_text(candidate)
+
+        assert ref_date is not None, "extract_processing_date found no date line"
+        assert ref_records, "build_record found no shift lines"
+        assert (cand_date, cand_records) == (ref_date, ref_records)
@@ -2,10 +2,66 @@
 # DATA_SEARCH.PY
 # ==============================
 
+import weakref
+import threading
 import pandas as pd
 import numpy as np
 from flask import request, jsonify
 
+# id(df) -> (weakref to df, {(column, skip_na): lowered Series})
+_LOWERED = {}
+_LOWERED_LOCK = threading.Lock()
+
+# ==============================
+# LOWERED COLUMN CACHE
+# ==============================
+def _lowered_cache(df):
+    key = id(df)
+    entry = _LOWERED.get(key)
+    if entry is None or entry[0]() is not df:
+        entry = (weakref.ref(df), {})
+        _LOWERED[key] = entry
+        weakref.finalize(df, _LOWERED.pop, key, None)
+    return entry[1]
+
+def lowered_column(df, col, skip_na=False):
+    # str(value).lower() per cell, built once per loaded DataFrame (treated as read-only)
+    with _LOWERED_LOCK:
+        cache = _lowered_cache(df)
+        lowered = cache.get((col, skip_na))
+        if lowered is None:
+            values = df[col]
+            lowered = values.map(str).str.lower().reset_index(drop=True)
+            if skip_na:
+                lowered = lowered.where(values.notna().to_numpy(), "")  # Missing cells never match
+            cache[(col, skip_na)] = lowered
+        return lowered
+
+# ==============================
+# COLUMN SEARCH
+# ==============================
+def search_mask(df, term, columns, skip_na=False):
+    """
+    Rows where term is a substring of any of the given columns.
+
+    Parameters:
+        df (DataFrame): The loaded DataFrame (not a filtered view, so the cache is reused)
+        term (str): Search text; matched case-insensitively, never as a regex
+        columns (list): Columns to search
+        skip_na (bool): Treat missing cells as empty instead of "nan"
+
+    Returns:
+        ndarray: Boolean mask aligned with df's rows
+    """
+    term = str(term).lower()
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        mask |= lowered_column(df, col, skip_na).str.contains(term, regex=False).to_numpy(dtype=bool)
+    return mask
+
+def search_frame(df, term, columns, skip_na=False):
+    return df[search_mask(df, term, columns, skip_na)]
+
 # ==============================
 # SEARCH REQUEST
 # ==============================
@@ -0,0 +1,95 @@
+# ==============================
+# IMPORT_PROFILE.PY — APP STARTUP IMPORT COST
+# ==============================
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Total `import app` budget in seconds, and packages that must only load on first use
+IMPORT_BUDGET_SECONDS = 1.5
+LAZY_PACKAGES = ("matplotlib", "seaborn", "pdfplumber", "pdfminer", "fitz", "openpyxl", "user_agents")
+
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# ==============================
+# RUN -X IMPORTTIME
+# ==============================
+def profile_imports(module="app"):
+    env = dict(os.environ, LOG_LEVEL=os.getenv("LOG_LEVEL", "ERROR"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+    return entries
+
+# ==============================
+# SUMMARIZE
+# ==============================
+def summarize(entries, module="app"):
+    total = next((e["cumulative_ms"] for e in entries if e["module"] == module and e["depth"] == 0), 0.0)
+
+    by_package = defaultdict(float)
+    for e in entries:
+        by_package[e["module"].split(".")[0]] += e["self_ms"]
+
+    loaded = {e["module"].split(".")[0] for e in entries}
+    return {
+        "total_ms": total,
+        "modules": sorted(entries, key=lambda e: e["cumulative_ms"], reverse=True),
+        "packages": sorted(by_package.items(), key=lambda kv: kv[1], reverse=True),
+        "eager_heavy": sorted(loaded & set(LAZY_PACKAGES)),
+    }
+
+# ==============================
+# CLI
+# ==============================
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Report per-module import cost of app startup.")
+    ap.add_argument("--module", default="app")
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--budget", type=float, default=IMPORT_BUDGET_SECONDS, help="seconds; 0 disables the check")
+    args = ap.parse_args(argv)
+
+    summary = summarize(profile_imports(args.module), args.module)
+
+    print(f"import {args.module}: {summary['total_ms']:.0f} ms")
+    print(f"\nTop {args.top} modules (cumulative ms):")
+    for e in summary["modules"][:args.top]:
+        print(f"  {e['cumulative_ms']:9.1f}  {'  ' * e['depth']}{e['module']}")
+    print(f"\nTop {args.top} packages (self ms):")
+    for name, ms in summary["packages"][:args.top]:
+        print(f"  {ms:9.1f}  {name}")
+
+    failed = False
+    if summary["eager_heavy"]:
+        failed = True
+        print(f"\n❌ Loaded at startup but should be lazy: {', '.join(summary['eager_heavy'])}")
+    if args.budget and summary["total_ms"] > args.budget * 1000:
+        failed = True
+        print(f"\n❌ Over import budget: {summary['total_ms']:.0f} ms > {args.budget * 1000:.0f} ms")
+    if not failed:
+        print("\n✅ Within import budget")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,6 @@
 import os
 import logging
 from flask import current_app, request, has_request_context, send_file
-from user_agents import parse
 from logging.handlers import RotatingFileHandler
 
 # ==============================
@@ -13,6 +12,8 @@ from logging.handlers import RotatingFileHandler
 # ==============================
 
 def new_session_info():
+    from user_agents import parse  # Loads its regex tables on first use
+
     ip = request.headers.get('X-Forwarded-For', request.remote_addr)
     ua_string = request.headers.get('User-Agent', '')
     ua = parse(ua_string)
@@ -0,0 +1,88 @@
+# ==============================
+# NAME_MATCHER.PY — MULTI-PATTERN ROSTER MATCHING
+# ==============================
+
+from collections import deque
+from .static_data import REGISTRY, roster_files
+
+# ==============================
+# AHO-CORASICK MATCHER
+# ==============================
+class NameMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of names.
+
+    Failure links are folded into a full transition table at build time, so a
+    scan is a single pass of dict lookups over the text no matter how many
+    names there are. Matching is case-sensitive, like `name in line`.
+    """
+
+    def __init__(self, names):
+        self.names = sorted(set(names))
+        self.delta = [{}]  # state -> {char: next state}
+        self.output = [()]  # state -> names ending at this state, longest first
+
+        for name in self.names:
+            state = 0
+            for ch in name:
+                nxt = self.delta[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.delta)
+                    self.delta[state][ch] = nxt
+                    self.delta.append({})
+                    self.output.append(())
+                state = nxt
+            self.output[state] = (name,)
+
+        self._link()
+
+    def _link(self):
+        fail = [0] * len(self.delta)
+        queue = deque(self.delta[0].values())
+        while queue:
+            state = queue.popleft()
+            # Inherit the fallback state's transitions and outputs (BFS order: already complete)
+            fallback = fail[state]
+            self.output[state] = tuple(sorted(
+                self.output[state] + self.output[fallback], key=lambda n: (-len(n), n)
+            ))
+            for ch, nxt in list(self.delta[state].items()):
+                queue.append(nxt)
+                fail[nxt] = self.delta[fallback].get(ch, 0)
+            for ch, nxt in self.delta[fallback].items():
+                self.delta[state].setdefault(ch, nxt)
+
+    def find_all(self, text):
+        # (start, name) for every occurrence, including overlapping ones
+        matches = []
+        delta, output = self.delta, self.output
+        state = 0
+        for end, ch in enumerate(text, start=1):
+            state = delta[state].get(ch, 0)
+            for name in output[state]:
+                matches.append((end - len(name), name))
+        return matches
+
+    def longest(self, text):
+        # Longest name in text; ties go to the leftmost, then alphabetical
+        best = None
+        delta, output = self.delta, self.output
+        state = 0
+        for end, ch in enumerate(text, start=1):
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                name = output[state][0]
+                key = (-len(name), end - len(name), name)
+                if best is None or key < best:
+                    best = key
+        return best[2] if best else None
+
+# ==============================
+# ROSTER MATCHER
+# ==============================
+def roster_matcher(roster="all"):
+    # Rebuilt only when the roster files change
+    return REGISTRY.view(
+        f"matcher:{roster}", roster_files(roster),
+        lambda *lists: NameMatcher(name for names in lists for name in names)
+    )
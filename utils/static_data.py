@@ -0,0 +1,121 @@
+# ==============================
+# STATIC_DATA.PY — SHARED STATIC JSON LOOKUPS
+# ==============================
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from types import MappingProxyType
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
+
+ROSTER_FILES = {"ft": ("emp_ft.json",), "pt": ("emp_pt.json",), "all": ("emp_ft.json", "emp_pt.json")}
+ASSIGNMENTS_FILE = "arg_assignments.json"
+ASSIGNMENT_LISTS = ("holiday", "stat", "weekday_base", "weekday_add", "friday_add", "saturday", "sunday")
+
+# ==============================
+# STATIC REGISTRY
+# ==============================
+class StaticRegistry:
+    """
+    Loads static JSON files once and serves frozen views built from them.
+
+    Every lookup stats the backing files; a file is only re-read when its
+    (mtime, size) changes, and a view is only rebuilt when one of its files'
+    content digests changes.
+    """
+
+    def __init__(self, static_dir=STATIC_DIR):
+        self.static_dir = static_dir
+        self.lock = threading.RLock()
+        self.files = {}  # filename -> (signature, digest, data)
+        self.views = {}  # view name -> (digests, value)
+        self.reloads = 0
+
+    def _file(self, filename):
+        path = os.path.join(self.static_dir, filename)
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size)
+
+        cached = self.files.get(filename)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        data = json.loads(raw)
+        self.files[filename] = (signature, digest, data)
+        self.reloads += 1
+        logging.debug(f"[STATIC] Loaded {filename} ({digest[:12]})")
+        return digest, data
+
+    def view(self, name, filenames, build):
+        with self.lock:
+            loaded = [self._file(f) for f in filenames]
+            digests = tuple(digest for digest, _ in loaded)
+
+            cached = self.views.get(name)
+            if cached and cached[0] == digests:
+                return cached[1]
+
+            value = build(*(data for _, data in loaded))
+            self.views[name] = (digests, value)
+            return value
+
+    def fingerprint(self, filenames):
+        with self.lock:
+            digests = "".join(self._file(f)[0] for f in filenames)
+        return hashlib.sha256(digests.encode("utf-8")).hexdigest()[:16]
+
+REGISTRY = StaticRegistry()
+
+# ==============================
+# NORMALIZE NAME
+# ==============================
+def normalize_name(name):
+    return re.sub(r'\s+', ' ', name.strip()).casefold()
+
+def roster_files(roster):
+    return ROSTER_FILES.get(roster, ROSTER_FILES["all"])
+
+# ==============================
+# EMPLOYEE ROSTERS
+# ==============================
+def roster_names(roster="all"):
+    # Names exactly as written in the roster files
+    return REGISTRY.view(
+        f"roster:{roster}", roster_files(roster),
+        lambda *lists: frozenset(name for names in lists for name in names)
+    )
+
+def normalized_names(roster="all"):
+    # Casefolded, whitespace-collapsed names for filtering schedules
+    return REGISTRY.view(
+        f"normalized:{roster}", roster_files(roster),
+        lambda *lists: frozenset(normalize_name(name) for names in lists for name in names)
+    )
+
+def valid_names():
+    # Whitespace-collapsed names the PDF parser accepts
+    return REGISTRY.view(
+        "valid", roster_files("all"),
+        lambda *lists: frozenset(" ".join(name.split()) for names in lists for name in names)
+    )
+
+def roster_version():
+    return REGISTRY.fingerprint(roster_files("all"))
+
+# ==============================
+# ASSIGNMENT CODES
+# ==============================
+def assignment_codes():
+    def build(asmnts):
+        return MappingProxyType({
+            key: frozenset(c.strip().upper() for c in asmnts.get(key, []))
+            for key in ASSIGNMENT_LISTS
+        })
+    return REGISTRY.view("assignments", (ASSIGNMENTS_FILE,), build)
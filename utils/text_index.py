@@ -0,0 +1,59 @@
+# ==============================
+# TEXT_INDEX.PY — TRIGRAM SUBSTRING INDEX
+# ==============================
+
+from collections import defaultdict
+import numpy as np
+from .data_search import lowered_column, search_mask
+
+CELL_SEPARATOR = "\x1f"  # Never in a search term, so no match can span two cells
+EMPTY_POSITIONS = np.empty(0, dtype=np.intp)
+
+# ==============================
+# TRIGRAM INDEX
+# ==============================
+class TrigramIndex:
+    """
+    Inverted index from character trigrams to row positions of a DataFrame.
+
+    Row texts are built from the shared lowered-column cache. A term of
+    three or more characters is answered by intersecting the posting lists
+    of its trigrams and confirming the few candidates with a plain
+    substring check; shorter terms fall back to the vectorized column
+    search. Results are ascending row positions, ready for df.iloc.
+    """
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.columns = list(columns)
+        lowered = [lowered_column(df, col).tolist() for col in self.columns]
+        self.texts = [CELL_SEPARATOR.join(cells) for cells in zip(*lowered)] if lowered else [""] * len(df)
+
+        postings = defaultdict(list)
+        for pos, text in enumerate(self.texts):
+            for gram in {text[i:i + 3] for i in range(len(text) - 2)}:
+                postings[gram].append(pos)
+        self.postings = {gram: np.asarray(rows, dtype=np.intp) for gram, rows in postings.items()}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def candidates(self, term):
+        grams = {term[i:i + 3] for i in range(len(term) - 2)}
+        lists = sorted((self.postings.get(g, EMPTY_POSITIONS) for g in grams), key=len)
+        positions = lists[0]
+        for rows in lists[1:]:
+            if not len(positions):
+                break
+            positions = np.intersect1d(positions, rows, assume_unique=True)
+        return positions
+
+    def search(self, term):
+        term = term.lower()
+        if not term:
+            return np.arange(len(self.texts), dtype=np.intp)
+        texts = self.texts
+        if len(term) < 3:
+            return np.flatnonzero(search_mask(self.df, term, self.columns))
+        # Trigrams only prove co-occurrence, not adjacency — confirm each candidate
+        return np.fromiter((i for i in self.candidates(term) if term in texts[i]), dtype=np.intp)
@@ -2,7 +2,9 @@
 # ZWDISEG.PY (Final Optimized Version)
 # ==============================
 
+import numpy as np
 import pandas as pd
+from utils.data_search import search_mask
 
 DEBUG = False
 
@@ -33,25 +35,24 @@ def search_zwdiseg(df, term, usl, sort="USL", direction="desc"):
     if df is None:
         return []
 
-    df = df.copy()  # Avoid SettingWithCopyWarning or side effects
-
     term = term.strip().lower()
     usl = usl.strip().lower()
-    
+
+    # Masks are built against the loaded frame so its lowered columns stay cached
+    keep = np.ones(len(df), dtype=bool)
     if usl not in {"any", "all", ""}:
-        df = df[df["USL"].astype(str).str.strip().str.lower() == usl]
-    
+        keep &= (df["USL"].astype(str).str.strip().str.lower() == usl).to_numpy()
+
     if term:
         try:
-            search_cols = df.columns
-            def row_matches(row):
-                return any(term in str(row[col]).lower() for col in search_cols)
-            df = df[df.apply(row_matches, axis=1)]
+            keep &= search_mask(df, term, df.columns)
         except Exception as e:
             if DEBUG:
                 print(f"[ERROR] Search failed: {e}")
             return []
 
+    df = df[keep].copy()  # Avoid SettingWithCopyWarning or side effects
+
     # Handle JSON serialization safely
     for col in ("Time", "Date"):
         if col in df.columns: